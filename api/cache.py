@@ -0,0 +1,169 @@
+"""In-process caches for graph read endpoints.
+
+The graph only changes when an import runs or a threat model is edited, so
+aggregate reads such as the dashboard statistics are cached for a short TTL
+and dropped as soon as either kind of write completes.
+
+Read endpoints also share an LRU response cache keyed by the knowledge
+graph *generation* — a counter bumped by every import — plus the route and
+its query parameters. Reads that can include threat-model nodes (e.g. an
+unlabeled node listing) are also keyed by the *model generation*, bumped by
+every model write, so editing models never evicts cached CWE, ATT&CK or
+CAPEC reads. Cached responses carry a strong ETag (a hash of the body), so
+clients and CDNs can revalidate with ``If-None-Match`` and get a 304
+without the database being touched.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from api.config import settings
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class LRUCache:
+    """Thread-safe mapping holding at most ``maxsize`` entries, evicting the least recently used."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GraphGeneration:
+    """Counter identifying the current state of the graph; bumped on every write."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def bump(self) -> int:
+        with self._lock:
+            self.value += 1
+            return self.value
+
+
+graph_cache = TTLCache(ttl=settings.graph_cache_ttl)
+response_cache = LRUCache(maxsize=settings.response_cache_size)
+graph_generation = GraphGeneration()
+model_generation = GraphGeneration()
+# Keyed by (model_id, revision, ...): a model edit bumps its revision, so
+# stale entries are never hit and this cache need not be cleared on writes
+attack_path_cache = LRUCache(maxsize=settings.attack_path_cache_size)
+
+
+def invalidate_graph_caches() -> None:
+    """Drop every cached graph read; call after an import writes to the knowledge graph."""
+    graph_generation.bump()
+    graph_cache.clear()
+    response_cache.clear()
+
+
+def invalidate_model_caches() -> None:
+    """Drop cached reads that include threat-model nodes; call after a model write."""
+    model_generation.bump()
+    graph_cache.clear()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def cached_response(request: Request, compute: Callable[[], Awaitable[Any]],
+                          model_scoped: bool = False) -> Response:
+    """Serve a JSON read from the response cache, honouring ``If-None-Match``.
+
+    ``compute()`` builds the response body on a miss; exceptions it raises
+    (e.g. a 404 HTTPException) propagate and nothing is cached. The body is
+    validated and filtered through the route's ``response_model``, as
+    FastAPI does for uncached responses, before it is hashed. Pass
+    ``model_scoped`` for reads whose body can include threat-model nodes.
+    """
+    generations = (graph_generation.value, model_generation.value if model_scoped else None)
+    key = (generations, request.url.path, tuple(sorted(request.query_params.multi_items())))
+    entry = response_cache.get(key)
+    if entry is None:
+        content = await compute()
+        response_model = getattr(request.scope.get("route"), "response_model", None)
+        if response_model is not None:
+            content = response_model.model_validate(content)
+        body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        entry = (body, etag)
+        response_cache.set(key, entry)
+
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def invalidate_after_write(request: Request):
+    """Router dependency that invalidates model-scoped caches once a mutating request finishes."""
+    yield
+    if request.method not in ("GET", "HEAD", "OPTIONS"):
+        invalidate_model_caches()
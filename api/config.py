@@ -1,4 +1,7 @@
 """API configuration using pydantic-settings."""
+from typing import Optional
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -13,9 +16,54 @@ class Settings(BaseSettings):
     neo4j_username: str = "neo4j"
     neo4j_password: str = ""
 
+    # Connection pool tuning (NEO4J_MAX_CONNECTION_POOL_SIZE etc.); unset
+    # values keep the driver defaults. Timeouts and lifetimes are in seconds.
+    neo4j_max_connection_pool_size: Optional[int] = None
+    neo4j_connection_acquisition_timeout: Optional[float] = None
+    neo4j_max_connection_lifetime: Optional[float] = None
+    neo4j_liveness_check_timeout: Optional[float] = None
+    neo4j_connection_timeout: Optional[float] = None
+
+    job_max_workers: int = 2
+    # Parallel write sessions per knowledge-base import (importers.writer)
+    import_write_concurrency: int = Field(4, ge=1)
+    # Finished (completed or failed) jobs kept for polling; older ones are dropped
+    job_retention: int = 200
+
+    # Elements purged per transaction when a threat model is deleted
+    purge_batch_size: int = 1000
+
+    # Seconds cached graph reads (e.g. /graph/stats) stay valid; 0 disables
+    graph_cache_ttl: float = 60.0
+
+    # Max cached responses of knowledge-graph reads (nodes, node detail, search); 0 disables
+    response_cache_size: int = 1024
+    # Max cached attack-path results, keyed by model revision; 0 disables
+    attack_path_cache_size: int = 256
+
+    # Default cap on neighbours returned per relationship type by /graph/nodes/{id}
+    node_neighbour_limit: int = 50
+
+    # Create missing Neo4j constraints and indexes at startup
+    schema_bootstrap: bool = True
+
+    # Load the in-memory knowledge-graph snapshot at startup and after imports;
+    # node detail reads fall back to Cypher while none is loaded
+    graph_snapshot: bool = True
+
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
 
     model_config = {"env_file": ".env.dev", "env_file_encoding": "utf-8"}
 
+    def neo4j_pool_options(self) -> dict:
+        """Pool options for ``src.db.configure_pool``."""
+        return {
+            "max_connection_pool_size": self.neo4j_max_connection_pool_size,
+            "connection_acquisition_timeout": self.neo4j_connection_acquisition_timeout,
+            "max_connection_lifetime": self.neo4j_max_connection_lifetime,
+            "liveness_check_timeout": self.neo4j_liveness_check_timeout,
+            "connection_timeout": self.neo4j_connection_timeout,
+        }
+
 
 settings = Settings()
@@ -1,9 +1,9 @@
 """FastAPI dependencies for dependency injection."""
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from neo4j import Driver, Session
+from neo4j import READ_ACCESS, WRITE_ACCESS, AsyncDriver, AsyncSession, Driver, Session
 
-from src.db import get_driver
+from src.db import get_async_driver, get_driver
 
 
 def get_neo4j_driver() -> Driver:
@@ -19,3 +19,34 @@ def get_neo4j_session() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
+
+def get_async_neo4j_driver() -> AsyncDriver:
+    """Dependency that provides the async Neo4j driver."""
+    return get_async_driver()
+
+
+async def get_async_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides an async read-mode session, auto-closed after request.
+
+    Use with ``session.execute_read`` so queries are routed to cluster
+    followers / read replicas and retried on transient errors.
+    """
+    session = get_async_driver().session(default_access_mode=READ_ACCESS)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_async_write_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides an async write-mode session, auto-closed after request.
+
+    Use with ``session.execute_write`` so writes go to the leader and are
+    retried on transient errors (leader switch, deadlock).
+    """
+    session = get_async_driver().session(default_access_mode=WRITE_ACCESS)
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -0,0 +1,159 @@
+"""Background job subsystem for long-running graph operations.
+
+Knowledge-base imports take minutes, far longer than an HTTP request should
+be held open. Jobs run on a small worker pool; callers get a job id back
+immediately and poll the job for its phase, progress and errors.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from api.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+@dataclass
+class Job:
+    """State of one background job, updated by the worker as it progresses."""
+    job_id: str
+    kind: str  # e.g. "import"
+    key: str  # at most one active job per (kind, key), e.g. the import source
+    status: str = "queued"  # queued, running, completed, failed
+    phase: Optional[str] = None
+    batches_done: int = 0
+    rows_done: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+
+    def report(self, phase: str, rows: int) -> None:
+        """Progress callback handed to the job function: one call per batch."""
+        self.phase = phase
+        self.batches_done += 1
+        self.rows_done += rows
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return round(self.rows_done / elapsed, 1) if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status,
+            "phase": self.phase,
+            "batches_done": self.batches_done,
+            "rows_done": self.rows_done,
+            "rows_per_sec": self.rows_per_sec,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "errors": list(self.errors),
+            "result": self.result,
+        }
+
+
+class JobConflictError(Exception):
+    """Raised when a job is submitted while another with the same key is active."""
+
+    def __init__(self, job: Job):
+        super().__init__(f"A {job.kind} job for '{job.key}' is already {job.status}")
+        self.job = job
+
+
+class JobManager:
+    """Runs jobs on a thread pool and keeps their state for polling.
+
+    Only the ``retention`` (default: the job_retention setting) most
+    recently finished jobs are kept, so a long-running process does not
+    accumulate every job it ever ran.
+    """
+
+    def __init__(self, max_workers: int, retention: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[tuple, Job] = {}
+        self._retention = settings.job_retention if retention is None else retention
+        self._finished: deque[str] = deque()
+
+    def submit(self, kind: str, key: str, fn: Callable[[Callable[[str, int], None]], Dict[str, Any]]) -> Job:
+        """Queue ``fn(progress)`` as a job; its return value becomes the job result.
+
+        Raises JobConflictError if a job with the same kind and key is still
+        queued or running.
+        """
+        with self._lock:
+            active = self._active.get((kind, key))
+            if active is not None and active.status in ACTIVE_STATUSES:
+                raise JobConflictError(active)
+            job = Job(job_id=f"job-{uuid4().hex[:12]}", kind=kind, key=key)
+            self._jobs[job.job_id] = job
+            self._active[(kind, key)] = job
+
+        self._executor.submit(self._run, job, fn)
+        return job
+
+    def _run(self, job: Job, fn: Callable) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(job.report)
+            job.status = "completed"
+        except Exception as e:
+            logger.exception("Job %s (%s %s) failed", job.job_id, job.kind, job.key)
+            job.errors.append(str(e))
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get((job.kind, job.key)) is job:
+                    del self._active[(job.kind, job.key)]
+                self._finished.append(job.job_id)
+                while len(self._finished) > self._retention:
+                    self._jobs.pop(self._finished.popleft(), None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """All known jobs, newest first."""
+        jobs = [j for j in self._jobs.values() if kind is None or j.kind == kind]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the process-wide JobManager (also used as a FastAPI dependency)."""
+    global _manager
+    if _manager is None:
+        _manager = JobManager(max_workers=settings.job_max_workers)
+    return _manager
+
+
+def shutdown_job_manager() -> None:
+    """Stop the worker pool without waiting for running jobs."""
+    global _manager
+    if _manager is not None:
+        _manager.shutdown(wait=False)
+        _manager = None
@@ -1,18 +1,65 @@
 """Threat Oracle FastAPI application."""
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
 
 from api.config import settings
 from api.routes import health, graph, imports, models
-from src.db import close_driver
+from api.jobs import get_job_manager, shutdown_job_manager
+from importers.writer import configure_concurrency
+from src.db import close_async_driver, close_driver, configure_pool, get_driver
+from src.graph_schema import ensure_schema
+from src.graph_snapshot import clear_snapshot, refresh_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+def bootstrap_schema() -> None:
+    """Create missing constraints and indexes; never prevents the API from starting."""
+    try:
+        report = ensure_schema(get_driver())
+    except Exception as e:
+        logger.warning("Schema bootstrap skipped: %s", e)
+        return
+    logger.info(
+        "Neo4j schema: %d constraints, %d indexes",
+        len(report["constraints"]), len(report["indexes"]),
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifecycle — close Neo4j driver on shutdown."""
+    """Manage application lifecycle — bootstrap the schema, load the graph snapshot and
+    resume interrupted model deletions on startup, stop background jobs and close
+    the Neo4j drivers on shutdown."""
+    if settings.schema_bootstrap:
+        bootstrap_schema()
+    if settings.graph_snapshot:
+        try:
+            refresh_snapshot(get_driver())
+        except Exception as e:
+            logger.warning("Graph snapshot skipped: %s", e)
+    try:
+        resumed = models.resume_model_purges(get_driver(), get_job_manager())
+        if resumed:
+            logger.info("Resumed purging %d deleted threat models", resumed)
+    except Exception as e:
+        logger.warning("Deleted model purge not resumed: %s", e)
+    try:
+        linked = models.backfill_flows_to(get_driver())
+        if linked:
+            logger.info("Linked %d data flows missing FLOWS_TO", linked)
+    except Exception as e:
+        logger.warning("FLOWS_TO backfill skipped: %s", e)
     yield
+    shutdown_job_manager()
+    clear_snapshot()
+    await close_async_driver()
     close_driver()
 
 
@@ -38,6 +85,8 @@ tags_metadata = [
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
+    configure_pool(**settings.neo4j_pool_options())
+    configure_concurrency(settings.import_write_concurrency)
     app = FastAPI(
         title=settings.app_name,
         version=settings.app_version,
@@ -68,6 +117,18 @@ def create_app() -> FastAPI:
     app.include_router(imports.router)
     app.include_router(models.router)
 
+    @app.exception_handler(TransientError)
+    @app.exception_handler(ServiceUnavailable)
+    @app.exception_handler(SessionExpired)
+    async def database_unavailable(request: Request, exc: Exception):
+        """Transient database errors that outlasted the managed-transaction retries."""
+        logger.warning("Neo4j unavailable for %s %s: %s", request.method, request.url.path, exc)
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database temporarily unavailable, please retry"},
+            headers={"Retry-After": "1"},
+        )
+
     return app
 
 
@@ -14,6 +14,23 @@ class DbHealthResponse(BaseModel):
     status: str = Field(...)
     database: str = Field(...)
     error: Optional[str] = None
+    pool: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Per driver (sync/async): max_size, open, in_use, idle and acquisition wait statistics",
+    )
+
+
+class SchemaEntry(BaseModel):
+    name: str
+    type: str
+    labels: Optional[List[str]] = None
+    properties: Optional[List[str]] = None
+    state: Optional[str] = None
+
+
+class DbSchemaResponse(BaseModel):
+    constraints: List[SchemaEntry]
+    indexes: List[SchemaEntry]
 
 
 # --- Graph ---
@@ -31,15 +48,64 @@ class NodeListResponse(BaseModel):
     nodes: List[Dict[str, Any]]
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page")
 
 
 class NodeDetailResponse(BaseModel):
     node: Dict[str, Any]
     relationships: Dict[str, List[Dict[str, Any]]]
+    relationship_counts: Dict[str, Dict[str, int]] = Field(
+        ..., description="Total relationships per direction and type, before the neighbour cap"
+    )
+    neighbour_limit: int = Field(..., description="Max neighbours returned per type and direction")
+
+
+class NeighbourListResponse(BaseModel):
+    node_id: str
+    direction: str
+    neighbours: List[Dict[str, Any]] = Field(
+        ..., description="{type, direction (out/in), node} per neighbour"
+    )
+    count: int
+    total: int = Field(..., description="Neighbours matching the filters, before the limit")
+
+
+class TraversalResponse(BaseModel):
+    node_id: str
+    direction: str
+    max_depth: int
+    nodes: List[Dict[str, Any]] = Field(..., description="Reachable nodes in BFS order, each with _depth")
+    count: int
+    truncated: bool = Field(..., description="True if more nodes were reachable than the limit")
+
+
+class CWEMapping(BaseModel):
+    cwe_id: str
+    name: Optional[str] = None
+    found: bool
+    capec: List[Dict[str, Any]] = Field(
+        ..., description="{capec_id, name, inherited}; inherited patterns come from a CHILD_OF ancestor"
+    )
+    techniques: List[Dict[str, Any]] = Field(..., description="{attack_id, name}")
+    tactics: List[Dict[str, Any]] = Field(..., description="{attack_id, name}")
+
+
+class CWEMappingResponse(BaseModel):
+    mappings: List[CWEMapping]
+    count: int
+
+
+class CWEHierarchyResponse(BaseModel):
+    cwe_id: str
+    nodes: List[Dict[str, Any]] = Field(
+        ..., description="{cwe_id, name, abstraction, numeric_id}, Pillar → Class → Base → Variant"
+    )
+    count: int
 
 
 class SearchResponse(BaseModel):
     query: str
+    labels: Optional[List[str]] = Field(None, description="Label filter applied, if any")
     results: List[Dict[str, Any]]
     count: int
 
@@ -57,3 +123,29 @@ class ImportResponse(BaseModel):
     attack_relationships: Optional[int] = Field(
         None, description="ATT&CK edge count (CAPEC imports only)"
     )
+    mapped_cwes: Optional[int] = Field(
+        None, description="CWEs with a CAPEC mapping in the rebuilt mapping index (CAPEC imports only)"
+    )
+    nodes_unchanged: int = Field(0, description="Nodes skipped because their fingerprint matched")
+    nodes_deleted: int = Field(0, description="Nodes removed because they left the catalog")
+    content_hash: Optional[str] = Field(None, description="Hash recorded on the ImportRun node")
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    kind: str
+    key: str = Field(..., description="Job key, e.g. the import source")
+    status: str = Field(..., description="queued, running, completed or failed")
+    phase: Optional[str] = Field(None, description="Current phase, e.g. nodes or relationships")
+    batches_done: int = 0
+    rows_done: int = 0
+    rows_per_sec: float = 0.0
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    errors: List[str] = []
+    result: Optional[Dict[str, Any]] = None
+
+
+class JobListResponse(BaseModel):
+    jobs: List[JobResponse]
@@ -0,0 +1,42 @@
+"""Opaque keyset cursors for list endpoints.
+
+A cursor encodes the sort key of the last row of a page, so the next page
+starts with an indexed range seek (``WHERE key > $last``) instead of
+re-reading and discarding every earlier row with SKIP. Pages also stay
+stable while other requests insert or delete rows.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    """Encode the sort key ``values`` of the last row of a ``kind`` listing."""
+    payload = json.dumps({"k": kind, "v": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int) -> List[Any]:
+    """Decode a cursor produced by ``encode_cursor`` for the same ``kind``.
+
+    Raises HTTPException 400 if the cursor is malformed or belongs to a
+    different listing.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        if payload["k"] != kind or not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeEncodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def check_paging(skip: int, cursor: Optional[str]) -> None:
+    """Reject requests that mix offset and cursor paging."""
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both")
@@ -1,44 +1,81 @@
-"""Graph query endpoints for browsing the threat knowledge graph."""
-from typing import Optional
+"""Graph query endpoints for browsing the threat knowledge graph.
 
-from fastapi import APIRouter, Depends, Query
-from neo4j import Session
+Node listing, node detail and search responses are served from the
+generation-keyed response cache in ``api.cache`` and carry strong ETags.
+Node detail, neighbour and traversal reads are answered from the in-memory
+graph snapshot (``src.graph_snapshot``) when one is loaded.
+"""
+import re
+from typing import List, Literal, Optional
 
-from api.dependencies import get_neo4j_session
-from api.models import GraphStatsResponse, NodeDetailResponse, NodeListResponse, SearchResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from neo4j import AsyncSession, Driver
+
+from api.cache import cached_response, graph_cache
+from api.config import settings
+from api.dependencies import get_async_read_session, get_neo4j_driver
+from api.models import (
+    CWEHierarchyResponse,
+    CWEMappingResponse,
+    GraphStatsResponse,
+    NeighbourListResponse,
+    NodeDetailResponse,
+    NodeListResponse,
+    SearchResponse,
+    TraversalResponse,
+)
+from api.pagination import check_paging, decode_cursor, encode_cursor
+from api.transactions import fetch_all, fetch_single
+from src.graph_schema import SEARCH_INDEX, SEARCHABLE_LABELS, public_properties
+from src.graph_snapshot import ensure_snapshot, get_snapshot
 
 router = APIRouter(prefix="/api/v1/graph", tags=["graph"])
 
 
-@router.get("/stats", response_model=GraphStatsResponse)
-def graph_stats(session: Session = Depends(get_neo4j_session)):
-    """Get graph statistics: node counts by label, total relationships."""
-    label_result = session.run("CALL db.labels() YIELD label RETURN label")
-    labels = [r["label"] for r in label_result]
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
 
-    node_counts = {}
-    for label in labels:
-        count_result = session.run(
-            f"MATCH (n:`{label}`) RETURN count(n) AS count"
-        )
-        node_counts[label] = count_result.single()["count"]
 
-    # Total relationships
-    rel_result = session.run("MATCH ()-[r]->() RETURN count(r) AS count")
-    total_relationships = rel_result.single()["count"]
+async def _compute_graph_stats(session: AsyncSession) -> dict:
+    """Read every count from the count store in two round-trips."""
+    record = await session.execute_read(
+        fetch_single,
+        """
+        CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+        CALL { CALL db.relationshipTypes() YIELD relationshipType
+               RETURN collect(relationshipType) AS rel_types }
+        RETURN labels, rel_types
+        """
+    )
+    labels, rel_types = record["labels"], record["rel_types"]
 
-    # Relationship type counts
-    rel_type_result = session.run(
-        "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+    # Each branch is a single-label or single-type count, which Neo4j
+    # answers from its count store without touching any node.
+    branches = ["MATCH ()-[r]->() RETURN 'total' AS kind, '' AS name, count(r) AS count"]
+    branches += [
+        f"MATCH (n:{_quote(label)}) RETURN 'node' AS kind, $labels[{i}] AS name, count(n) AS count"
+        for i, label in enumerate(labels)
+    ]
+    branches += [
+        f"MATCH ()-[r:{_quote(rel_type)}]->() RETURN 'rel' AS kind, $rel_types[{i}] AS name, count(r) AS count"
+        for i, rel_type in enumerate(rel_types)
+    ]
+    records = await session.execute_read(
+        fetch_all,
+        "\nUNION ALL\n".join(branches), labels=labels, rel_types=rel_types
     )
-    rel_types = [r["relationshipType"] for r in rel_type_result]
 
+    node_counts = {}
     rel_counts = {}
-    for rel_type in rel_types:
-        count_result = session.run(
-            f"MATCH ()-[r:`{rel_type}`]->() RETURN count(r) AS count"
-        )
-        rel_counts[rel_type] = count_result.single()["count"]
+    total_relationships = 0
+    for row in records:
+        if row["kind"] == "node":
+            node_counts[row["name"]] = row["count"]
+        elif row["kind"] == "rel":
+            rel_counts[row["name"]] = row["count"]
+        else:
+            total_relationships = row["count"]
 
     return {
         "node_counts": node_counts,
@@ -48,110 +85,526 @@ def graph_stats(session: Session = Depends(get_neo4j_session)):
     }
 
 
+@router.get("/stats", response_model=GraphStatsResponse)
+async def graph_stats(session: AsyncSession = Depends(get_async_read_session)):
+    """Get graph statistics: node counts by label, total relationships.
+
+    Served from an in-process cache that expires after ``graph_cache_ttl``
+    seconds and is cleared whenever an import or model change completes.
+    """
+    stats = graph_cache.get("stats")
+    if stats is None:
+        stats = await _compute_graph_stats(session)
+        graph_cache.set("stats", stats)
+    return stats
+
+
+# Tombstoned models (see api.routes.models.delete_model) and their elements
+TOMBSTONE_FILTER = (
+    "NOT n:DeletedThreatModel"
+    " AND NOT EXISTS { (:DeletedThreatModel)-[:HAS_ASSET|HAS_BOUNDARY|HAS_FLOW|HAS_DATA_ASSET]->(n) }"
+)
+
+
 @router.get("/nodes", response_model=NodeListResponse)
-def list_nodes(
+async def list_nodes(
+    request: Request,
     label: Optional[str] = Query(None, description="Filter by node label (e.g., CWE, Technique, CAPEC)"),
     search: Optional[str] = Query(None, description="Search node names"),
     skip: int = Query(0, ge=0),
     limit: int = Query(25, ge=1, le=100),
-    session: Session = Depends(get_neo4j_session),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
-    """List nodes with optional filtering by label and name search."""
-    if label:
-        query = f"MATCH (n:`{label}`)"
-    else:
-        query = "MATCH (n)"
+    """List nodes with optional filtering by label and name search.
+
+    Nodes are ordered by name, then element id. Page with ``skip`` or, to
+    keep deep pages as cheap as the first, pass back the ``next_cursor`` of
+    the previous page. Nodes without a name are not listed, so both kinds
+    of paging return the same sequence. Deleted threat models and their
+    elements are hidden while their background purge runs.
+    """
+    # Only knowledge-base labels are unaffected by threat-model writes
+    model_scoped = label not in SEARCHABLE_LABELS
+
+    async def build():
+        check_paging(skip, cursor)
+        if label:
+            query = f"MATCH (n:`{label}`)"
+        else:
+            query = "MATCH (n)"
+
+        # A null name cannot be compared against a cursor, so such nodes are
+        # left out of every page, not only cursor-paged ones
+        conditions = ["n.name IS NOT NULL"]
+        params: dict = {"skip": skip, "limit": limit + 1}
+        if model_scoped:
+            conditions.append(TOMBSTONE_FILTER)
 
-    conditions = []
-    params: dict = {"skip": skip, "limit": limit}
+        if search:
+            conditions.append("n.name CONTAINS $search")
+            params["search"] = search
 
-    if search:
-        conditions.append("n.name CONTAINS $search")
-        params["search"] = search
+        if cursor:
+            params["after_name"], params["after_id"] = decode_cursor(cursor, "nodes", 2)
+            conditions.append(
+                "(n.name > $after_name OR (n.name = $after_name AND elementId(n) > $after_id))"
+            )
 
-    if conditions:
         query += " WHERE " + " AND ".join(conditions)
 
-    query += " RETURN n, labels(n) AS labels ORDER BY n.name SKIP $skip LIMIT $limit"
+        query += (
+            " RETURN n, labels(n) AS labels, elementId(n) AS element_id"
+            " ORDER BY n.name, element_id SKIP $skip LIMIT $limit"
+        )
+
+        records = await session.execute_read(fetch_all, query, params)
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = encode_cursor("nodes", [last["n"]["name"], last["element_id"]])
+
+        nodes = []
+        for record in records:
+            node = public_properties(record["n"])
+            node["_labels"] = record["labels"]
+            nodes.append(node)
+
+        return {"nodes": nodes, "skip": skip, "limit": limit, "next_cursor": next_cursor}
+
+    return await cached_response(request, build, model_scoped=model_scoped)
 
-    result = session.run(query, params)
-    nodes = []
-    for record in result:
-        node = dict(record["n"])
-        node["_labels"] = record["labels"]
-        nodes.append(node)
 
-    return {"nodes": nodes, "skip": skip, "limit": limit}
+# Primary ID formats → (label, indexed ID property). Order matters: TA must
+# be tried before T, and DS/DC before anything shorter.
+ID_ROUTES = (
+    (re.compile(r"CWE-\d+"), "CWE", "cwe_id"),
+    (re.compile(r"CAPEC-\d+"), "CAPEC", "capec_id"),
+    (re.compile(r"TA\d{4}"), "Tactic", "attack_id"),
+    (re.compile(r"T\d{4}(\.\d{3})?"), "Technique", "attack_id"),
+    (re.compile(r"DS\d{4}"), "DataSource", "attack_id"),
+    (re.compile(r"DC\d{4}"), "DataComponent", "attack_id"),
+    (re.compile(r"M\d{4}"), "Mitigation", "attack_id"),
+    (re.compile(r"G\d{4}"), "Group", "attack_id"),
+    (re.compile(r"S\d{4}"), "Software", "attack_id"),
+    (re.compile(r"C\d{4}"), "Campaign", "attack_id"),
+)
+
+
+def route_node_id(node_id: str) -> Optional[tuple[str, str, str]]:
+    """Map a primary ID to ``(label, id_property, normalised_id)``, or None if unrecognised."""
+    normalised = node_id.strip().upper()
+    for pattern, label, prop in ID_ROUTES:
+        if pattern.fullmatch(normalised):
+            return label, prop, normalised
+    return None
 
 
 @router.get("/nodes/{node_id}", response_model=NodeDetailResponse)
-def get_node(
+async def get_node(
+    request: Request,
     node_id: str,
-    session: Session = Depends(get_neo4j_session),
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000,
+        description="Max neighbours returned per relationship type and direction "
+                    "(default: node_neighbour_limit setting)",
+    ),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
     """Get a single node by its primary ID with its relationships.
 
-    Accepts CWE IDs (CWE-79), ATT&CK IDs (T1059), or CAPEC IDs (CAPEC-1).
+    Accepts CWE IDs (CWE-79), CAPEC IDs (CAPEC-1) and ATT&CK IDs (T1059,
+    T1059.001, TA0002, M1036, G0007, S0002, C0001, DS0017, DC0001). The ID
+    prefix selects the label, so the lookup uses that label's unique index.
+    Outgoing and incoming neighbours are fetched in separate subqueries and
+    capped per relationship type; ``relationship_counts`` holds the full
+    per-type totals. While the graph snapshot is loaded the node is read from
+    it instead, without a database round-trip.
     """
-    # Try matching by different ID fields
-    result = session.run(
-        """
-        MATCH (n)
-        WHERE n.cwe_id = $id OR n.attack_id = $id OR n.capec_id = $id
-        OPTIONAL MATCH (n)-[r]->(target)
-        OPTIONAL MATCH (source)-[r2]->(n)
-        RETURN n, labels(n) AS labels,
-               collect(DISTINCT {type: type(r), target: properties(target), target_labels: labels(target)}) AS outgoing,
-               collect(DISTINCT {type: type(r2), source: properties(source), source_labels: labels(source)}) AS incoming
+    async def build():
+        route = route_node_id(node_id)
+        if route is None:
+            raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+        label, prop, normalised = route
+        neighbour_limit = limit or settings.node_neighbour_limit
+
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            detail = snapshot.get_node(normalised, neighbour_limit)
+            if detail is None:
+                raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+            return detail
+
+        record = await session.execute_read(
+            fetch_single,
+            f"""
+            MATCH (n:{label} {{{prop}: $id}})
+            CALL {{
+                WITH n
+                MATCH (n)-[r]->(target)
+                WITH type(r) AS type, target ORDER BY target.name
+                WITH type, collect(target) AS targets
+                RETURN collect({{
+                    type: type,
+                    count: size(targets),
+                    nodes: [t IN targets[..$limit] | {{properties: properties(t), labels: labels(t)}}]
+                }}) AS outgoing
+            }}
+            CALL {{
+                WITH n
+                MATCH (n)<-[r]-(source)
+                WITH type(r) AS type, source ORDER BY source.name
+                WITH type, collect(source) AS sources
+                RETURN collect({{
+                    type: type,
+                    count: size(sources),
+                    nodes: [s IN sources[..$limit] | {{properties: properties(s), labels: labels(s)}}]
+                }}) AS incoming
+            }}
+            RETURN n, labels(n) AS labels, outgoing, incoming
+            """,
+            id=normalised,
+            limit=neighbour_limit,
+        )
+        if not record:
+            raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+        node = public_properties(record["n"])
+        node["_labels"] = record["labels"]
+
+        outgoing = [
+            {
+                "type": group["type"],
+                "target": public_properties(n["properties"]),
+                "target_labels": n["labels"],
+            }
+            for group in record["outgoing"] for n in group["nodes"]
+        ]
+        incoming = [
+            {
+                "type": group["type"],
+                "source": public_properties(n["properties"]),
+                "source_labels": n["labels"],
+            }
+            for group in record["incoming"] for n in group["nodes"]
+        ]
+
+        return {
+            "node": node,
+            "relationships": {
+                "outgoing": outgoing,
+                "incoming": incoming,
+            },
+            "relationship_counts": {
+                "outgoing": {g["type"]: g["count"] for g in record["outgoing"]},
+                "incoming": {g["type"]: g["count"] for g in record["incoming"]},
+            },
+            "neighbour_limit": neighbour_limit,
+        }
+
+    return await cached_response(request, build)
+
+
+async def _snapshot_for(driver: Driver):
+    """The loaded graph snapshot, built from Neo4j on first use."""
+    return get_snapshot() or await run_in_threadpool(ensure_snapshot, driver)
+
+
+def _snapshot_node_id(node_id: str) -> str:
+    route = route_node_id(node_id)
+    if route is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    return route[2]
+
+
+@router.get("/nodes/{node_id}/neighbours", response_model=NeighbourListResponse)
+async def get_neighbours(
+    request: Request,
+    node_id: str,
+    rel_type: Optional[List[str]] = Query(
+        None, description="Only follow these relationship types (repeatable, e.g. CHILD_OF)"
+    ),
+    direction: Literal["out", "in", "both"] = Query("both"),
+    limit: int = Query(100, ge=1, le=1000),
+    driver: Driver = Depends(get_neo4j_driver),
+):
+    """List a node's direct neighbours from the in-memory graph snapshot.
+
+    Neighbours are grouped by direction and relationship type and ordered
+    by name; ``total`` is the count before ``limit`` is applied.
+    """
+    async def build():
+        normalised = _snapshot_node_id(node_id)
+        snapshot = await _snapshot_for(driver)
+        node = snapshot.index.get(normalised)
+        if node is None:
+            raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+        neighbours = []
+        total = 0
+        for side, rel, neighbour in snapshot.iter_neighbours(node, direction, rel_type):
+            total += 1
+            if len(neighbours) < limit:
+                neighbours.append({
+                    "type": rel,
+                    "direction": side,
+                    "node": snapshot.node_dict(neighbour),
+                })
+        return {
+            "node_id": normalised,
+            "direction": direction,
+            "neighbours": neighbours,
+            "count": len(neighbours),
+            "total": total,
+        }
+
+    return await cached_response(request, build)
+
+
+@router.get("/nodes/{node_id}/traverse", response_model=TraversalResponse)
+async def traverse_graph(
+    request: Request,
+    node_id: str,
+    rel_type: Optional[List[str]] = Query(
+        None, description="Only follow these relationship types (repeatable, e.g. CHILD_OF)"
+    ),
+    direction: Literal["out", "in", "both"] = Query("out"),
+    max_depth: int = Query(3, ge=1, le=10),
+    limit: int = Query(500, ge=1, le=5000),
+    driver: Driver = Depends(get_neo4j_driver),
+):
+    """Breadth-first traversal from a node over the in-memory graph snapshot.
+
+    E.g. ``rel_type=CHILD_OF&direction=out`` walks a CWE's ancestors and
+    ``direction=in`` its descendants. Every reachable node is returned once
+    with ``_depth``, its hop distance from the start, in BFS order.
+    """
+    async def build():
+        normalised = _snapshot_node_id(node_id)
+        snapshot = await _snapshot_for(driver)
+        found = snapshot.traverse(normalised, rel_type, direction, max_depth, limit + 1)
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+
+        nodes = [{**snapshot.node_dict(node), "_depth": depth} for node, depth in found[:limit]]
+        return {
+            "node_id": normalised,
+            "direction": direction,
+            "max_depth": max_depth,
+            "nodes": nodes,
+            "count": len(nodes),
+            "truncated": len(found) > limit,
+        }
+
+    return await cached_response(request, build)
+
+
+MAX_MAPPING_IDS = 200
+_CWE_ID = re.compile(r"(?:CWE-)?(\d+)")
+
+
+def _normalise_cwe_id(raw: str) -> str:
+    match = _CWE_ID.fullmatch(raw.strip().upper())
+    if match is None:
+        raise HTTPException(status_code=422, detail=f"Invalid CWE ID: {raw}")
+    return f"CWE-{match.group(1)}"
+
+
+@router.get("/mappings/cwe", response_model=CWEMappingResponse)
+async def map_cwes(
+    request: Request,
+    cwe_id: List[str] = Query(..., description="CWE IDs to map (repeatable, CWE-79 or 79)"),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """Map a batch of CWEs to CAPEC attack patterns, ATT&CK techniques and tactics.
+
+    Answered from the mapping index the CAPEC import stores on each CWE, so
+    the whole batch costs one query with one index seek per CWE and node.
+    CAPEC patterns linked to a ``CHILD_OF`` ancestor rather than the CWE
+    itself are included with ``inherited: true``. Results keep the request
+    order; unknown CWEs come back with ``found: false``.
+    """
+    async def build():
+        ids = list(dict.fromkeys(_normalise_cwe_id(raw) for raw in cwe_id))
+        if len(ids) > MAX_MAPPING_IDS:
+            raise HTTPException(status_code=422, detail=f"At most {MAX_MAPPING_IDS} CWE IDs per request")
+
+        records = await session.execute_read(
+            fetch_all,
+            """
+            UNWIND $ids AS id
+            OPTIONAL MATCH (w:CWE {cwe_id: id})
+            CALL {
+                WITH w
+                MATCH (c:CAPEC) WHERE c.capec_id IN coalesce(w.mapped_capec, [])
+                WITH c ORDER BY c.numeric_id
+                RETURN collect(c {
+                    .capec_id, .name,
+                    inherited: NOT c.capec_id IN w.mapped_capec_direct
+                }) AS capec
+            }
+            CALL {
+                WITH w
+                MATCH (t:Technique) WHERE t.attack_id IN coalesce(w.mapped_techniques, [])
+                WITH t ORDER BY t.attack_id
+                RETURN collect(t {.attack_id, .name}) AS techniques
+            }
+            CALL {
+                WITH w
+                MATCH (t:Tactic) WHERE t.attack_id IN coalesce(w.mapped_tactics, [])
+                WITH t ORDER BY t.attack_id
+                RETURN collect(t {.attack_id, .name}) AS tactics
+            }
+            RETURN id AS cwe_id, w.name AS name, w IS NOT NULL AS found,
+                   capec, techniques, tactics
+            """,
+            ids=ids,
+        )
+        mappings = [dict(record) for record in records]
+        return {"mappings": mappings, "count": len(mappings)}
+
+    return await cached_response(request, build)
+
+
+# CWE abstraction levels, most general first
+ABSTRACTION_ORDER = ("Pillar", "Class", "Base", "Variant", "Compound")
+
+
+async def _cwe_hierarchy(session: AsyncSession, cwe_id: str, prop: str,
+                         abstraction: Optional[List[str]]) -> dict:
+    """Resolve the CWEs listed in the stored closure property ``prop`` of ``cwe_id``."""
+    normalised = _normalise_cwe_id(cwe_id)
+    record = await session.execute_read(
+        fetch_single,
+        f"""
+        MATCH (w:CWE {{cwe_id: $id}})
+        CALL {{
+            WITH w
+            MATCH (r:CWE)
+            WHERE r.cwe_id IN coalesce(w.{prop}, [])
+              AND ($abstraction IS NULL OR r.abstraction IN $abstraction)
+            RETURN collect(r {{.cwe_id, .name, .abstraction, .numeric_id}}) AS related
+        }}
+        RETURN w.{prop} IS NOT NULL AS indexed, related
         """,
-        id=node_id,
+        id=normalised,
+        abstraction=abstraction or None,
     )
-
-    record = result.single()
     if not record:
-        return {"error": "Node not found", "node_id": node_id}
+        raise HTTPException(status_code=404, detail=f"Node {cwe_id} not found")
+    if not record["indexed"]:
+        raise HTTPException(
+            status_code=409,
+            detail="CWE hierarchy index missing; re-run the CWE import with force=true",
+        )
+
+    rank = {name: i for i, name in enumerate(ABSTRACTION_ORDER)}
+    related = sorted(
+        record["related"],
+        key=lambda n: (rank.get(n.get("abstraction"), len(rank)), n.get("numeric_id") or 0),
+    )
+    return {"cwe_id": normalised, "nodes": related, "count": len(related)}
 
-    node = dict(record["n"])
-    node["_labels"] = record["labels"]
 
-    # Filter out null entries from optional matches
-    outgoing = [r for r in record["outgoing"] if r["type"] is not None]
-    incoming = [r for r in record["incoming"] if r["type"] is not None]
+@router.get("/cwe/{cwe_id}/ancestors", response_model=CWEHierarchyResponse)
+async def cwe_ancestors(
+    request: Request,
+    cwe_id: str,
+    abstraction: Optional[List[str]] = Query(
+        None, description="Only these abstraction levels (repeatable, e.g. Pillar, Class)"
+    ),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """Every CWE the given CWE is transitively ``CHILD_OF``, most general first.
+
+    Read from the closure the CWE import stores on each node, so the cost
+    does not depend on the depth or fan-out of the hierarchy.
+    """
+    async def build():
+        return await _cwe_hierarchy(session, cwe_id, "ancestor_ids", abstraction)
+
+    return await cached_response(request, build)
+
+
+@router.get("/cwe/{cwe_id}/descendants", response_model=CWEHierarchyResponse)
+async def cwe_descendants(
+    request: Request,
+    cwe_id: str,
+    abstraction: Optional[List[str]] = Query(
+        None, description="Only these abstraction levels (repeatable, e.g. Base, Variant)"
+    ),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """Every CWE that is transitively ``CHILD_OF`` the given CWE, most general first."""
+    async def build():
+        return await _cwe_hierarchy(session, cwe_id, "descendant_ids", abstraction)
+
+    return await cached_response(request, build)
+
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
 
-    return {
-        "node": node,
-        "relationships": {
-            "outgoing": outgoing,
-            "incoming": incoming,
-        },
-    }
+
+def _fulltext_query(q: str) -> str:
+    """Turn free text into a Lucene query: every term must match, the last one as a prefix.
+
+    Lucene operators in the input are escaped (and terms lowercased, so AND/OR
+    are not read as operators) so user text is always treated literally; the
+    prefix match keeps search-as-you-type useful.
+    """
+    terms = [_LUCENE_SPECIAL.sub(r"\\\1", t) for t in q.lower().split()]
+    last = terms.pop()
+    return " AND ".join(terms + [f"({last} OR {last}*)"])
 
 
 @router.get("/search", response_model=SearchResponse)
-def search_graph(
+async def search_graph(
+    request: Request,
     q: str = Query(..., min_length=2, description="Search query"),
+    label: Optional[List[str]] = Query(
+        None, description="Restrict results to these labels (repeatable, e.g. CWE, Technique)"
+    ),
     limit: int = Query(20, ge=1, le=100),
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
-    """Full-text search across all node names and descriptions."""
-    result = session.run(
-        """
-        MATCH (n)
-        WHERE n.name CONTAINS $q OR n.description CONTAINS $q
-        RETURN n, labels(n) AS labels
-        ORDER BY
-            CASE WHEN n.name CONTAINS $q THEN 0 ELSE 1 END,
-            n.name
-        LIMIT $limit
-        """,
-        q=q,
-        limit=limit,
-    )
+    """Full-text search across knowledge-base node names and descriptions.
 
-    nodes = []
-    for record in result:
-        node = dict(record["n"])
-        node["_labels"] = record["labels"]
-        nodes.append(node)
+    Backed by the ``knowledge_text`` full-text index; results are ordered by
+    relevance and each carries its ``_score``.
+    """
+    async def build():
+        if not q.strip():
+            raise HTTPException(status_code=422, detail="Search query must not be blank")
+        unknown = sorted(set(label or ()) - set(SEARCHABLE_LABELS))
+        if unknown:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unsupported label(s): {', '.join(unknown)}. Searchable: {', '.join(SEARCHABLE_LABELS)}",
+            )
+
+        records = await session.execute_read(
+            fetch_all,
+            """
+            CALL db.index.fulltext.queryNodes($index, $query) YIELD node, score
+            WHERE $labels IS NULL OR any(l IN labels(node) WHERE l IN $labels)
+            RETURN node AS n, labels(node) AS labels, score
+            ORDER BY score DESC
+            LIMIT $limit
+            """,
+            index=SEARCH_INDEX,
+            query=_fulltext_query(q),
+            labels=label or None,
+            limit=limit,
+        )
+
+        nodes = []
+        for record in records:
+            node = public_properties(record["n"])
+            node["_labels"] = record["labels"]
+            node["_score"] = record["score"]
+            nodes.append(node)
+
+        return {"query": q, "labels": label, "results": nodes, "count": len(nodes)}
 
-    return {"query": q, "results": nodes, "count": len(nodes)}
+    return await cached_response(request, build)
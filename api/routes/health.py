@@ -1,9 +1,11 @@
 """Health check endpoints."""
 from fastapi import APIRouter, Depends
-from neo4j import Driver
+from neo4j import Driver, Session
 
-from api.dependencies import get_neo4j_driver
-from api.models import DbHealthResponse, HealthResponse
+from api.dependencies import get_neo4j_driver, get_neo4j_session
+from api.models import DbHealthResponse, DbSchemaResponse, HealthResponse
+from src.db import get_pool_metrics
+from src.graph_schema import describe_schema
 
 router = APIRouter(tags=["health"])
 
@@ -16,9 +18,15 @@ def health_check():
 
 @router.get("/health/db", response_model=DbHealthResponse)
 def db_health_check(driver: Driver = Depends(get_neo4j_driver)):
-    """Database health check — verifies Neo4j connectivity."""
+    """Database health check — verifies Neo4j connectivity and reports connection pool metrics."""
     try:
         driver.verify_connectivity()
-        return {"status": "ok", "database": "connected"}
+        return {"status": "ok", "database": "connected", "pool": get_pool_metrics()}
     except Exception as e:
-        return {"status": "degraded", "database": "disconnected", "error": str(e)}
+        return {"status": "degraded", "database": "disconnected", "error": str(e), "pool": get_pool_metrics()}
+
+
+@router.get("/health/db/schema", response_model=DbSchemaResponse)
+def db_schema(session: Session = Depends(get_neo4j_session)):
+    """List the constraints and indexes present in Neo4j."""
+    return describe_schema(session)
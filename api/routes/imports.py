@@ -2,11 +2,15 @@
 import os
 from enum import Enum
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from neo4j import Driver
 
+from api.cache import invalidate_graph_caches
+from api.config import settings
 from api.dependencies import get_neo4j_driver
-from api.models import ImportResponse
+from api.jobs import JobConflictError, JobManager, get_job_manager
+from api.models import JobListResponse, JobResponse
+from src.graph_snapshot import get_snapshot, refresh_snapshot
 
 router = APIRouter(prefix="/api/v1/import", tags=["import"])
 
@@ -19,61 +23,87 @@ class ImportSource(str, Enum):
     capec = "capec"
 
 
-@router.post("/trigger/{source}", response_model=ImportResponse)
+@router.post("/trigger/{source}", response_model=JobResponse, status_code=202)
 def trigger_import(
     source: ImportSource,
+    force: bool = Query(False, description="Re-import even if the source file is unchanged"),
     driver: Driver = Depends(get_neo4j_driver),
+    jobs: JobManager = Depends(get_job_manager),
 ):
-    """Trigger an import of a security knowledge base into Neo4j.
+    """Queue an import of a security knowledge base into Neo4j.
 
     Supported sources: cwe, attack, capec.
     Data files must exist in the data/ directory.
+
+    Returns immediately with a job; poll ``GET /api/v1/import/jobs/{job_id}``
+    for progress. Only one import per source may be queued or running.
+
+    If the file is byte-identical to the last import the run is skipped
+    (result status ``unchanged``); otherwise only changed nodes and edges are
+    written and nodes that disappeared are deleted. ``force`` rewrites everything.
     """
     if source == ImportSource.cwe:
         xml_path = os.path.join(DATA_DIR, "cwec_v4.19.1.xml")
         if not os.path.exists(xml_path):
             raise HTTPException(status_code=404, detail="CWE XML file not found in data/")
 
-        from importers.cwe_importer import parse_cwe_xml, import_cwe_to_neo4j
+        from importers.cwe_importer import run_cwe_import
 
-        weaknesses = parse_cwe_xml(xml_path)
-        node_count, edge_count = import_cwe_to_neo4j(driver, weaknesses)
-        return {
-            "source": "cwe",
-            "status": "completed",
-            "nodes_imported": node_count,
-            "relationships_imported": edge_count,
-        }
+        def run(progress):
+            return {"source": "cwe", **run_cwe_import(driver, xml_path, force=force, progress=progress)}
 
     elif source == ImportSource.attack:
         json_path = os.path.join(DATA_DIR, "enterprise-attack.json")
         if not os.path.exists(json_path):
             raise HTTPException(status_code=404, detail="ATT&CK JSON file not found in data/")
 
-        from importers.attack_importer import parse_attack_stix, import_attack_to_neo4j
+        from importers.attack_importer import run_attack_import
 
-        objects, relationships = parse_attack_stix(json_path)
-        node_count, rel_count = import_attack_to_neo4j(driver, objects, relationships)
-        return {
-            "source": "attack",
-            "status": "completed",
-            "nodes_imported": node_count,
-            "relationships_imported": rel_count,
-        }
+        def run(progress):
+            return {"source": "attack", **run_attack_import(driver, json_path, force=force, progress=progress)}
 
     elif source == ImportSource.capec:
         xml_path = os.path.join(DATA_DIR, "capec_latest.xml")
         if not os.path.exists(xml_path):
             raise HTTPException(status_code=404, detail="CAPEC XML file not found in data/")
 
-        from importers.capec_importer import parse_capec_xml, import_capec_to_neo4j
-
-        patterns = parse_capec_xml(xml_path)
-        node_count, cwe_edges, attack_edges = import_capec_to_neo4j(driver, patterns)
-        return {
-            "source": "capec",
-            "status": "completed",
-            "nodes_imported": node_count,
-            "cwe_relationships": cwe_edges,
-            "attack_relationships": attack_edges,
-        }
+        from importers.capec_importer import run_capec_import
+
+        def run(progress):
+            return {"source": "capec", **run_capec_import(driver, xml_path, force=force, progress=progress)}
+
+    def run_and_invalidate(progress):
+        # Even a failed import may have written part of the graph
+        result = None
+        try:
+            result = run(progress)
+            return result
+        finally:
+            changed = result is None or result.get("status") != "unchanged"
+            if changed and (settings.graph_snapshot or get_snapshot() is not None):
+                refresh_snapshot(driver)
+            invalidate_graph_caches()
+
+    try:
+        job = jobs.submit("import", source.value, run_and_invalidate)
+    except JobConflictError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "job_id": e.job.job_id},
+        )
+    return job.to_dict()
+
+
+@router.get("/jobs", response_model=JobListResponse)
+def list_import_jobs(jobs: JobManager = Depends(get_job_manager)):
+    """List import jobs, newest first."""
+    return {"jobs": [j.to_dict() for j in jobs.list(kind="import")]}
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_import_job(job_id: str, jobs: JobManager = Depends(get_job_manager)):
+    """Report an import job's status, phase, batches done, throughput and errors."""
+    job = jobs.get(job_id)
+    if job is None or job.kind != "import":
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
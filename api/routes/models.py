@@ -1,23 +1,39 @@
 """Threat model CRUD endpoints."""
-from typing import Optional
+import json
+from typing import Callable, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from neo4j import Session
+from fastapi.concurrency import run_in_threadpool
+from neo4j import AsyncSession, Driver
 
-from api.dependencies import get_neo4j_session
+from api.cache import attack_path_cache, invalidate_after_write, invalidate_model_caches
+from api.config import settings
+from api.dependencies import get_async_read_session, get_async_write_session, get_neo4j_driver
+from api.jobs import Job, JobConflictError, JobManager, get_job_manager
+from api.models import JobResponse
+from api.pagination import check_paging, decode_cursor, encode_cursor
+from api.transactions import fetch_all, fetch_single
+from src.attack_paths import default_entries, default_targets, find_attack_paths
+from src.schema.validator import get_schema_properties, validate_many, validate_partial
+from src.threat_engine import attach_knowledge, match_threats
 
-router = APIRouter(prefix="/api/v1/models", tags=["models"])
+router = APIRouter(
+    prefix="/api/v1/models",
+    tags=["models"],
+    dependencies=[Depends(invalidate_after_write)],
+)
 
 
 @router.post("")
-def create_model(
+async def create_model(
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Create a new threat model."""
     model_id = f"model-{uuid4().hex[:12]}"
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         CREATE (m:ThreatModel {
             model_id: $model_id,
@@ -25,7 +41,8 @@ def create_model(
             description: $description,
             version: $version,
             created: datetime(),
-            updated: datetime()
+            updated: datetime(),
+            revision: 0
         })
         RETURN m, m.model_id AS model_id
         """,
@@ -34,7 +51,6 @@ def create_model(
         description=body.get("description", ""),
         version=body.get("version", "0.1.0"),
     )
-    record = result.single()
     node = dict(record["m"])
     # Convert neo4j datetime to ISO string
     for key in ("created", "updated"):
@@ -44,49 +60,76 @@ def create_model(
 
 
 @router.get("")
-def list_models(
+async def list_models(
     skip: int = Query(0, ge=0),
     limit: int = Query(25, ge=1, le=100),
-    session: Session = Depends(get_neo4j_session),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
-    """List all threat models."""
-    result = session.run(
-        "MATCH (m:ThreatModel) RETURN m ORDER BY m.updated DESC SKIP $skip LIMIT $limit",
-        skip=skip,
-        limit=limit,
+    """List all threat models, most recently updated first.
+
+    Page with ``skip`` or pass back the ``next_cursor`` of the previous page;
+    cursor pages seek on the (updated, model_id) key instead of skipping rows.
+    """
+    check_paging(skip, cursor)
+    params: dict = {"skip": skip, "limit": limit + 1}
+    where = ""
+    if cursor:
+        params["after_updated"], params["after_id"] = decode_cursor(cursor, "models", 2)
+        where = (
+            "WHERE m.updated < datetime($after_updated)"
+            " OR (m.updated = datetime($after_updated) AND m.model_id < $after_id)"
+        )
+
+    records = await session.execute_read(
+        fetch_all,
+        f"""
+        MATCH (m:ThreatModel)
+        {where}
+        RETURN m ORDER BY m.updated DESC, m.model_id DESC SKIP $skip LIMIT $limit
+        """,
+        params,
     )
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]["m"]
+        next_cursor = encode_cursor("models", [str(last["updated"]), last["model_id"]])
+
     models = []
-    for record in result:
+    for record in records:
         node = dict(record["m"])
         for key in ("created", "updated"):
             if node.get(key):
                 node[key] = str(node[key])
         models.append(node)
-    return {"models": models, "skip": skip, "limit": limit}
+    return {"models": models, "skip": skip, "limit": limit, "next_cursor": next_cursor}
+
+
+# Each element type is collected in its own subquery, so the rows read
+# grow with |TA| + |TB| + |DF| + |DA|, not with their product as chained
+# OPTIONAL MATCHes would (see benchmarks/bench_model_load.py)
+MODEL_LOAD_QUERY = """
+MATCH (m:ThreatModel {model_id: $model_id})
+CALL { WITH m MATCH (m)-[:HAS_ASSET]->(n:TechnicalAsset)
+       RETURN collect(properties(n)) AS technical_assets }
+CALL { WITH m MATCH (m)-[:HAS_BOUNDARY]->(n:TrustBoundary)
+       RETURN collect(properties(n)) AS trust_boundaries }
+CALL { WITH m MATCH (m)-[:HAS_FLOW]->(n:DataFlow)
+       RETURN collect(properties(n)) AS data_flows }
+CALL { WITH m MATCH (m)-[:HAS_DATA_ASSET]->(n:DataAsset)
+       RETURN collect(properties(n)) AS data_assets }
+RETURN m, technical_assets, trust_boundaries, data_flows, data_assets
+"""
 
 
 @router.get("/{model_id}")
-def get_model(
+async def get_model(
     model_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ):
     """Get a threat model by ID with all its assets."""
-    result = session.run(
-        """
-        MATCH (m:ThreatModel {model_id: $model_id})
-        OPTIONAL MATCH (m)-[:HAS_ASSET]->(ta:TechnicalAsset)
-        OPTIONAL MATCH (m)-[:HAS_BOUNDARY]->(tb:TrustBoundary)
-        OPTIONAL MATCH (m)-[:HAS_FLOW]->(df:DataFlow)
-        OPTIONAL MATCH (m)-[:HAS_DATA_ASSET]->(da:DataAsset)
-        RETURN m,
-               collect(DISTINCT properties(ta)) AS technical_assets,
-               collect(DISTINCT properties(tb)) AS trust_boundaries,
-               collect(DISTINCT properties(df)) AS data_flows,
-               collect(DISTINCT properties(da)) AS data_assets
-        """,
-        model_id=model_id,
-    )
-    record = result.single()
+    record = await session.execute_read(fetch_single, MODEL_LOAD_QUERY, model_id=model_id)
     if not record or record["m"] is None:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
 
@@ -95,24 +138,20 @@ def get_model(
         if node.get(key):
             node[key] = str(node[key])
 
-    # Filter out empty dicts from optional matches
-    def filter_empty(items):
-        return [i for i in items if i]
-
     return {
         "model": node,
-        "technical_assets": filter_empty(record["technical_assets"]),
-        "trust_boundaries": filter_empty(record["trust_boundaries"]),
-        "data_flows": filter_empty(record["data_flows"]),
-        "data_assets": filter_empty(record["data_assets"]),
+        "technical_assets": record["technical_assets"],
+        "trust_boundaries": record["trust_boundaries"],
+        "data_flows": record["data_flows"],
+        "data_assets": record["data_assets"],
     }
 
 
 @router.put("/{model_id}")
-def update_model(
+async def update_model(
     model_id: str,
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Update a threat model's properties."""
     # Build SET clause dynamically from allowed fields
@@ -123,14 +162,15 @@ def update_model(
 
     set_parts = [f"m.{k} = ${k}" for k in updates]
     set_parts.append("m.updated = datetime()")
+    set_parts.append("m.revision = coalesce(m.revision, 0) + 1")
     set_clause = ", ".join(set_parts)
 
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         f"MATCH (m:ThreatModel {{model_id: $model_id}}) SET {set_clause} RETURN m",
         model_id=model_id,
         **updates,
     )
-    record = result.single()
     if not record:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
 
@@ -141,48 +181,155 @@ def update_model(
     return node
 
 
-@router.delete("/{model_id}")
-def delete_model(
+# Deleting a model relabels it as a tombstone, which no reader matches, and
+# purges its elements in bounded transactions on a background job, so a
+# large model never has to be deleted (and held in memory) all at once.
+
+PURGE_BATCH_QUERY = """
+MATCH (:DeletedThreatModel {model_id: $model_id})-->(n)
+WITH n LIMIT $batch_size
+DETACH DELETE n
+RETURN count(*) AS deleted
+"""
+
+PURGE_TOMBSTONE_QUERY = """
+MATCH (m:DeletedThreatModel {model_id: $model_id})
+DETACH DELETE m
+"""
+
+
+def purge_deleted_model(driver, model_id: str, batch_size: int,
+                        progress: Optional[Callable[[str, int], None]] = None) -> dict:
+    """Delete a tombstoned model's elements ``batch_size`` at a time, then the tombstone."""
+    purged = 0
+    with driver.session() as session:
+        while True:
+            record = session.execute_write(
+                lambda tx: tx.run(PURGE_BATCH_QUERY, model_id=model_id, batch_size=batch_size).single()
+            )
+            deleted = record["deleted"] if record else 0
+            purged += deleted
+            if deleted and progress:
+                progress("elements", deleted)
+            if deleted < batch_size:
+                break
+        session.execute_write(lambda tx: tx.run(PURGE_TOMBSTONE_QUERY, model_id=model_id).consume())
+    invalidate_model_caches()
+    return {"model_id": model_id, "elements_deleted": purged}
+
+
+def submit_purge(jobs: JobManager, driver, model_id: str) -> Job:
+    return jobs.submit(
+        "delete-model", model_id,
+        lambda progress: purge_deleted_model(driver, model_id, settings.purge_batch_size, progress),
+    )
+
+
+def resume_model_purges(driver, jobs: JobManager) -> int:
+    """Queue purges for tombstones left by a restart mid-purge; returns how many."""
+    with driver.session() as session:
+        model_ids = session.execute_read(
+            lambda tx: [r["model_id"] for r in tx.run("MATCH (m:DeletedThreatModel) RETURN m.model_id AS model_id")]
+        )
+    for model_id in model_ids:
+        try:
+            submit_purge(jobs, driver, model_id)
+        except JobConflictError:
+            pass
+    return len(model_ids)
+
+
+# Materialise FLOWS_TO for flows stored before it existed, or whose assets were
+# missing when the flow was written. MERGE on the flow ID keeps reruns no-ops.
+BACKFILL_FLOWS_TO_QUERY = """
+MATCH (m:ThreatModel)-[:HAS_FLOW]->(df:DataFlow)
+MATCH (m)-[:HAS_ASSET]->(s:TechnicalAsset {asset_id: df.source})
+MATCH (m)-[:HAS_ASSET]->(t:TechnicalAsset {asset_id: df.target})
+WHERE NOT EXISTS { (s)-[:FLOWS_TO {flow_id: df.flow_id}]->(t) }
+MERGE (s)-[f:FLOWS_TO {flow_id: df.flow_id}]->(t)
+SET f.protocol = df.protocol,
+    f.crosses_trust_boundary = coalesce(df.crosses_trust_boundary, false) OR df.trust_boundary_id IS NOT NULL,
+    f.trust_boundary_id = df.trust_boundary_id
+WITH m, count(f) AS linked
+SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
+RETURN sum(linked) AS linked
+"""
+
+
+def backfill_flows_to(driver) -> int:
+    """Link data flows that lack a FLOWS_TO relationship; returns how many were linked."""
+    with driver.session() as session:
+        record = session.execute_write(lambda tx: tx.run(BACKFILL_FLOWS_TO_QUERY).single())
+    linked = (record["linked"] if record else None) or 0
+    if linked:
+        invalidate_model_caches()
+    return linked
+
+
+@router.delete("/{model_id}", status_code=202)
+async def delete_model(
     model_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
+    driver: Driver = Depends(get_neo4j_driver),
+    jobs: JobManager = Depends(get_job_manager),
 ):
-    """Delete a threat model and all its related nodes."""
-    result = session.run(
+    """Delete a threat model and all its related nodes.
+
+    The model disappears for readers as soon as this returns; its elements
+    are purged in batches by a ``delete-model`` job, which can be polled at
+    ``GET /api/v1/models/jobs/{job_id}``.
+    """
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})
-        OPTIONAL MATCH (m)-[r]->(child)
-        DETACH DELETE child, m
+        REMOVE m:ThreatModel
+        SET m:DeletedThreatModel, m.deleted = datetime()
         RETURN count(m) AS deleted
         """,
         model_id=model_id,
     )
-    record = result.single()
     if record["deleted"] == 0:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
-    return {"status": "deleted", "model_id": model_id}
+    job = submit_purge(jobs, driver, model_id)
+    return {"status": "deleted", "model_id": model_id, "job_id": job.job_id}
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_delete_job(job_id: str, jobs: JobManager = Depends(get_job_manager)):
+    """Report a model deletion job's status, elements purged and errors."""
+    job = jobs.get(job_id)
+    if job is None or job.kind != "delete-model":
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
 
 
 # --- Technical Asset CRUD within a model ---
 
 
 @router.post("/{model_id}/assets")
-def add_technical_asset(
+async def add_technical_asset(
     model_id: str,
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Add a technical asset to a threat model."""
     asset_id = f"ta-{uuid4().hex[:12]}"
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})
         CREATE (ta:TechnicalAsset {
             asset_id: $asset_id,
             name: $name,
             type: $type,
-            description: $description
+            description: $description,
+            criticality: $criticality,
+            technology_stack: $technology_stack,
+            tags: $tags
         })
         CREATE (m)-[:HAS_ASSET]->(ta)
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         RETURN ta
         """,
         model_id=model_id,
@@ -190,30 +337,33 @@ def add_technical_asset(
         name=body.get("name", ""),
         type=body.get("type", "process"),
         description=body.get("description", ""),
+        criticality=body.get("criticality", "medium"),
+        technology_stack=body.get("technology_stack", []),
+        tags=body.get("tags", []),
     )
-    record = result.single()
     if not record:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
     return dict(record["ta"])
 
 
 @router.delete("/{model_id}/assets/{asset_id}")
-def delete_technical_asset(
+async def delete_technical_asset(
     model_id: str,
     asset_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Remove a technical asset from a threat model."""
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_ASSET]->(ta:TechnicalAsset {asset_id: $asset_id})
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         DETACH DELETE ta
         RETURN count(ta) AS deleted
         """,
         model_id=model_id,
         asset_id=asset_id,
     )
-    record = result.single()
     if record["deleted"] == 0:
         raise HTTPException(status_code=404, detail="Asset not found")
     return {"status": "deleted", "asset_id": asset_id}
@@ -223,14 +373,15 @@ def delete_technical_asset(
 
 
 @router.post("/{model_id}/boundaries")
-def add_trust_boundary(
+async def add_trust_boundary(
     model_id: str,
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Add a trust boundary to a threat model."""
     boundary_id = f"tb-{uuid4().hex[:12]}"
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})
         CREATE (tb:TrustBoundary {
@@ -240,6 +391,7 @@ def add_trust_boundary(
             description: $description
         })
         CREATE (m)-[:HAS_BOUNDARY]->(tb)
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         RETURN tb
         """,
         model_id=model_id,
@@ -248,29 +400,29 @@ def add_trust_boundary(
         type=body.get("type", "network"),
         description=body.get("description", ""),
     )
-    record = result.single()
     if not record:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
     return dict(record["tb"])
 
 
 @router.delete("/{model_id}/boundaries/{boundary_id}")
-def delete_trust_boundary(
+async def delete_trust_boundary(
     model_id: str,
     boundary_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Remove a trust boundary from a threat model."""
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_BOUNDARY]->(tb:TrustBoundary {boundary_id: $boundary_id})
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         DETACH DELETE tb
         RETURN count(tb) AS deleted
         """,
         model_id=model_id,
         boundary_id=boundary_id,
     )
-    record = result.single()
     if record["deleted"] == 0:
         raise HTTPException(status_code=404, detail="Boundary not found")
     return {"status": "deleted", "boundary_id": boundary_id}
@@ -280,14 +432,21 @@ def delete_trust_boundary(
 
 
 @router.post("/{model_id}/flows")
-def add_data_flow(
+async def add_data_flow(
     model_id: str,
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
-    """Add a data flow to a threat model."""
+    """Add a data flow to a threat model.
+
+    When ``source`` and ``target`` name technical assets of the model, the
+    flow is also materialised as a ``FLOWS_TO`` relationship between them,
+    which attack-path search traverses.
+    """
     flow_id = f"df-{uuid4().hex[:12]}"
-    result = session.run(
+    trust_boundary_id = body.get("trust_boundary_id")
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})
         CREATE (df:DataFlow {
@@ -296,9 +455,25 @@ def add_data_flow(
             source: $source,
             target: $target,
             protocol: $protocol,
-            description: $description
+            description: $description,
+            is_encrypted: $is_encrypted,
+            authentication_method: $authentication_method,
+            crosses_trust_boundary: $crosses_trust_boundary,
+            trust_boundary_id: $trust_boundary_id
         })
         CREATE (m)-[:HAS_FLOW]->(df)
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
+        WITH m, df
+        OPTIONAL MATCH (m)-[:HAS_ASSET]->(s:TechnicalAsset {asset_id: $source})
+        OPTIONAL MATCH (m)-[:HAS_ASSET]->(t:TechnicalAsset {asset_id: $target})
+        FOREACH (_ IN CASE WHEN s IS NULL OR t IS NULL THEN [] ELSE [1] END |
+            CREATE (s)-[:FLOWS_TO {
+                flow_id: $flow_id,
+                protocol: $protocol,
+                crosses_trust_boundary: $crosses_trust_boundary,
+                trust_boundary_id: $trust_boundary_id
+            }]->(t)
+        )
         RETURN df
         """,
         model_id=model_id,
@@ -308,30 +483,40 @@ def add_data_flow(
         target=body.get("target", ""),
         protocol=body.get("protocol", ""),
         description=body.get("description", ""),
+        is_encrypted=body.get("is_encrypted"),
+        authentication_method=body.get("authentication_method"),
+        crosses_trust_boundary=bool(body.get("crosses_trust_boundary") or trust_boundary_id),
+        trust_boundary_id=trust_boundary_id,
     )
-    record = result.single()
     if not record:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
     return dict(record["df"])
 
 
 @router.delete("/{model_id}/flows/{flow_id}")
-def delete_data_flow(
+async def delete_data_flow(
     model_id: str,
     flow_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
-    """Remove a data flow from a threat model."""
-    result = session.run(
+    """Remove a data flow, and its FLOWS_TO relationship, from a threat model."""
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_FLOW]->(df:DataFlow {flow_id: $flow_id})
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
+        WITH m, df
+        CALL {
+            WITH m
+            MATCH (m)-[:HAS_ASSET]->(:TechnicalAsset)-[f:FLOWS_TO {flow_id: $flow_id}]->()
+            DELETE f
+        }
         DETACH DELETE df
         RETURN count(df) AS deleted
         """,
         model_id=model_id,
         flow_id=flow_id,
     )
-    record = result.single()
     if record["deleted"] == 0:
         raise HTTPException(status_code=404, detail="Flow not found")
     return {"status": "deleted", "flow_id": flow_id}
@@ -341,54 +526,661 @@ def delete_data_flow(
 
 
 @router.post("/{model_id}/data-assets")
-def add_data_asset(
+async def add_data_asset(
     model_id: str,
     body: dict,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Add a data asset to a threat model."""
     data_asset_id = f"da-{uuid4().hex[:12]}"
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})
         CREATE (da:DataAsset {
             data_asset_id: $data_asset_id,
             name: $name,
+            type: $type,
             classification: $classification,
-            description: $description
+            description: $description,
+            stored_in: $stored_in,
+            processed_by: $processed_by
         })
         CREATE (m)-[:HAS_DATA_ASSET]->(da)
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         RETURN da
         """,
         model_id=model_id,
         data_asset_id=data_asset_id,
         name=body.get("name", ""),
+        type=body.get("type"),
         classification=body.get("classification", "internal"),
         description=body.get("description", ""),
+        stored_in=body.get("stored_in", []),
+        processed_by=body.get("processed_by", []),
     )
-    record = result.single()
     if not record:
         raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
     return dict(record["da"])
 
 
 @router.delete("/{model_id}/data-assets/{data_asset_id}")
-def delete_data_asset(
+async def delete_data_asset(
     model_id: str,
     data_asset_id: str,
-    session: Session = Depends(get_neo4j_session),
+    session: AsyncSession = Depends(get_async_write_session),
 ):
     """Remove a data asset from a threat model."""
-    result = session.run(
+    record = await session.execute_write(
+        fetch_single,
         """
         MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_DATA_ASSET]->(da:DataAsset {data_asset_id: $data_asset_id})
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
         DETACH DELETE da
         RETURN count(da) AS deleted
         """,
         model_id=model_id,
         data_asset_id=data_asset_id,
     )
-    record = result.single()
     if record["deleted"] == 0:
         raise HTTPException(status_code=404, detail="Data asset not found")
     return {"status": "deleted", "data_asset_id": data_asset_id}
+
+
+# --- Bulk ingest ---
+
+MAX_BULK_ELEMENTS = 5000
+
+# Document section → (schema, ID prefix, ID property, owning relationship)
+BULK_SECTIONS = {
+    "technical_assets": ("technical_asset", "ta", "asset_id", "HAS_ASSET"),
+    "trust_boundaries": ("trust_boundary", "tb", "boundary_id", "HAS_BOUNDARY"),
+    "data_flows": ("data_flow", "df", "flow_id", "HAS_FLOW"),
+    "data_assets": ("data_asset", "da", "data_asset_id", "HAS_DATA_ASSET"),
+}
+
+# Reference properties, per section, and the section they point into
+BULK_REFERENCES = {
+    "data_flows": {
+        "source_id": "technical_assets", "target_id": "technical_assets",
+        "trust_boundary_id": "trust_boundaries", "data_assets": "data_assets",
+    },
+    "data_assets": {
+        "stored_in": "technical_assets", "processed_by": "technical_assets",
+        "transmitted_in": "data_flows",
+    },
+}
+
+BULK_LABELS = {
+    "technical_assets": "TechnicalAsset",
+    "trust_boundaries": "TrustBoundary",
+    "data_flows": "DataFlow",
+    "data_assets": "DataAsset",
+}
+
+# Properties an element may store, per section; anything else in a document is dropped
+BULK_PROPERTIES = {
+    section: frozenset(get_schema_properties(schema)) - {"id"}
+    for section, (schema, _, _, _) in BULK_SECTIONS.items()
+}
+
+
+def _prepare_bulk(document: dict) -> tuple[dict, dict, dict]:
+    """Validate a model document and turn it into rows for the bulk write.
+
+    Elements are validated against ``src/schema``; their ``id``s are local
+    to the document and replaced by generated IDs, the same as the single
+    element endpoints create. References to IDs not in the document are
+    kept and must name existing elements of the model; properties outside
+    an element's schema are dropped. Returns ``(rows,
+    ids, external)``: the rows, the local → generated ID maps and the
+    external references, each per section. Raises a 422 listing every
+    problem found.
+    """
+    _check_sections(document)
+    errors = []
+    ids: dict[str, dict[str, str]] = {section: {} for section in BULK_SECTIONS}
+    for section, (schema, prefix, _, _) in BULK_SECTIONS.items():
+        elements = document.get(section) or []
+        if not isinstance(elements, list):
+            errors.append({"element": section, "errors": ["must be a list"]})
+            continue
+        seen = set()
+        for i, (element, messages) in enumerate(zip(elements, validate_many(elements, schema))):
+            local_id = element.get("id") if isinstance(element, dict) else None
+            if not isinstance(local_id, str):
+                local_id = None
+            elif local_id in seen:
+                messages = [*messages, f"Duplicate id '{local_id}'"]
+            seen.add(local_id)
+            if messages:
+                errors.append({"element": f"{section}[{i}]", "id": local_id, "errors": messages})
+            elif local_id is not None:
+                ids[section][local_id] = f"{prefix}-{uuid4().hex[:12]}"
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    external: dict[str, set[str]] = {section: set() for section in BULK_SECTIONS}
+
+    def resolve(target_section: str, ref: str) -> str:
+        if ref in ids[target_section]:
+            return ids[target_section][ref]
+        external[target_section].add(ref)
+        return ref
+
+    rows: dict[str, list[dict]] = {}
+    for section, (_, _, id_prop, _) in BULK_SECTIONS.items():
+        rows[section] = []
+        for element in document.get(section) or []:
+            row = {k: v for k, v in element.items() if k in BULK_PROPERTIES[section] and k != "metadata"}
+            row[id_prop] = ids[section][element["id"]]
+            if element.get("metadata") is not None:
+                # Neo4j properties cannot hold maps
+                row["metadata"] = json.dumps(element["metadata"], sort_keys=True)
+            for prop, target_section in BULK_REFERENCES.get(section, {}).items():
+                value = row.get(prop)
+                if isinstance(value, list):
+                    row[prop] = [resolve(target_section, ref) for ref in value]
+                elif value is not None:
+                    row[prop] = resolve(target_section, value)
+            if section == "data_flows":
+                # Same property names as add_data_flow
+                row["source"] = row.pop("source_id")
+                row["target"] = row.pop("target_id")
+                row["crosses_trust_boundary"] = bool(
+                    row.get("crosses_trust_boundary") or row.get("trust_boundary_id")
+                )
+            rows[section].append(row)
+
+    return rows, ids, external
+
+
+BULK_WRITE_QUERIES = {
+    section: f"""
+        MATCH (m:ThreatModel {{model_id: $model_id}})
+        UNWIND $rows AS row
+        CREATE (n:{BULK_LABELS[section]})
+        SET n = row
+        CREATE (m)-[:{rel}]->(n)
+    """
+    for section, (_, _, _, rel) in BULK_SECTIONS.items()
+}
+
+BULK_FLOWS_TO_QUERY = """
+MATCH (m:ThreatModel {model_id: $model_id})
+UNWIND $rows AS row
+MATCH (m)-[:HAS_ASSET]->(s:TechnicalAsset {asset_id: row.source})
+MATCH (m)-[:HAS_ASSET]->(t:TechnicalAsset {asset_id: row.target})
+CREATE (s)-[:FLOWS_TO {
+    flow_id: row.flow_id,
+    protocol: row.protocol,
+    crosses_trust_boundary: row.crosses_trust_boundary,
+    trust_boundary_id: row.trust_boundary_id
+}]->(t)
+"""
+
+
+async def _existing_elements(tx, model_id: str, ids: dict) -> Optional[dict[str, set[str]]]:
+    """Which of ``ids`` (ID lists per section) are elements of the model; None if it does not exist."""
+    result = await tx.run(
+        """
+        MATCH (m:ThreatModel {model_id: $model_id})
+        CALL { WITH m OPTIONAL MATCH (m)-[:HAS_ASSET]->(n:TechnicalAsset) WHERE n.asset_id IN $assets
+               RETURN collect(n.asset_id) AS technical_assets }
+        CALL { WITH m OPTIONAL MATCH (m)-[:HAS_BOUNDARY]->(n:TrustBoundary) WHERE n.boundary_id IN $boundaries
+               RETURN collect(n.boundary_id) AS trust_boundaries }
+        CALL { WITH m OPTIONAL MATCH (m)-[:HAS_FLOW]->(n:DataFlow) WHERE n.flow_id IN $flows
+               RETURN collect(n.flow_id) AS data_flows }
+        CALL { WITH m OPTIONAL MATCH (m)-[:HAS_DATA_ASSET]->(n:DataAsset) WHERE n.data_asset_id IN $data_assets
+               RETURN collect(n.data_asset_id) AS data_assets }
+        RETURN technical_assets, trust_boundaries, data_flows, data_assets
+        """,
+        model_id=model_id,
+        assets=sorted(ids.get("technical_assets", ())),
+        boundaries=sorted(ids.get("trust_boundaries", ())),
+        flows=sorted(ids.get("data_flows", ())),
+        data_assets=sorted(ids.get("data_assets", ())),
+    )
+    found = await result.single()
+    if found is None:
+        return None
+    return {section: set(found[section]) for section in BULK_SECTIONS}
+
+
+async def _bump_revision(tx, model_id: str) -> int:
+    result = await tx.run(
+        """
+        MATCH (m:ThreatModel {model_id: $model_id})
+        SET m.revision = coalesce(m.revision, 0) + 1, m.updated = datetime()
+        RETURN m.revision AS revision
+        """,
+        model_id=model_id,
+    )
+    return (await result.single())["revision"]
+
+
+async def _write_bulk(tx, model_id: str, rows: dict, external: dict) -> Optional[dict]:
+    """Check external references, then write every section with one UNWIND each.
+
+    Returns None if the model does not exist, ``{"missing": {...}}`` if
+    references do not resolve, else the model's new revision.
+    """
+    found = await _existing_elements(tx, model_id, external)
+    if found is None:
+        return None
+    missing = {
+        section: sorted(refs - found[section])
+        for section, refs in external.items() if refs - found[section]
+    }
+    if missing:
+        return {"missing": missing}
+
+    for section, query in BULK_WRITE_QUERIES.items():
+        if rows[section]:
+            await (await tx.run(query, model_id=model_id, rows=rows[section])).consume()
+    if rows["data_flows"]:
+        await (await tx.run(BULK_FLOWS_TO_QUERY, model_id=model_id, rows=rows["data_flows"])).consume()
+
+    return {"revision": await _bump_revision(tx, model_id)}
+
+
+@router.post("/{model_id}/bulk")
+async def bulk_ingest(
+    model_id: str,
+    body: dict,
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Add a whole model document to a threat model in one transaction.
+
+    The body holds ``technical_assets``, ``trust_boundaries``, ``data_flows``
+    and ``data_assets`` lists in the ``src/schema`` format. Elements refer
+    to each other by their ``id`` within the document (e.g. a flow's
+    ``source_id``) or by the ID of an element already in the model. Each
+    element type is written with one UNWIND statement, and flows between
+    assets are materialised as ``FLOWS_TO`` relationships. The response maps
+    each document ``id``, per section, to the ID it was stored under.
+    """
+    rows, ids, external = _prepare_bulk(body)
+    written = await session.execute_write(_write_bulk, model_id, rows, external)
+    if written is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+    if "missing" in written:
+        raise HTTPException(
+            status_code=422,
+            detail=[{"element": section, "errors": [f"Unknown id '{ref}'" for ref in refs]}
+                    for section, refs in written["missing"].items()],
+        )
+    return {
+        "model_id": model_id,
+        "revision": written["revision"],
+        "created": {section: len(section_rows) for section, section_rows in rows.items()},
+        "ids": ids,
+    }
+
+
+# --- Batch delete and patch ---
+
+BULK_DELETE_QUERIES = {
+    section: f"""
+        MATCH (m:ThreatModel {{model_id: $model_id}})-[:{rel}]->(n:{BULK_LABELS[section]})
+        WHERE n.{id_prop} IN $ids
+        DETACH DELETE n
+    """
+    for section, (_, _, id_prop, rel) in BULK_SECTIONS.items()
+}
+
+BULK_DELETE_FLOWS_TO_QUERY = """
+MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_ASSET]->(:TechnicalAsset)-[f:FLOWS_TO]->()
+WHERE f.flow_id IN $ids
+DELETE f
+"""
+
+BULK_PATCH_QUERIES = {
+    section: f"""
+        MATCH (m:ThreatModel {{model_id: $model_id}})
+        UNWIND $rows AS row
+        MATCH (m)-[:{rel}]->(n:{BULK_LABELS[section]} {{{id_prop}: row.id}})
+        SET n += row.changes
+    """
+    for section, (_, _, id_prop, rel) in BULK_SECTIONS.items()
+}
+
+# Re-create the FLOWS_TO relationships of patched flows from their new properties
+BULK_REBUILD_FLOWS_TO_QUERY = """
+MATCH (m:ThreatModel {model_id: $model_id})-[:HAS_FLOW]->(df:DataFlow)
+WHERE df.flow_id IN $ids
+SET df.crosses_trust_boundary = coalesce(df.crosses_trust_boundary, false) OR df.trust_boundary_id IS NOT NULL
+WITH m, df
+CALL {
+    WITH m, df
+    MATCH (m)-[:HAS_ASSET]->(:TechnicalAsset)-[f:FLOWS_TO {flow_id: df.flow_id}]->()
+    DELETE f
+}
+WITH m, df
+MATCH (m)-[:HAS_ASSET]->(s:TechnicalAsset {asset_id: df.source})
+MATCH (m)-[:HAS_ASSET]->(t:TechnicalAsset {asset_id: df.target})
+CREATE (s)-[:FLOWS_TO {
+    flow_id: df.flow_id,
+    protocol: df.protocol,
+    crosses_trust_boundary: df.crosses_trust_boundary,
+    trust_boundary_id: df.trust_boundary_id
+}]->(t)
+"""
+
+# Document property → stored property, where they differ (see add_data_flow)
+STORED_NAMES = {"data_flows": {"source_id": "source", "target_id": "target"}}
+
+
+def _check_sections(body: dict) -> None:
+    unknown = sorted(set(body) - set(BULK_SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown sections: {', '.join(unknown)}")
+    total = sum(len(items) for items in body.values() if isinstance(items, list))
+    if total > MAX_BULK_ELEMENTS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BULK_ELEMENTS} elements per request")
+
+
+def _prepare_delete(body: dict) -> dict[str, list[str]]:
+    """Element IDs to delete per section, from ``{section: [id, ...]}``."""
+    _check_sections(body)
+    ids = {}
+    for section, items in body.items():
+        if not isinstance(items, list) or not all(isinstance(i, str) for i in items):
+            raise HTTPException(status_code=422, detail=f"{section} must be a list of element IDs")
+        ids[section] = sorted(set(items))
+    return ids
+
+
+def _prepare_patch(body: dict) -> tuple[dict, dict]:
+    """Validate ``{section: [{"id": ..., <changes>}, ...]}`` into patch rows.
+
+    Changes are checked with ``validate_partial``; a property set to null is
+    removed. Returns ``(rows, references)`` per section, where references
+    are the element IDs the changes point at. Raises a 422 listing every
+    problem found.
+    """
+    _check_sections(body)
+    errors = []
+    rows: dict[str, list[dict]] = {}
+    references: dict[str, set[str]] = {section: set() for section in BULK_SECTIONS}
+    for section, items in body.items():
+        schema = BULK_SECTIONS[section][0]
+        if not isinstance(items, list):
+            errors.append({"element": section, "errors": ["must be a list"]})
+            continue
+        rows[section] = []
+        seen = set()
+        for i, item in enumerate(items):
+            if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+                errors.append({"element": f"{section}[{i}]", "errors": ["must be an object with a string id"]})
+                continue
+            changes = {k: v for k, v in item.items() if k != "id"}
+            messages = validate_partial(changes, schema)
+            if item["id"] in seen:
+                messages.append(f"Duplicate id '{item['id']}'")
+            seen.add(item["id"])
+            if messages:
+                errors.append({"element": f"{section}[{i}]", "id": item["id"], "errors": messages})
+                continue
+
+            for prop, target_section in BULK_REFERENCES.get(section, {}).items():
+                value = changes.get(prop)
+                references[target_section].update(value if isinstance(value, list) else [value] if value else [])
+            if changes.get("metadata") is not None:
+                changes["metadata"] = json.dumps(changes["metadata"], sort_keys=True)
+            if section == "data_flows" and "trust_boundary_id" in changes:
+                # The stored flag ORs in the old boundary; recompute it from the patch
+                # so clearing the boundary also clears the crossing
+                changes["crosses_trust_boundary"] = bool(
+                    changes.get("crosses_trust_boundary") or changes["trust_boundary_id"]
+                )
+            names = STORED_NAMES.get(section, {})
+            rows[section].append({"id": item["id"], "changes": {names.get(k, k): v for k, v in changes.items()}})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return rows, references
+
+
+async def _delete_elements(tx, model_id: str, ids: dict) -> Optional[dict]:
+    found = await _existing_elements(tx, model_id, ids)
+    if found is None:
+        return None
+    deleted = {section: [i for i in section_ids if i in found[section]] for section, section_ids in ids.items()}
+    if deleted.get("data_flows"):
+        await (await tx.run(BULK_DELETE_FLOWS_TO_QUERY, model_id=model_id, ids=deleted["data_flows"])).consume()
+    for section, section_ids in deleted.items():
+        if section_ids:
+            await (await tx.run(BULK_DELETE_QUERIES[section], model_id=model_id, ids=section_ids)).consume()
+    revision = await _bump_revision(tx, model_id) if any(deleted.values()) else None
+    return {"deleted": deleted, "revision": revision}
+
+
+async def _patch_elements(tx, model_id: str, rows: dict, references: dict) -> Optional[dict]:
+    targets = {section: [row["id"] for row in section_rows] for section, section_rows in rows.items()}
+    wanted = {section: set(targets.get(section, ())) | references[section] for section in BULK_SECTIONS}
+    found = await _existing_elements(tx, model_id, wanted)
+    if found is None:
+        return None
+    missing = {
+        section: sorted(ids - found[section])
+        for section, ids in wanted.items() if ids - found[section]
+    }
+    if missing:
+        return {"missing": missing}
+
+    for section, section_rows in rows.items():
+        if section_rows:
+            await (await tx.run(BULK_PATCH_QUERIES[section], model_id=model_id, rows=section_rows)).consume()
+    if targets.get("data_flows"):
+        await (await tx.run(BULK_REBUILD_FLOWS_TO_QUERY, model_id=model_id, ids=targets["data_flows"])).consume()
+    return {"updated": targets, "revision": await _bump_revision(tx, model_id)}
+
+
+@router.post("/{model_id}/bulk/delete")
+async def bulk_delete(
+    model_id: str,
+    body: dict,
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Delete many elements of a threat model in one transaction.
+
+    The body lists element IDs per section, e.g. ``{"technical_assets":
+    ["ta-..."], "data_flows": ["df-..."]}``. Deleting a flow also removes
+    its ``FLOWS_TO`` relationship. IDs that are not elements of the model
+    are reported under ``not_found`` and otherwise ignored, so a retried
+    request is harmless.
+    """
+    ids = _prepare_delete(body)
+    result = await session.execute_write(_delete_elements, model_id, ids)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+    return {
+        "model_id": model_id,
+        "revision": result["revision"],
+        "deleted": result["deleted"],
+        "not_found": {
+            section: [i for i in section_ids if i not in result["deleted"][section]]
+            for section, section_ids in ids.items()
+        },
+    }
+
+
+@router.patch("/{model_id}/bulk")
+async def bulk_patch(
+    model_id: str,
+    body: dict,
+    session: AsyncSession = Depends(get_async_write_session),
+):
+    """Update many elements of a threat model in place, in one transaction.
+
+    The body lists changes per section, e.g. ``{"technical_assets": [{"id":
+    "ta-...", "criticality": "high", "owner": null}]}``: properties given
+    are set, properties set to null are removed and element IDs never
+    change. Changed flows have their ``FLOWS_TO`` relationship re-created.
+    The request is rejected as a whole if any element or referenced ID is
+    not part of the model.
+    """
+    rows, references = _prepare_patch(body)
+    result = await session.execute_write(_patch_elements, model_id, rows, references)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+    if "missing" in result:
+        raise HTTPException(
+            status_code=422,
+            detail=[{"element": section, "errors": [f"Unknown id '{ref}'" for ref in refs]}
+                    for section, refs in result["missing"].items()],
+        )
+    return {"model_id": model_id, "revision": result["revision"], "updated": result["updated"]}
+
+
+# --- Threat enumeration ---
+
+
+async def _read_threat_inputs(tx, model_id: str) -> Optional[dict]:
+    """Load a model's elements and the knowledge behind its candidate CWEs.
+
+    Two queries in one read transaction, however many elements the model has.
+    """
+    result = await tx.run(MODEL_LOAD_QUERY, model_id=model_id)
+    model = await result.single()
+    if model is None:
+        return None
+
+    elements = {key: model[key] for key in ("technical_assets", "data_flows", "trust_boundaries", "data_assets")}
+    threats = match_threats(**elements)
+    cwe_ids = sorted({t["cwe_id"] for t in threats})
+
+    result = await tx.run(
+        """
+        UNWIND $ids AS id
+        MATCH (w:CWE {cwe_id: id})
+        CALL {
+            WITH w
+            MATCH (t:Technique) WHERE t.attack_id IN coalesce(w.mapped_techniques, [])
+            WITH t ORDER BY t.attack_id
+            RETURN collect(t {.attack_id, .name}) AS techniques
+        }
+        RETURN w.cwe_id AS cwe_id, w.name AS name,
+               coalesce(w.mapped_capec, []) AS capec, techniques
+        """,
+        ids=cwe_ids,
+    )
+    knowledge = {record["cwe_id"]: dict(record) async for record in result}
+    return {"elements": elements, "threats": attach_knowledge(threats, knowledge)}
+
+
+@router.get("/{model_id}/threats")
+async def enumerate_threats(
+    model_id: str,
+    min_priority: int = Query(1, ge=1, le=4, description="Drop threats below this priority (1 low – 4 critical)"),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """Enumerate candidate threats for every element of a threat model.
+
+    Asset types and technology stacks, data-flow protocols, authentication,
+    encryption and trust-boundary crossings, and data-asset classifications
+    are matched against the rule tables in ``src.threat_engine``. Each
+    matched CWE comes with the CAPEC patterns and ATT&CK techniques from
+    the CAPEC import's mapping index. The whole model is analysed in two
+    queries.
+    """
+    inputs = await session.execute_read(_read_threat_inputs, model_id)
+    if inputs is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+    elements = inputs["elements"]
+    threats = [t for t in inputs["threats"] if t["priority"] >= min_priority]
+    by_cwe: dict = {}
+    for threat in threats:
+        by_cwe[threat["cwe_id"]] = by_cwe.get(threat["cwe_id"], 0) + 1
+    return {
+        "model_id": model_id,
+        "threats": threats,
+        "count": len(threats),
+        "elements_analysed": (
+            len(elements["technical_assets"]) + len(elements["data_flows"]) + len(elements["data_assets"])
+        ),
+        "by_cwe": by_cwe,
+    }
+
+
+# --- Attack paths ---
+
+
+async def _read_attack_graph(tx, model_id: str) -> Optional[dict]:
+    """A model's revision, assets, FLOWS_TO edges, boundaries and data assets, in one query."""
+    result = await tx.run(
+        """
+        MATCH (m:ThreatModel {model_id: $model_id})
+        CALL { WITH m MATCH (m)-[:HAS_ASSET]->(n:TechnicalAsset)
+               RETURN collect(properties(n)) AS assets }
+        CALL { WITH m
+               MATCH (m)-[:HAS_ASSET]->(s:TechnicalAsset)-[f:FLOWS_TO]->(t:TechnicalAsset)<-[:HAS_ASSET]-(m)
+               RETURN collect({flow_id: f.flow_id, source: s.asset_id, target: t.asset_id,
+                               crosses_trust_boundary: f.crosses_trust_boundary,
+                               trust_boundary_id: f.trust_boundary_id}) AS flows }
+        CALL { WITH m MATCH (m)-[:HAS_BOUNDARY]->(n:TrustBoundary)
+               RETURN collect(properties(n)) AS boundaries }
+        CALL { WITH m MATCH (m)-[:HAS_DATA_ASSET]->(n:DataAsset)
+               RETURN collect(properties(n)) AS data_assets }
+        RETURN coalesce(m.revision, 0) AS revision, assets, flows, boundaries, data_assets
+        """,
+        model_id=model_id,
+    )
+    record = await result.single()
+    return dict(record) if record is not None else None
+
+
+@router.get("/{model_id}/attack-paths")
+async def attack_paths(
+    model_id: str,
+    entry: Optional[list[str]] = Query(None, description="Entry asset IDs (default: internet-facing assets)"),
+    target: Optional[list[str]] = Query(None, description="Target asset IDs (default: critical or sensitive-data assets)"),
+    k: int = Query(5, ge=1, le=50, description="Number of paths to return"),
+    max_hops: int = Query(6, ge=1, le=12),
+    boundary_weight: float = Query(2.0, ge=0, description="Cost added per trust boundary crossed"),
+    criticality_weight: float = Query(1.0, ge=0, description="Cost added per criticality level below critical"),
+    session: AsyncSession = Depends(get_async_read_session),
+):
+    """The ``k`` cheapest attack paths through a threat model's data flows.
+
+    Paths follow the model's ``FLOWS_TO`` relationships from entry points to
+    targets; see ``src.attack_paths`` for the cost model. Results are cached
+    per model revision, so repeated requests cost one small lookup query
+    until the model is edited.
+    """
+    revision = await session.execute_read(
+        fetch_single,
+        "MATCH (m:ThreatModel {model_id: $model_id}) RETURN coalesce(m.revision, 0) AS revision",
+        model_id=model_id,
+    )
+    if revision is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+    params = (
+        tuple(sorted(entry)) if entry else None, tuple(sorted(target)) if target else None,
+        k, max_hops, boundary_weight, criticality_weight,
+    )
+    cached = attack_path_cache.get((model_id, revision["revision"], params))
+    if cached is not None:
+        return cached
+
+    graph = await session.execute_read(_read_attack_graph, model_id)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+    entries = sorted(set(entry)) if entry else default_entries(graph["assets"], graph["flows"], graph["boundaries"])
+    targets = sorted(set(target)) if target else default_targets(graph["assets"], graph["data_assets"])
+    found = await run_in_threadpool(
+        find_attack_paths, graph["assets"], graph["flows"], entries, targets,
+        k=k, max_hops=max_hops, boundary_weight=boundary_weight, criticality_weight=criticality_weight,
+    )
+    response = {
+        "model_id": model_id,
+        "revision": graph["revision"],
+        "entries": entries,
+        "targets": targets,
+        **found,
+    }
+    attack_path_cache.set((model_id, graph["revision"], params), response)
+    return response
@@ -0,0 +1,24 @@
+"""Transaction functions for the API's managed Neo4j transactions.
+
+Routes pass these to ``session.execute_read`` / ``session.execute_write``,
+which retry them on transient errors (leader switch, deadlock). Results are
+fully consumed inside the transaction, because a managed transaction's
+result cannot be read after it commits.
+"""
+from typing import List, Optional
+
+from neo4j import AsyncManagedTransaction, Record
+
+
+async def fetch_all(tx: AsyncManagedTransaction, cypher: str,
+                    parameters: Optional[dict] = None, **params) -> List[Record]:
+    """Run ``cypher`` and return every record."""
+    result = await tx.run(cypher, parameters, **params)
+    return [record async for record in result]
+
+
+async def fetch_single(tx: AsyncManagedTransaction, cypher: str,
+                       parameters: Optional[dict] = None, **params) -> Optional[Record]:
+    """Run ``cypher`` and return its only record, or None."""
+    result = await tx.run(cypher, parameters, **params)
+    return await result.single()
@@ -0,0 +1,171 @@
+"""Benchmark: CWE relationship writes — per-nature loop vs. grouped batched writer.
+
+Compares the original phase-2 writer (a 1-row-transaction ChildOf query plus
+one query per nature for every 500-edge batch) with
+``importers.cwe_importer.write_cwe_relationships``.
+
+Without a database the benchmark replays both writers against a recording
+session and models wall-clock time as
+``round_trips * rtt + transactions * commit`` (defaults approximate AuraDB
+from a different region). With ``--neo4j`` both writers run against the
+database from NEO4J_URI / NEO4J_PASSWORD (CWE nodes must already exist).
+
+Usage:
+    python -m benchmarks.bench_cwe_relationships [--rtt-ms 30] [--commit-ms 2]
+    python -m benchmarks.bench_cwe_relationships --neo4j
+"""
+import argparse
+import os
+import random
+import time
+
+from importers.cwe_importer import NATURE_MAP, REL_BATCH_SIZE, iter_cwe_xml, write_cwe_relationships
+from importers.writer import ParallelBatchWriter
+
+
+CWE_XML_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "cwec_v4.19.1.xml")
+
+
+def load_edges() -> list[dict]:
+    """Real CWE edges if the catalog is downloaded, else a synthetic set of similar shape."""
+    if os.path.exists(CWE_XML_PATH):
+        return [
+            {"source": f"CWE-{w.cwe_id}", "target": f"CWE-{t}", "nature": n}
+            for w in iter_cwe_xml(CWE_XML_PATH)
+            for n, t in w.related
+        ]
+
+    rng = random.Random(42)
+    natures = list(NATURE_MAP)
+    weights = [80, 6, 5, 4, 1, 2, 2]  # ChildOf dominates the real catalog
+    return [
+        {
+            "source": f"CWE-{rng.randint(1, 1400)}",
+            "target": f"CWE-{rng.randint(1, 1400)}",
+            "nature": rng.choices(natures, weights)[0],
+        }
+        for _ in range(1800)
+    ]
+
+
+def legacy_write(session, edges: list[dict], batch_size: int = 500):
+    """The phase-2 writer as it was before grouping by relationship type."""
+    for i in range(0, len(edges), batch_size):
+        batch = edges[i:i + batch_size]
+        session.run(
+            """
+            UNWIND $edges AS e
+            MATCH (s:CWE {cwe_id: e.source})
+            MATCH (t:CWE {cwe_id: e.target})
+            CALL {
+                WITH s, t, e
+                WITH s, t, e
+                WHERE e.nature = 'ChildOf'
+                MERGE (s)-[:CHILD_OF]->(t)
+            } IN TRANSACTIONS OF 1 ROWS
+            """,
+            edges=[e for e in batch if e["nature"] == "ChildOf"],
+        )
+        for nature, rel_type in NATURE_MAP.items():
+            if nature == "ChildOf":
+                continue
+            typed_edges = [e for e in batch if e["nature"] == nature]
+            if typed_edges:
+                session.run(
+                    f"""
+                    UNWIND $edges AS e
+                    MATCH (s:CWE {{cwe_id: e.source}})
+                    MATCH (t:CWE {{cwe_id: e.target}})
+                    MERGE (s)-[:{rel_type}]->(t)
+                    """,
+                    edges=typed_edges,
+                )
+
+
+class RecordingSession:
+    """Counts round-trips and server-side transactions instead of talking to Neo4j."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.transactions = 0
+
+    def run(self, query, **params):
+        self.round_trips += 1
+        rows = len(params.get("edges", []))
+        if "IN TRANSACTIONS OF 1 ROWS" in query:
+            self.transactions += max(rows, 1)
+        else:
+            self.transactions += 1
+        return self
+
+    def consume(self):
+        pass
+
+    def execute_write(self, fn, *args):
+        return fn(self, *args)
+
+    def session(self):
+        """Stand in for the driver too, so ParallelBatchWriter records here."""
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def legacy_session_write(driver, edges):
+    with driver.session() as session:
+        legacy_write(session, edges)
+
+
+def grouped_write(driver, edges, rel_batch_size: int):
+    with ParallelBatchWriter(driver, concurrency=1) as writer:
+        write_cwe_relationships(writer, edges, rel_batch_size)
+
+
+def simulate(edges, rtt_ms: float, commit_ms: float, rel_batch_size: int):
+    for name, writer in (
+        ("legacy per-nature loop", lambda s: legacy_write(s, edges)),
+        ("grouped batched writer", lambda s: grouped_write(s, edges, rel_batch_size)),
+    ):
+        session = RecordingSession()
+        writer(session)
+        modeled = session.round_trips * rtt_ms + session.transactions * commit_ms
+        print(f"{name:<26} round-trips={session.round_trips:>4}  "
+              f"transactions={session.transactions:>5}  modeled={modeled / 1000:6.2f}s")
+
+
+def against_neo4j(edges, rel_batch_size: int):
+    from src.db import get_driver
+
+    driver = get_driver()
+    for name, writer in (
+        ("legacy per-nature loop", lambda d: legacy_session_write(d, edges)),
+        ("grouped batched writer", lambda d: grouped_write(d, edges, rel_batch_size)),
+    ):
+        start = time.perf_counter()
+        writer(driver)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26} wall-clock={elapsed:6.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=30.0, help="Modeled client↔server round-trip")
+    parser.add_argument("--commit-ms", type=float, default=2.0, help="Modeled server cost per transaction")
+    parser.add_argument("--rel-batch-size", type=int, default=REL_BATCH_SIZE)
+    parser.add_argument("--neo4j", action="store_true", help="Run against a live database")
+    args = parser.parse_args()
+
+    edges = load_edges()
+    print(f"{len(edges)} CWE edges, rel_batch_size={args.rel_batch_size}")
+    if args.neo4j:
+        against_neo4j(edges, args.rel_batch_size)
+    else:
+        simulate(edges, args.rtt_ms, args.commit_ms, args.rel_batch_size)
+
+
+if __name__ == "__main__":
+    main()
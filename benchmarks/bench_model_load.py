@@ -0,0 +1,124 @@
+"""Benchmark: threat model load — chained OPTIONAL MATCH vs. one subquery per element type.
+
+The original ``get_model`` query chained four ``OPTIONAL MATCH`` clauses,
+so before ``collect(DISTINCT ...)`` it built |TA|×|TB|×|DF|×|DA| rows.
+``api.routes.models.MODEL_LOAD_QUERY`` collects each element type in its
+own ``CALL`` subquery and reads |TA|+|TB|+|DF|+|DA| rows.
+
+Without a database the benchmark prints the intermediate row count of both
+queries for synthetic models of increasing size. With ``--neo4j`` it writes
+each synthetic model to the database from NEO4J_URI / NEO4J_PASSWORD, times
+both queries (the legacy one only while its row count stays below
+``--legacy-max-rows``) and deletes the model again.
+
+Usage:
+    python -m benchmarks.bench_model_load [--sizes 10 30 100 300 1000]
+    python -m benchmarks.bench_model_load --neo4j [--repeat 5]
+"""
+import argparse
+import time
+
+from api.routes.models import MODEL_LOAD_QUERY
+
+
+LEGACY_MODEL_LOAD_QUERY = """
+MATCH (m:ThreatModel {model_id: $model_id})
+OPTIONAL MATCH (m)-[:HAS_ASSET]->(ta:TechnicalAsset)
+OPTIONAL MATCH (m)-[:HAS_BOUNDARY]->(tb:TrustBoundary)
+OPTIONAL MATCH (m)-[:HAS_FLOW]->(df:DataFlow)
+OPTIONAL MATCH (m)-[:HAS_DATA_ASSET]->(da:DataAsset)
+RETURN m,
+       collect(DISTINCT properties(ta)) AS technical_assets,
+       collect(DISTINCT properties(tb)) AS trust_boundaries,
+       collect(DISTINCT properties(df)) AS data_flows,
+       collect(DISTINCT properties(da)) AS data_assets
+"""
+
+# (label, ID property, relationship) per element type
+ELEMENTS = (
+    ("TechnicalAsset", "asset_id", "HAS_ASSET"),
+    ("TrustBoundary", "boundary_id", "HAS_BOUNDARY"),
+    ("DataFlow", "flow_id", "HAS_FLOW"),
+    ("DataAsset", "data_asset_id", "HAS_DATA_ASSET"),
+)
+
+
+def row_counts(size: int) -> tuple[int, int]:
+    """Intermediate rows of the legacy and the subquery load for ``size`` elements of each type."""
+    return size ** len(ELEMENTS), size * len(ELEMENTS)
+
+
+def simulate(sizes: list[int]):
+    for size in sizes:
+        legacy, subqueries = row_counts(size)
+        print(f"{size:>5} of each  legacy rows={legacy:>16,}  subquery rows={subqueries:>6,}")
+
+
+def write_model(session, model_id: str, size: int):
+    session.run("CREATE (:ThreatModel {model_id: $model_id, name: 'benchmark'})", model_id=model_id).consume()
+    for label, id_prop, rel in ELEMENTS:
+        session.run(
+            f"""
+            MATCH (m:ThreatModel {{model_id: $model_id}})
+            UNWIND range(1, $size) AS i
+            CREATE (m)-[:{rel}]->(:{label} {{{id_prop}: $model_id + '-{label}-' + i, name: '{label} ' + i}})
+            """,
+            model_id=model_id, size=size,
+        ).consume()
+
+
+def delete_model(session, model_id: str):
+    session.run(
+        """
+        MATCH (m:ThreatModel {model_id: $model_id})
+        OPTIONAL MATCH (m)-->(child)
+        DETACH DELETE child, m
+        """,
+        model_id=model_id,
+    ).consume()
+
+
+def time_query(session, query: str, model_id: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        session.run(query, model_id=model_id).single()
+    return (time.perf_counter() - start) / repeat
+
+
+def against_neo4j(sizes: list[int], repeat: int, legacy_max_rows: int):
+    from src.db import get_driver
+
+    driver = get_driver()
+    with driver.session() as session:
+        for size in sizes:
+            model_id = f"model-bench-{size}"
+            write_model(session, model_id, size)
+            try:
+                subqueries = time_query(session, MODEL_LOAD_QUERY, model_id, repeat)
+                legacy_rows, _ = row_counts(size)
+                if legacy_rows <= legacy_max_rows:
+                    legacy = f"{time_query(session, LEGACY_MODEL_LOAD_QUERY, model_id, repeat) * 1000:9.1f} ms"
+                else:
+                    legacy = "  skipped"
+                print(f"{size:>5} of each  legacy={legacy}  subqueries={subqueries * 1000:8.1f} ms")
+            finally:
+                delete_model(session, model_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max-rows", type=int, default=10_000_000,
+                        help="Skip the legacy query above this many intermediate rows")
+    parser.add_argument("--neo4j", action="store_true", help="Run against a live database")
+    args = parser.parse_args()
+
+    if args.neo4j:
+        against_neo4j(args.sizes, args.repeat, args.legacy_max_rows)
+    else:
+        simulate(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
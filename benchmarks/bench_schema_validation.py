@@ -0,0 +1,84 @@
+"""Benchmark: per-object cost of JSON Schema validation — jsonschema.validate vs. cached validators.
+
+``src.schema.validator.validate`` used to call ``jsonschema.validate`` for
+every object, which checks the schema itself and builds a new validator
+each time. It now compiles each schema once (``get_validator``) and
+``validate_many`` reuses that validator for a whole batch.
+
+Validates synthetic technical assets (every tenth one invalid) and data
+flows with both approaches and prints microseconds per object.
+
+Usage:
+    python -m benchmarks.bench_schema_validation [--objects 5000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+
+import jsonschema
+
+from src.schema import validator
+
+
+def synthetic_objects(count: int, seed: int = 42) -> dict[str, list[dict]]:
+    rng = random.Random(seed)
+    assets = [
+        {
+            "id": f"ta-{i}",
+            "name": f"asset {i}",
+            "type": "mainframe" if i % 10 == 0 else rng.choice(("server", "database", "api", "container")),
+            "criticality": rng.choice(("low", "medium", "high", "critical")),
+            "technology_stack": rng.choice((["Java"], ["PostgreSQL 15"], ["React", "Node.js"])),
+            "tags": ["synthetic"],
+        }
+        for i in range(count)
+    ]
+    flows = [
+        {
+            "id": f"df-{i}",
+            "source_id": f"ta-{i}",
+            "target_id": f"ta-{i + 1}",
+            "protocol": rng.choice(("http", "https", "sql", "tcp")),
+            "port": rng.randint(1, 65535),
+            "is_encrypted": rng.random() < 0.5,
+        }
+        for i in range(count)
+    ]
+    return {"technical_asset": assets, "data_flow": flows}
+
+
+def legacy_validate(objs: list[dict], schema_name: str) -> list[list[str]]:
+    """``validate`` as it was: ``jsonschema.validate`` per object, first error only."""
+    schema = validator.load_schema(schema_name)
+    results = []
+    for obj in objs:
+        try:
+            jsonschema.validate(instance=obj, schema=schema)
+            results.append([])
+        except jsonschema.ValidationError as e:
+            results.append([e.message])
+    return results
+
+
+def per_object_us(fn, objs: list[dict], schema_name: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(objs, schema_name)
+    return (time.perf_counter() - start) / repeat / len(objs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for schema_name, objs in synthetic_objects(args.objects).items():
+        before = per_object_us(legacy_validate, objs, schema_name, args.repeat)
+        after = per_object_us(validator.validate_many, objs, schema_name, args.repeat)
+        print(f"{schema_name:<16} {len(objs)} objects  jsonschema.validate={before:7.1f} µs/object  "
+              f"validate_many={after:6.1f} µs/object  ({before / after:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: rule matching time of the threat enumeration engine vs. model size.
+
+Builds synthetic models (assets with mixed types and technology stacks,
+a chain of flows, every fourth crossing a public trust boundary, and one
+data asset per ten assets) and times ``src.threat_engine.match_threats``.
+Database time is excluded: the API adds two queries per model regardless
+of its size.
+
+Usage:
+    python -m benchmarks.bench_threat_enumeration [--sizes 100 300 1000] [--repeat 20]
+"""
+import argparse
+import random
+import time
+
+from src.threat_engine import match_threats
+
+
+ASSET_TYPES = ("server", "application", "database", "container", "api", "service", "network_device")
+STACKS = (
+    ["Java", "Spring Boot"], ["React", "Node.js"], ["PostgreSQL 15"], ["Python", "Flask"],
+    ["Docker", "nginx"], ["PHP", "MySQL"], ["Go"], ["Kubernetes"],
+)
+
+
+def synthetic_model(assets: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    technical_assets = [
+        {
+            "asset_id": f"ta-{i}",
+            "name": f"asset {i}",
+            "type": rng.choice(ASSET_TYPES),
+            "technology_stack": rng.choice(STACKS),
+            "criticality": rng.choice(("low", "medium", "high", "critical")),
+        }
+        for i in range(assets)
+    ]
+    data_flows = [
+        {
+            "flow_id": f"df-{i}",
+            "source": f"ta-{i}",
+            "target": f"ta-{i + 1}",
+            "protocol": rng.choice(("http", "https", "sql", "tcp")),
+            "authentication_method": rng.choice(("none", "token", "basic")),
+            "trust_boundary_id": "tb-inet" if i % 4 == 0 else None,
+        }
+        for i in range(assets - 1)
+    ]
+    return {
+        "technical_assets": technical_assets,
+        "data_flows": data_flows,
+        "trust_boundaries": [{"boundary_id": "tb-inet", "security_level": "public"}],
+        "data_assets": [
+            {"data_asset_id": f"da-{i}", "type": "pii", "classification": "confidential"}
+            for i in range(assets // 10)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        model = synthetic_model(size)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            threats = match_threats(**model)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"{size:>5} assets  {len(threats):>6} threats  {elapsed * 1000:8.2f} ms/model")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,17 @@
 """MITRE ATT&CK STIX 2.1 importer — parses enterprise-attack.json into Neo4j."""
-import json
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
+
+from importers.delta import (
+    DeltaSet,
+    clear_outgoing_edges,
+    file_sha256,
+    fingerprint,
+    run_delta_import,
+    set_edge_fingerprints,
+)
+from importers.streaming import ProgressCallback, batched, iter_json_array, prefetch
+from importers.writer import ParallelBatchWriter
 
 
 @dataclass
@@ -25,162 +35,295 @@ class ATTACKRelationship:
     rel_type: str  # uses, mitigates, subtechnique-of, etc.
 
 
+# Map STIX types to our labels
+TYPE_MAP = {
+    "attack-pattern": "Technique",
+    "x-mitre-tactic": "Tactic",
+    "course-of-action": "Mitigation",
+    "intrusion-set": "Group",
+    "malware": "Software",
+    "tool": "Software",
+    "campaign": "Campaign",
+    "x-mitre-data-source": "DataSource",
+    "x-mitre-data-component": "DataComponent",
+}
+
+NODE_TYPES = ("Technique", "Tactic", "Mitigation", "Group", "Software", "Campaign", "DataSource", "DataComponent")
+
+# Map rel_type to Neo4j relationship type
+REL_MAP = {
+    "uses": "USES",
+    "mitigates": "MITIGATES",
+    "subtechnique-of": "SUBTECHNIQUE_OF",
+    "detects": "DETECTS",
+    "attributed-to": "ATTRIBUTED_TO",
+    "targets": "TARGETS",
+    "revoked-by": "REVOKED_BY",
+}
+
+
+def _parse_stix_object(obj: dict) -> Optional[Union[ATTACKObject, ATTACKRelationship]]:
+    """Convert one STIX object into an ATTACKObject / ATTACKRelationship, or None to skip it."""
+    stix_type = obj.get("type", "")
+
+    if stix_type == "relationship":
+        rel_type = obj.get("relationship_type", "")
+        source = obj.get("source_ref", "")
+        target = obj.get("target_ref", "")
+        if source and target and rel_type:
+            return ATTACKRelationship(
+                source_ref=source,
+                target_ref=target,
+                rel_type=rel_type,
+            )
+        return None
+
+    if stix_type not in TYPE_MAP:
+        return None
+
+    # Extract ATT&CK ID from external_references
+    attack_id = ""
+    for ref in obj.get("external_references", []):
+        if ref.get("source_name") == "mitre-attack":
+            attack_id = ref.get("external_id", "")
+            break
+
+    if not attack_id:
+        return None
+
+    # Extract tactics from kill_chain_phases
+    tactics = []
+    for phase in obj.get("kill_chain_phases", []):
+        if phase.get("kill_chain_name") == "mitre-attack":
+            tactics.append(phase["phase_name"])
+
+    return ATTACKObject(
+        stix_id=obj["id"],
+        attack_id=attack_id,
+        name=obj.get("name", ""),
+        obj_type=TYPE_MAP[stix_type],
+        description=obj.get("description", "")[:2000],
+        tactics=tactics,
+        deprecated=obj.get("x_mitre_deprecated", False),
+        revoked=obj.get("revoked", False),
+    )
+
+
+def iter_attack_stix(json_path: str) -> Iterator[Union[ATTACKObject, ATTACKRelationship]]:
+    """Stream ATTACKObject / ATTACKRelationship records from a STIX bundle.
+
+    Walks the bundle's ``objects`` array incrementally, decoding one STIX
+    object at a time, so the bundle is never loaded into memory as a whole.
+    """
+    for obj in iter_json_array(json_path, "objects"):
+        item = _parse_stix_object(obj)
+        if item is not None:
+            yield item
+
+
 def parse_attack_stix(json_path: str) -> tuple[list[ATTACKObject], list[ATTACKRelationship]]:
     """Parse ATT&CK STIX bundle into objects and relationships."""
-    with open(json_path) as f:
-        bundle = json.load(f)
-
     objects = []
     relationships = []
+    for item in iter_attack_stix(json_path):
+        if isinstance(item, ATTACKRelationship):
+            relationships.append(item)
+        else:
+            objects.append(item)
+    return objects, relationships
 
-    # Map STIX types to our labels
-    type_map = {
-        "attack-pattern": "Technique",
-        "x-mitre-tactic": "Tactic",
-        "course-of-action": "Mitigation",
-        "intrusion-set": "Group",
-        "malware": "Software",
-        "tool": "Software",
-        "campaign": "Campaign",
-        "x-mitre-data-source": "DataSource",
-        "x-mitre-data-component": "DataComponent",
-    }
-
-    for obj in bundle.get("objects", []):
-        stix_type = obj.get("type", "")
-
-        if stix_type == "relationship":
-            rel_type = obj.get("relationship_type", "")
-            source = obj.get("source_ref", "")
-            target = obj.get("target_ref", "")
-            if source and target and rel_type:
-                relationships.append(ATTACKRelationship(
-                    source_ref=source,
-                    target_ref=target,
-                    rel_type=rel_type,
-                ))
-            continue
 
-        if stix_type not in type_map:
-            continue
+def _write_attack_nodes(writer: ParallelBatchWriter, obj_type: str, batch: list[ATTACKObject],
+                        delta: Optional[DeltaSet] = None) -> int:
+    """Submit a MERGE of one batch of same-typed ATT&CK nodes; returns the number written."""
+    nodes = []
+    for o in batch:
+        node = {
+            "stix_id": o.stix_id,
+            "attack_id": o.attack_id,
+            "name": o.name,
+            "description": o.description,
+            "tactics": o.tactics,
+            "deprecated": o.deprecated,
+            "revoked": o.revoked,
+        }
+        node["fingerprint"] = fingerprint(obj_type, node)
+        if delta is None or delta.node_changed(o.attack_id, node["fingerprint"]):
+            nodes.append(node)
+
+    if nodes:
+        writer.submit(
+            f"""
+            UNWIND $nodes AS n
+            MERGE (a:{obj_type} {{attack_id: n.attack_id}})
+            SET a.stix_id = n.stix_id,
+                a.name = n.name,
+                a.description = n.description,
+                a.tactics = n.tactics,
+                a.deprecated = n.deprecated,
+                a.revoked = n.revoked,
+                a.fingerprint = n.fingerprint
+            """,
+            {"nodes": nodes},
+            "nodes",
+            len(batch),
+        )
+    else:
+        writer.report("nodes", len(batch))
+    return len(nodes)
+
 
-        # Extract ATT&CK ID from external_references
-        attack_id = ""
-        for ref in obj.get("external_references", []):
-            if ref.get("source_name") == "mitre-attack":
-                attack_id = ref.get("external_id", "")
-                break
+def _label_groups(combos) -> list[list[tuple[str, str]]]:
+    """Partition (src_label, tgt_label) combos into groups with no label in common."""
+    groups: list[tuple[set[str], list[tuple[str, str]]]] = []
+    for combo in combos:
+        labels, members = set(combo), [combo]
+        for group in [g for g in groups if g[0] & labels]:
+            groups.remove(group)
+            labels |= group[0]
+            members = group[1] + members
+        groups.append((labels, members))
+    return [members for _, members in groups]
 
-        if not attack_id:
+
+def _write_attack_relationships(driver, writer: ParallelBatchWriter, relationships: list[ATTACKRelationship],
+                                id_to_info: dict, batch_size: int, delta: Optional[DeltaSet] = None) -> int:
+    """MERGE ATT&CK relationships whose endpoints are both known nodes.
+
+    ``id_to_info`` maps stix_id → (label, attack_id). Combos of (src_label,
+    tgt_label) that share a label can lock the same nodes (most edges end at
+    a Technique), so they are written in one writer group; only combos over
+    disjoint labels run in parallel. With a ``delta``, only the edges of sources whose outgoing edge
+    set changed (or that point at new nodes) are rewritten. Returns the
+    number of edges written.
+    """
+    edges = []
+    edge_lists = {attack_id: [] for _, attack_id in id_to_info.values()}
+    for r in relationships:
+        neo4j_type = REL_MAP.get(r.rel_type)
+        if neo4j_type is None or r.source_ref not in id_to_info or r.target_ref not in id_to_info:
             continue
+        src_label, src_id = id_to_info[r.source_ref]
+        tgt_label, tgt_id = id_to_info[r.target_ref]
+        edges.append({
+            "rel_type": neo4j_type,
+            "src_label": src_label,
+            "src_id": src_id,
+            "tgt_label": tgt_label,
+            "tgt_id": tgt_id,
+        })
+        edge_lists[src_id].append((neo4j_type, tgt_id))
 
-        # Extract tactics from kill_chain_phases
-        tactics = []
-        for phase in obj.get("kill_chain_phases", []):
-            if phase.get("kill_chain_name") == "mitre-attack":
-                tactics.append(phase["phase_name"])
-
-        objects.append(ATTACKObject(
-            stix_id=obj["id"],
-            attack_id=attack_id,
-            name=obj.get("name", ""),
-            obj_type=type_map[stix_type],
-            description=obj.get("description", "")[:2000],
-            tactics=tactics,
-            deprecated=obj.get("x_mitre_deprecated", False),
-            revoked=obj.get("revoked", False),
-        ))
+    edge_fingerprints = {src_id: fingerprint(sorted(pairs)) for src_id, pairs in edge_lists.items()}
+    if delta is not None:
+        edge_fingerprints = {
+            src_id: fp for src_id, fp in edge_fingerprints.items()
+            if delta.edges_changed(src_id, fp)
+        }
+        edges = [
+            e for e in edges
+            if e["src_id"] in edge_fingerprints or delta.is_new(e["tgt_id"])
+        ]
+        with driver.session() as session:
+            clear_outgoing_edges(session, delta, list(edge_fingerprints), REL_MAP.values(), batch_size)
 
-    return objects, relationships
+    # Group by src_label + tgt_label combo, then relationship type for typed MATCH
+    combos = {}
+    for e in edges:
+        combos.setdefault((e["src_label"], e["tgt_label"]), {}).setdefault(e["rel_type"], []).append(e)
 
+    for group in _label_groups(combos):
+        statements = []
+        for src_label, tgt_label in group:
+            for neo4j_type, typed_edges in combos[(src_label, tgt_label)].items():
+                query = f"""
+                    UNWIND $edges AS e
+                    MATCH (s:{src_label} {{attack_id: e.src_id}})
+                    MATCH (t:{tgt_label} {{attack_id: e.tgt_id}})
+                    MERGE (s)-[:{neo4j_type}]->(t)
+                    """
+                statements.extend((query, {"edges": batch}, len(batch)) for batch in batched(typed_edges, batch_size))
+        writer.submit_group(statements, phase="relationships")
+    writer.wait()
+
+    if delta is not None:
+        with driver.session() as session:
+            set_edge_fingerprints(session, delta, edge_fingerprints, batch_size)
+
+    return len(edges)
 
-def import_attack_to_neo4j(driver, objects: list[ATTACKObject], relationships: list[ATTACKRelationship], batch_size: int = 500):
-    """Import ATT&CK objects and relationships into Neo4j."""
-    # Build stix_id → ATTACKObject lookup for filtering valid rels
-    valid_ids = {o.stix_id for o in objects}
 
-    # Phase 1: Create nodes by type
-    with driver.session() as session:
-        for obj_type in ("Technique", "Tactic", "Mitigation", "Group", "Software", "Campaign", "DataSource", "DataComponent"):
+def import_attack_to_neo4j(driver, objects: list[ATTACKObject], relationships: list[ATTACKRelationship],
+                           batch_size: int = 500, concurrency: Optional[int] = None):
+    """Import ATT&CK objects and relationships into Neo4j."""
+    with ParallelBatchWriter(driver, concurrency) as writer:
+        # Phase 1: Create nodes by type
+        for obj_type in NODE_TYPES:
             typed = [o for o in objects if o.obj_type == obj_type]
-            for i in range(0, len(typed), batch_size):
-                batch = typed[i:i + batch_size]
-                nodes = [
-                    {
-                        "stix_id": o.stix_id,
-                        "attack_id": o.attack_id,
-                        "name": o.name,
-                        "description": o.description,
-                        "tactics": o.tactics,
-                        "deprecated": o.deprecated,
-                        "revoked": o.revoked,
-                    }
-                    for o in batch
-                ]
-                session.run(
-                    f"""
-                    UNWIND $nodes AS n
-                    MERGE (a:{obj_type} {{attack_id: n.attack_id}})
-                    SET a.stix_id = n.stix_id,
-                        a.name = n.name,
-                        a.description = n.description,
-                        a.tactics = n.tactics,
-                        a.deprecated = n.deprecated,
-                        a.revoked = n.revoked
-                    """,
-                    nodes=nodes,
-                )
-
-    # Phase 2: Create relationships
-    # Map rel_type to Neo4j relationship type
-    rel_map = {
-        "uses": "USES",
-        "mitigates": "MITIGATES",
-        "subtechnique-of": "SUBTECHNIQUE_OF",
-        "detects": "DETECTS",
-        "attributed-to": "ATTRIBUTED_TO",
-        "targets": "TARGETS",
-        "revoked-by": "REVOKED_BY",
-    }
-
-    # Build stix_id → (label, attack_id) for matching
-    id_to_info = {o.stix_id: (o.obj_type, o.attack_id) for o in objects}
-
-    with driver.session() as session:
-        for rel_type, neo4j_type in rel_map.items():
-            typed_rels = [r for r in relationships if r.rel_type == rel_type
-                          and r.source_ref in valid_ids and r.target_ref in valid_ids]
-            if not typed_rels:
-                continue
+            for batch in batched(typed, batch_size):
+                _write_attack_nodes(writer, obj_type, batch)
+        writer.wait()
 
-            edges = []
-            for r in typed_rels:
-                src_label, src_id = id_to_info[r.source_ref]
-                tgt_label, tgt_id = id_to_info[r.target_ref]
-                edges.append({
-                    "src_label": src_label,
-                    "src_id": src_id,
-                    "tgt_label": tgt_label,
-                    "tgt_id": tgt_id,
-                })
-
-            # Group by src_label + tgt_label combo for typed MATCH
-            combos = {}
-            for e in edges:
-                key = (e["src_label"], e["tgt_label"])
-                combos.setdefault(key, []).append(e)
-
-            for (src_label, tgt_label), combo_edges in combos.items():
-                for i in range(0, len(combo_edges), batch_size):
-                    batch = combo_edges[i:i + batch_size]
-                    session.run(
-                        f"""
-                        UNWIND $edges AS e
-                        MATCH (s:{src_label} {{attack_id: e.src_id}})
-                        MATCH (t:{tgt_label} {{attack_id: e.tgt_id}})
-                        MERGE (s)-[:{neo4j_type}]->(t)
-                        """,
-                        edges=batch,
-                    )
+        # Phase 2: Create relationships
+        # Build stix_id → (label, attack_id) for matching
+        id_to_info = {o.stix_id: (o.obj_type, o.attack_id) for o in objects}
+        _write_attack_relationships(driver, writer, relationships, id_to_info, batch_size)
 
     return len(objects), len(relationships)
+
+
+def import_attack_stream(driver, items: Iterable[Union[ATTACKObject, ATTACKRelationship]],
+                         batch_size: int = 500, delta: Optional[DeltaSet] = None,
+                         progress: Optional[ProgressCallback] = None, concurrency: Optional[int] = None):
+    """Import a stream of ATT&CK records (e.g. from ``iter_attack_stix``) into Neo4j.
+
+    Parsing runs in a background thread while node batches are written as
+    soon as ``batch_size`` objects of one type have been decoded, so Neo4j
+    writes overlap with parsing. Relationships are buffered (they only hold
+    three strings each) and written once every node exists. ``progress`` is
+    called after every batch. Batches are written by up to ``concurrency``
+    parallel sessions. Returns the number of nodes and edges written.
+    """
+    pending = {obj_type: [] for obj_type in NODE_TYPES}
+    relationships = []
+    id_to_info = {}
+    node_count = 0
+
+    with ParallelBatchWriter(driver, concurrency, progress=progress) as writer:
+        for item in prefetch(items):
+            if isinstance(item, ATTACKRelationship):
+                relationships.append(item)
+                continue
+
+            id_to_info[item.stix_id] = (item.obj_type, item.attack_id)
+            typed = pending[item.obj_type]
+            typed.append(item)
+            if len(typed) >= batch_size:
+                node_count += _write_attack_nodes(writer, item.obj_type, typed, delta)
+                typed.clear()
+
+        for obj_type, typed in pending.items():
+            if typed:
+                node_count += _write_attack_nodes(writer, obj_type, typed, delta)
+        writer.wait()
+
+        edge_count = _write_attack_relationships(
+            driver, writer, relationships, id_to_info, batch_size, delta
+        )
+
+    return node_count, edge_count
+
+
+def run_attack_import(driver, json_path: str, force: bool = False,
+                      progress: Optional[ProgressCallback] = None) -> dict:
+    """Import an ATT&CK STIX bundle, skipping it if unchanged and writing only the delta otherwise."""
+    def load(delta: DeltaSet) -> dict:
+        node_count, edge_count = import_attack_stream(
+            driver, iter_attack_stix(json_path), delta=delta, progress=progress
+        )
+        return {"nodes_imported": node_count, "relationships_imported": edge_count}
+
+    return run_delta_import(
+        driver, "attack", file_sha256(json_path), NODE_TYPES, "attack_id", load,
+        force=force, progress=progress,
+    )
@@ -1,10 +1,48 @@
 """CAPEC XML importer — bridges CWE weaknesses to ATT&CK techniques."""
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from importers.delta import (
+    DeltaSet,
+    clear_outgoing_edges,
+    file_sha256,
+    fingerprint,
+    run_delta_import,
+    set_edge_fingerprints,
+)
+from importers.mapping_index import build_mapping_index
+from importers.streaming import ProgressCallback, batched, iter_xml_elements
+from importers.writer import ParallelBatchWriter
 
 
 NS = {"capec": "http://capec.mitre.org/capec-3"}
+ATTACK_PATTERN_TAG = f"{{{NS['capec']}}}Attack_Pattern"
+REL_TYPES = ("EXPLOITS_WEAKNESS", "MAPS_TO_TECHNIQUE")
+
+CAPEC_NODE_QUERY = """
+UNWIND $nodes AS n
+MERGE (c:CAPEC {capec_id: n.capec_id})
+SET c.name = n.name,
+    c.numeric_id = n.numeric_id,
+    c.status = n.status,
+    c.description = n.description,
+    c.fingerprint = n.fingerprint
+"""
+
+EXPLOITS_WEAKNESS_QUERY = """
+UNWIND $edges AS e
+MATCH (c:CAPEC {capec_id: e.capec})
+MATCH (w:CWE {cwe_id: e.cwe})
+MERGE (c)-[:EXPLOITS_WEAKNESS]->(w)
+"""
+
+MAPS_TO_TECHNIQUE_QUERY = """
+UNWIND $edges AS e
+MATCH (c:CAPEC {capec_id: e.capec})
+MATCH (t:Technique {attack_id: e.attack_id})
+MERGE (c)-[:MAPS_TO_TECHNIQUE]->(t)
+"""
 
 
 @dataclass
@@ -18,115 +56,155 @@ class CAPECPattern:
     related_attacks: list[str] = field(default_factory=list)    # ATT&CK technique IDs (e.g., "1574.010")
 
 
+def _parse_attack_pattern(ap: ET.Element) -> CAPECPattern:
+    """Build a CAPECPattern from an <Attack_Pattern> element."""
+    capec_id = ap.get("ID", "")
+    name = ap.get("Name", "")
+    status = ap.get("Status", "")
+
+    desc_el = ap.find("capec:Description", NS)
+    description = ""
+    if desc_el is not None:
+        description = ET.tostring(desc_el, encoding="unicode", method="text").strip()[:2000]
+
+    # Related CWEs
+    related_cwes = []
+    for rw in ap.findall(".//capec:Related_Weakness", NS):
+        cwe_id = rw.get("CWE_ID")
+        if cwe_id:
+            related_cwes.append(cwe_id)
+
+    # ATT&CK taxonomy mappings
+    related_attacks = []
+    for tm in ap.findall(".//capec:Taxonomy_Mapping", NS):
+        if tm.get("Taxonomy_Name") == "ATTACK":
+            entry_id = tm.find("capec:Entry_ID", NS)
+            if entry_id is not None and entry_id.text:
+                # CAPEC stores as "1574.010", we need "T1574.010"
+                attack_id = f"T{entry_id.text}"
+                related_attacks.append(attack_id)
+
+    return CAPECPattern(
+        capec_id=capec_id,
+        name=name,
+        status=status,
+        description=description,
+        related_cwes=related_cwes,
+        related_attacks=related_attacks,
+    )
+
+
+def iter_capec_xml(xml_path: str) -> Iterator[CAPECPattern]:
+    """Stream CAPECPattern objects from a CAPEC XML file one at a time.
+
+    Uses incremental parsing, so memory stays flat regardless of catalog size.
+    """
+    for ap in iter_xml_elements(xml_path, ATTACK_PATTERN_TAG):
+        yield _parse_attack_pattern(ap)
+
+
 def parse_capec_xml(xml_path: str) -> list[CAPECPattern]:
     """Parse CAPEC XML into attack patterns with CWE and ATT&CK links."""
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    patterns = []
-    for ap in root.findall(".//capec:Attack_Pattern", NS):
-        capec_id = ap.get("ID", "")
-        name = ap.get("Name", "")
-        status = ap.get("Status", "")
-
-        desc_el = ap.find("capec:Description", NS)
-        description = ""
-        if desc_el is not None:
-            description = ET.tostring(desc_el, encoding="unicode", method="text").strip()[:2000]
-
-        # Related CWEs
-        related_cwes = []
-        for rw in ap.findall(".//capec:Related_Weakness", NS):
-            cwe_id = rw.get("CWE_ID")
-            if cwe_id:
-                related_cwes.append(cwe_id)
-
-        # ATT&CK taxonomy mappings
-        related_attacks = []
-        for tm in ap.findall(".//capec:Taxonomy_Mapping", NS):
-            if tm.get("Taxonomy_Name") == "ATTACK":
-                entry_id = tm.find("capec:Entry_ID", NS)
-                if entry_id is not None and entry_id.text:
-                    # CAPEC stores as "1574.010", we need "T1574.010"
-                    attack_id = f"T{entry_id.text}"
-                    related_attacks.append(attack_id)
-
-        patterns.append(CAPECPattern(
-            capec_id=capec_id,
-            name=name,
-            status=status,
-            description=description,
-            related_cwes=related_cwes,
-            related_attacks=related_attacks,
-        ))
-
-    return patterns
-
-
-def import_capec_to_neo4j(driver, patterns: list[CAPECPattern], batch_size: int = 500):
-    """Import CAPEC patterns and bridge CWE↔CAPEC↔ATT&CK."""
-    # Phase 1: Create CAPEC nodes
-    with driver.session() as session:
-        for i in range(0, len(patterns), batch_size):
-            batch = patterns[i:i + batch_size]
-            nodes = [
-                {
+    return list(iter_capec_xml(xml_path))
+
+
+def import_capec_to_neo4j(driver, patterns: Iterable[CAPECPattern], batch_size: int = 500,
+                          delta: Optional[DeltaSet] = None, progress: Optional[ProgressCallback] = None,
+                          concurrency: Optional[int] = None):
+    """Import CAPEC patterns and bridge CWE↔CAPEC↔ATT&CK.
+
+    ``patterns`` may be a list or the generator returned by ``iter_capec_xml``;
+    nodes are written batch by batch as they are produced. With a ``delta``,
+    only changed nodes and the edges of changed patterns are written.
+    ``progress`` is called after every batch. Batches are written by up to
+    ``concurrency`` parallel sessions.
+    """
+    node_count = 0
+    cwe_edges = []
+    attack_edges = []
+    edge_fingerprints = {}
+
+    with ParallelBatchWriter(driver, concurrency, progress=progress) as writer:
+        # Phase 1: Create CAPEC nodes
+        for batch in batched(patterns, batch_size):
+            nodes = []
+            for p in batch:
+                node = {
                     "capec_id": f"CAPEC-{p.capec_id}",
                     "numeric_id": int(p.capec_id),
                     "name": p.name,
                     "status": p.status,
                     "description": p.description,
                 }
-                for p in batch
-            ]
-            session.run(
-                """
-                UNWIND $nodes AS n
-                MERGE (c:CAPEC {capec_id: n.capec_id})
-                SET c.name = n.name,
-                    c.numeric_id = n.numeric_id,
-                    c.status = n.status,
-                    c.description = n.description
-                """,
-                nodes=nodes,
-            )
-
-    # Phase 2: CAPEC → CWE relationships
-    cwe_edges = []
-    for p in patterns:
-        for cwe_id in p.related_cwes:
-            cwe_edges.append({"capec": f"CAPEC-{p.capec_id}", "cwe": f"CWE-{cwe_id}"})
-
-    with driver.session() as session:
-        for i in range(0, len(cwe_edges), batch_size):
-            batch = cwe_edges[i:i + batch_size]
-            session.run(
-                """
-                UNWIND $edges AS e
-                MATCH (c:CAPEC {capec_id: e.capec})
-                MATCH (w:CWE {cwe_id: e.cwe})
-                MERGE (c)-[:EXPLOITS_WEAKNESS]->(w)
-                """,
-                edges=batch,
-            )
-
-    # Phase 3: CAPEC → ATT&CK Technique relationships
-    attack_edges = []
-    for p in patterns:
-        for attack_id in p.related_attacks:
-            attack_edges.append({"capec": f"CAPEC-{p.capec_id}", "attack_id": attack_id})
-
-    with driver.session() as session:
-        for i in range(0, len(attack_edges), batch_size):
-            batch = attack_edges[i:i + batch_size]
-            session.run(
-                """
-                UNWIND $edges AS e
-                MATCH (c:CAPEC {capec_id: e.capec})
-                MATCH (t:Technique {attack_id: e.attack_id})
-                MERGE (c)-[:MAPS_TO_TECHNIQUE]->(t)
-                """,
-                edges=batch,
-            )
-
-    return len(patterns), len(cwe_edges), len(attack_edges)
+                node["fingerprint"] = fingerprint(node)
+                if delta is None or delta.node_changed(node["capec_id"], node["fingerprint"]):
+                    nodes.append(node)
+
+                edge_fingerprints[node["capec_id"]] = fingerprint(
+                    sorted(p.related_cwes), sorted(p.related_attacks)
+                )
+                for cwe_id in p.related_cwes:
+                    cwe_edges.append({"capec": node["capec_id"], "cwe": f"CWE-{cwe_id}"})
+                for attack_id in p.related_attacks:
+                    attack_edges.append({"capec": node["capec_id"], "attack_id": attack_id})
+
+            if nodes:
+                writer.submit(CAPEC_NODE_QUERY, {"nodes": nodes}, "nodes", len(batch))
+            else:
+                writer.report("nodes", len(batch))
+            node_count += len(nodes)
+
+        writer.wait()
+
+        if delta is not None:
+            edge_fingerprints = {
+                capec_id: fp for capec_id, fp in edge_fingerprints.items()
+                if delta.edges_changed(capec_id, fp)
+            }
+            cwe_edges = [e for e in cwe_edges if e["capec"] in edge_fingerprints]
+            attack_edges = [e for e in attack_edges if e["capec"] in edge_fingerprints]
+            with driver.session() as session:
+                clear_outgoing_edges(session, delta, list(edge_fingerprints), REL_TYPES, batch_size)
+
+        # Phase 2: CAPEC → CWE and CAPEC → ATT&CK Technique relationships. Both
+        # lock the CAPEC source nodes, so they share one writer group.
+        writer.submit_group(
+            [(EXPLOITS_WEAKNESS_QUERY, {"edges": batch}, len(batch)) for batch in batched(cwe_edges, batch_size)]
+            + [(MAPS_TO_TECHNIQUE_QUERY, {"edges": batch}, len(batch)) for batch in batched(attack_edges, batch_size)],
+            phase="relationships",
+        )
+
+    if delta is not None:
+        with driver.session() as session:
+            set_edge_fingerprints(session, delta, edge_fingerprints, batch_size)
+
+    return node_count, len(cwe_edges), len(attack_edges)
+
+
+def run_capec_import(driver, xml_path: str, force: bool = False,
+                     progress: Optional[ProgressCallback] = None) -> dict:
+    """Import a CAPEC XML file, skipping it if unchanged and writing only the delta otherwise.
+
+    CAPEC edges point at CWE and ATT&CK nodes, so a change in either of those
+    imports since the last CAPEC run causes all CAPEC edges to be rewritten.
+    Once the edges are written and patterns gone from the catalog deleted,
+    the CWE → CAPEC → ATT&CK mapping index is rebuilt.
+    """
+    def load(delta: DeltaSet) -> dict:
+        node_count, cwe_edge_count, attack_edge_count = import_capec_to_neo4j(
+            driver, iter_capec_xml(xml_path), delta=delta, progress=progress
+        )
+        return {
+            "nodes_imported": node_count,
+            "cwe_relationships": cwe_edge_count,
+            "attack_relationships": attack_edge_count,
+        }
+
+    def rebuild_index() -> dict:
+        return {"mapped_cwes": build_mapping_index(driver, progress=progress)}
+
+    return run_delta_import(
+        driver, "capec", file_sha256(xml_path), ("CAPEC",), "capec_id", load,
+        force=force, upstream_sources=("cwe", "attack"), progress=progress,
+        after_delete=rebuild_index,
+    )
@@ -1,10 +1,49 @@
 """CWE XML importer — parses CWE XML and loads into Neo4j AuraDB."""
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from importers.delta import (
+    DeltaSet,
+    clear_outgoing_edges,
+    file_sha256,
+    fingerprint,
+    run_delta_import,
+    set_edge_fingerprints,
+)
+from importers.hierarchy import write_cwe_closure
+from importers.streaming import ProgressCallback, batched, iter_xml_elements
+from importers.writer import ParallelBatchWriter
 
 
 NS = {"cwe": "http://cwe.mitre.org/cwe-7"}
+WEAKNESS_TAG = f"{{{NS['cwe']}}}Weakness"
+
+# CWE Related_Weakness Nature → Neo4j relationship type
+NATURE_MAP = {
+    "ChildOf": "CHILD_OF",
+    "PeerOf": "PEER_OF",
+    "CanPrecede": "CAN_PRECEDE",
+    "CanFollow": "CAN_FOLLOW",
+    "StartsWith": "STARTS_WITH",
+    "CanAlsoBe": "CAN_ALSO_BE",
+    "Requires": "REQUIRES",
+}
+
+# Edges per relationship write transaction
+REL_BATCH_SIZE = 5000
+
+CWE_NODE_QUERY = """
+UNWIND $nodes AS n
+MERGE (c:CWE {cwe_id: n.cwe_id})
+SET c.name = n.name,
+    c.numeric_id = n.numeric_id,
+    c.abstraction = n.abstraction,
+    c.status = n.status,
+    c.description = n.description,
+    c.likelihood = n.likelihood,
+    c.fingerprint = n.fingerprint
+"""
 
 
 @dataclass
@@ -19,56 +58,108 @@ class CWEWeakness:
     related: list = field(default_factory=list)  # [(nature, target_cwe_id), ...]
 
 
+def _parse_weakness(w: ET.Element) -> CWEWeakness:
+    """Build a CWEWeakness from a <Weakness> element."""
+    cwe_id = w.get("ID")
+    name = w.get("Name", "")
+    abstraction = w.get("Abstraction", "")
+    status = w.get("Status", "")
+
+    desc_el = w.find("cwe:Description", NS)
+    description = desc_el.text.strip() if desc_el is not None and desc_el.text else ""
+
+    likelihood_el = w.find("cwe:Likelihood_Of_Exploit", NS)
+    likelihood = likelihood_el.text.strip() if likelihood_el is not None and likelihood_el.text else None
+
+    related = []
+    for rel in w.findall(".//cwe:Related_Weakness", NS):
+        nature = rel.get("Nature")
+        target = rel.get("CWE_ID")
+        if nature and target:
+            related.append((nature, target))
+
+    return CWEWeakness(
+        cwe_id=cwe_id,
+        name=name,
+        abstraction=abstraction,
+        status=status,
+        description=description,
+        likelihood=likelihood,
+        related=related,
+    )
+
+
+def iter_cwe_xml(xml_path: str) -> Iterator[CWEWeakness]:
+    """Stream CWEWeakness objects from a CWE XML file one at a time.
+
+    Uses incremental parsing, so memory stays flat regardless of catalog size.
+    """
+    for w in iter_xml_elements(xml_path, WEAKNESS_TAG):
+        yield _parse_weakness(w)
+
+
 def parse_cwe_xml(xml_path: str) -> list[CWEWeakness]:
     """Parse CWE XML file into a list of CWEWeakness objects."""
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    weaknesses = []
-    for w in root.findall(".//cwe:Weakness", NS):
-        cwe_id = w.get("ID")
-        name = w.get("Name", "")
-        abstraction = w.get("Abstraction", "")
-        status = w.get("Status", "")
-
-        desc_el = w.find("cwe:Description", NS)
-        description = desc_el.text.strip() if desc_el is not None and desc_el.text else ""
-
-        likelihood_el = w.find("cwe:Likelihood_Of_Exploit", NS)
-        likelihood = likelihood_el.text.strip() if likelihood_el is not None and likelihood_el.text else None
-
-        related = []
-        for rel in w.findall(".//cwe:Related_Weakness", NS):
-            nature = rel.get("Nature")
-            target = rel.get("CWE_ID")
-            if nature and target:
-                related.append((nature, target))
-
-        weaknesses.append(CWEWeakness(
-            cwe_id=cwe_id,
-            name=name,
-            abstraction=abstraction,
-            status=status,
-            description=description,
-            likelihood=likelihood,
-            related=related,
-        ))
-
-    return weaknesses
-
-
-def import_cwe_to_neo4j(driver, weaknesses: list[CWEWeakness], batch_size: int = 500):
+    return list(iter_cwe_xml(xml_path))
+
+
+def write_cwe_relationships(writer: ParallelBatchWriter, edges: list[dict],
+                            rel_batch_size: int = REL_BATCH_SIZE):
+    """MERGE CWE→CWE edges, grouped by relationship type.
+
+    Edges are grouped by type up front so each type is written with a single
+    statement per ``rel_batch_size`` edges, each in its own transaction —
+    one round-trip per chunk instead of one per nature per 500-edge batch.
+    Every type links the same CWE nodes, so all of them are submitted as one
+    writer group and written one after another.
+    """
+    by_type: dict[str, list[dict]] = {}
+    for e in edges:
+        rel_type = NATURE_MAP.get(e["nature"])
+        if rel_type:
+            by_type.setdefault(rel_type, []).append({"source": e["source"], "target": e["target"]})
+
+    statements = []
+    for rel_type, typed_edges in by_type.items():
+        query = f"""
+            UNWIND $edges AS e
+            MATCH (s:CWE {{cwe_id: e.source}})
+            MATCH (t:CWE {{cwe_id: e.target}})
+            MERGE (s)-[:{rel_type}]->(t)
+            """
+        statements.extend((query, {"edges": batch}, len(batch)) for batch in batched(typed_edges, rel_batch_size))
+    writer.submit_group(statements, phase="relationships")
+
+
+def import_cwe_to_neo4j(driver, weaknesses: Iterable[CWEWeakness], batch_size: int = 500,
+                        delta: Optional[DeltaSet] = None, progress: Optional[ProgressCallback] = None,
+                        rel_batch_size: int = REL_BATCH_SIZE, concurrency: Optional[int] = None):
     """Import parsed CWE weaknesses into Neo4j.
     
     Creates :CWE nodes and relationship edges (ChildOf, PeerOf, CanPrecede, etc.)
-    Uses MERGE to be idempotent.
+    Uses MERGE to be idempotent. ``weaknesses`` may be a list or the generator
+    returned by ``iter_cwe_xml``; nodes are written batch by batch as they are
+    produced and only the (small) edge tuples are kept until phase 2.
+
+    With a ``delta``, only nodes whose fingerprint changed are written, and
+    only edges of changed sources (or pointing at new nodes) are rewritten.
+    ``progress`` is called after every batch. Edges are written per
+    relationship type in transactions of ``rel_batch_size`` rows. Batches are
+    written by up to ``concurrency`` parallel sessions. Finally the transitive
+    closure of ``CHILD_OF`` is stored on every CWE (see ``importers.hierarchy``).
+    Returns the number of nodes and edges written.
     """
-    # Phase 1: Create all nodes
-    with driver.session() as session:
-        for i in range(0, len(weaknesses), batch_size):
-            batch = weaknesses[i:i + batch_size]
-            nodes = [
-                {
+    node_count = 0
+    edges = []
+    edge_fingerprints = {}
+    cwe_ids = []
+
+    with ParallelBatchWriter(driver, concurrency, progress=progress) as writer:
+        # Phase 1: Create all nodes
+        for batch in batched(weaknesses, batch_size):
+            nodes = []
+            for w in batch:
+                node = {
                     "cwe_id": f"CWE-{w.cwe_id}",
                     "numeric_id": int(w.cwe_id),
                     "name": w.name,
@@ -77,68 +168,66 @@ def import_cwe_to_neo4j(driver, weaknesses: list[CWEWeakness], batch_size: int =
                     "description": w.description[:2000],  # Truncate for AuraDB free tier
                     "likelihood": w.likelihood,
                 }
-                for w in batch
+                node["fingerprint"] = fingerprint(node)
+                if delta is None or delta.node_changed(node["cwe_id"], node["fingerprint"]):
+                    nodes.append(node)
+                cwe_ids.append(node["cwe_id"])
+
+                edge_fingerprints[node["cwe_id"]] = fingerprint(sorted(w.related))
+                for nature, target in w.related:
+                    edges.append({
+                        "source": node["cwe_id"],
+                        "target": f"CWE-{target}",
+                        "nature": nature,
+                    })
+
+            if nodes:
+                writer.submit(CWE_NODE_QUERY, {"nodes": nodes}, "nodes", len(batch))
+            else:
+                writer.report("nodes", len(batch))
+            node_count += len(nodes)
+
+        writer.wait()
+
+        # The closure needs every CHILD_OF edge, not just the delta
+        child_of = [(e["source"], e["target"]) for e in edges if e["nature"] == "ChildOf"]
+
+        if delta is not None:
+            edge_fingerprints = {
+                source: fp for source, fp in edge_fingerprints.items()
+                if delta.edges_changed(source, fp)
+            }
+            edges = [
+                e for e in edges
+                if e["source"] in edge_fingerprints or delta.is_new(e["target"])
             ]
-            session.run(
-                """
-                UNWIND $nodes AS n
-                MERGE (c:CWE {cwe_id: n.cwe_id})
-                SET c.name = n.name,
-                    c.numeric_id = n.numeric_id,
-                    c.abstraction = n.abstraction,
-                    c.status = n.status,
-                    c.description = n.description,
-                    c.likelihood = n.likelihood
-                """,
-                nodes=nodes,
-            )
-
-    # Phase 2: Create relationships
-    edges = []
-    for w in weaknesses:
-        for nature, target in w.related:
-            edges.append({
-                "source": f"CWE-{w.cwe_id}",
-                "target": f"CWE-{target}",
-                "nature": nature,
-            })
-
-    with driver.session() as session:
-        for i in range(0, len(edges), batch_size):
-            batch = edges[i:i + batch_size]
-            session.run(
-                """
-                UNWIND $edges AS e
-                MATCH (s:CWE {cwe_id: e.source})
-                MATCH (t:CWE {cwe_id: e.target})
-                CALL {
-                    WITH s, t, e
-                    WITH s, t, e
-                    WHERE e.nature = 'ChildOf'
-                    MERGE (s)-[:CHILD_OF]->(t)
-                } IN TRANSACTIONS OF 1 ROWS
-                """,
-                edges=[e for e in batch if e["nature"] == "ChildOf"],
-            )
-            # Handle other relationship types
-            for nature, rel_type in [
-                ("PeerOf", "PEER_OF"),
-                ("CanPrecede", "CAN_PRECEDE"),
-                ("CanFollow", "CAN_FOLLOW"),
-                ("StartsWith", "STARTS_WITH"),
-                ("CanAlsoBe", "CAN_ALSO_BE"),
-                ("Requires", "REQUIRES"),
-            ]:
-                typed_edges = [e for e in batch if e["nature"] == nature]
-                if typed_edges:
-                    session.run(
-                        f"""
-                        UNWIND $edges AS e
-                        MATCH (s:CWE {{cwe_id: e.source}})
-                        MATCH (t:CWE {{cwe_id: e.target}})
-                        MERGE (s)-[:{rel_type}]->(t)
-                        """,
-                        edges=typed_edges,
-                    )
-
-    return len(weaknesses), len(edges)
+            with driver.session() as session:
+                clear_outgoing_edges(session, delta, list(edge_fingerprints), NATURE_MAP.values(), batch_size)
+
+        # Phase 2: Create relationships
+        write_cwe_relationships(writer, edges, rel_batch_size)
+        writer.wait()
+
+        # Phase 3: CHILD_OF closure, once edge writes no longer lock the nodes
+        write_cwe_closure(writer, cwe_ids, child_of, batch_size)
+
+    if delta is not None:
+        with driver.session() as session:
+            set_edge_fingerprints(session, delta, edge_fingerprints, batch_size)
+
+    return node_count, len(edges)
+
+
+def run_cwe_import(driver, xml_path: str, force: bool = False,
+                   progress: Optional[ProgressCallback] = None) -> dict:
+    """Import a CWE XML file, skipping it if unchanged and writing only the delta otherwise."""
+    def load(delta: DeltaSet) -> dict:
+        node_count, edge_count = import_cwe_to_neo4j(
+            driver, iter_cwe_xml(xml_path), delta=delta, progress=progress
+        )
+        return {"nodes_imported": node_count, "relationships_imported": edge_count}
+
+    return run_delta_import(
+        driver, "cwe", file_sha256(xml_path), ("CWE",), "cwe_id", load,
+        force=force, progress=progress,
+    )
@@ -0,0 +1,244 @@
+"""Content-hash skip and delta support for the knowledge-base importers.
+
+Every import records an ``(:ImportRun {source})`` node holding the SHA-256 of
+the source file. Each imported node carries a ``fingerprint`` of its own
+properties and an ``edges_fingerprint`` of its outgoing edges, so a re-import
+of a changed file only rewrites the nodes and edges that actually differ and
+deletes the nodes that disappeared from the catalog.
+"""
+import hashlib
+import json
+from typing import Callable, Iterable, Optional
+
+from importers.streaming import ProgressCallback, batched
+from src.graph_schema import ensure_schema
+
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(*parts) -> str:
+    """Return a stable hash of JSON-serialisable ``parts``."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DeltaSet:
+    """Fingerprints left by the previous import of one source, and what changed since.
+
+    ``labels`` are the node labels the source owns and ``id_prop`` the property
+    identifying them. An empty DeltaSet (no previous fingerprints) treats every
+    record as changed.
+    """
+
+    def __init__(self, labels: tuple[str, ...], id_prop: str,
+                 nodes: Optional[dict] = None, edges: Optional[dict] = None):
+        self.labels = labels
+        self.id_prop = id_prop
+        self.nodes = nodes or {}
+        self.edges = edges or {}
+        # Set when nodes owned by another source changed, so edges pointing
+        # at them must be rewritten even if this source's records did not
+        self.force_edges = False
+        self.seen: set[str] = set()
+        self.nodes_written = 0
+        self.nodes_unchanged = 0
+
+    @property
+    def label_expr(self) -> str:
+        """Cypher label expression matching any of this source's labels."""
+        return "|".join(self.labels)
+
+    @classmethod
+    def load(cls, session, labels: tuple[str, ...], id_prop: str) -> "DeltaSet":
+        """Read the stored fingerprints for every node of ``labels``."""
+        result = session.run(
+            f"""
+            MATCH (n:{"|".join(labels)})
+            RETURN n.{id_prop} AS id, n.fingerprint AS fingerprint,
+                   n.edges_fingerprint AS edges_fingerprint
+            """
+        )
+        nodes = {}
+        edges = {}
+        for record in result:
+            nodes[record["id"]] = record["fingerprint"]
+            edges[record["id"]] = record["edges_fingerprint"]
+        return cls(labels, id_prop, nodes, edges)
+
+    def rewrite_all(self) -> None:
+        """Treat every record as changed while still tracking removed IDs; used by forced re-imports."""
+        self.nodes = dict.fromkeys(self.nodes)
+        self.edges = dict.fromkeys(self.edges)
+        self.force_edges = True
+
+    def node_changed(self, record_id: str, node_fingerprint: str) -> bool:
+        """Mark ``record_id`` as present and report whether its node must be written."""
+        self.seen.add(record_id)
+        if self.nodes.get(record_id) == node_fingerprint:
+            self.nodes_unchanged += 1
+            return False
+        self.nodes_written += 1
+        return True
+
+    def edges_changed(self, record_id: str, edges_fingerprint: str) -> bool:
+        """Report whether the outgoing edges of ``record_id`` must be rewritten."""
+        return self.force_edges or self.edges.get(record_id) != edges_fingerprint
+
+    def is_new(self, record_id: str) -> bool:
+        """True if ``record_id`` did not exist after the previous import."""
+        return record_id not in self.nodes
+
+    def removed(self) -> list[str]:
+        """IDs present after the previous import but missing from this one."""
+        return [record_id for record_id in self.nodes if record_id not in self.seen]
+
+
+def clear_outgoing_edges(session, delta: DeltaSet, record_ids: list[str],
+                         rel_types: Iterable[str], batch_size: int = 500):
+    """Delete the importer-owned outgoing edges of ``record_ids`` before rewriting them."""
+    rel_expr = "|".join(rel_types)
+    for batch in batched(record_ids, batch_size):
+        session.run(
+            f"""
+            UNWIND $ids AS id
+            MATCH (s:{delta.label_expr} {{{delta.id_prop}: id}})-[r:{rel_expr}]->()
+            DELETE r
+            """,
+            ids=batch,
+        )
+
+
+def set_edge_fingerprints(session, delta: DeltaSet, fingerprints: dict[str, str],
+                          batch_size: int = 500):
+    """Store the ``edges_fingerprint`` of each record in ``fingerprints``."""
+    rows = [{"id": record_id, "fingerprint": fp} for record_id, fp in fingerprints.items()]
+    for batch in batched(rows, batch_size):
+        session.run(
+            f"""
+            UNWIND $rows AS row
+            MATCH (n:{delta.label_expr} {{{delta.id_prop}: row.id}})
+            SET n.edges_fingerprint = row.fingerprint
+            """,
+            rows=batch,
+        )
+
+
+def delete_removed_nodes(session, delta: DeltaSet, batch_size: int = 500) -> int:
+    """DETACH DELETE nodes that disappeared from the catalog; returns the count."""
+    removed = delta.removed()
+    for batch in batched(removed, batch_size):
+        session.run(
+            f"""
+            UNWIND $ids AS id
+            MATCH (n:{delta.label_expr} {{{delta.id_prop}: id}})
+            DETACH DELETE n
+            """,
+            ids=batch,
+        )
+    return len(removed)
+
+
+def get_import_run(session, source: str) -> Optional[dict]:
+    """Return the properties of the last ImportRun for ``source``, if any."""
+    record = session.run(
+        "MATCH (r:ImportRun {source: $source}) RETURN properties(r) AS run",
+        source=source,
+    ).single()
+    return record["run"] if record else None
+
+
+def record_import_run(session, source: str, content_hash: str, **counts):
+    """Upsert the ImportRun node for ``source`` after a successful import."""
+    session.run(
+        """
+        MERGE (r:ImportRun {source: $source})
+        SET r.content_hash = $content_hash,
+            r.completed_at = datetime(),
+            r += $counts
+        """,
+        source=source,
+        content_hash=content_hash,
+        counts=counts,
+    )
+
+
+def run_delta_import(
+    driver,
+    source: str,
+    file_hash: str,
+    labels: tuple[str, ...],
+    id_prop: str,
+    import_fn: Callable[[DeltaSet], dict],
+    force: bool = False,
+    upstream_sources: tuple[str, ...] = (),
+    progress: Optional[ProgressCallback] = None,
+    after_delete: Optional[Callable[[], dict]] = None,
+) -> dict:
+    """Run one source import, skipping it entirely when nothing changed.
+
+    ``import_fn(delta)`` performs the actual load and returns the response
+    counts. ``upstream_sources`` name imports whose nodes this source links to
+    (CAPEC links to CWE and ATT&CK); when any of them changed, all of this
+    source's edges are rewritten. ``after_delete()`` runs once the nodes
+    gone from the catalog are deleted, for work that must not see them
+    (CAPEC rebuilds the mapping index there); its counts are added to the
+    response. With ``force`` every node and edge is
+    rewritten; nodes gone from the catalog are still deleted. The graph schema is bootstrapped first
+    so every MERGE is backed by a uniqueness constraint.
+    """
+    ensure_schema(driver)
+    with driver.session() as session:
+        previous = get_import_run(session, source) or {}
+        upstream_hash = fingerprint(*[
+            (get_import_run(session, name) or {}).get("content_hash")
+            for name in upstream_sources
+        ])
+        content_hash = fingerprint(file_hash, upstream_hash) if upstream_sources else file_hash
+
+        if not force and previous.get("content_hash") == content_hash:
+            return {"status": "unchanged", "content_hash": content_hash}
+
+        delta = DeltaSet.load(session, labels, id_prop)
+        if force:
+            delta.rewrite_all()
+        else:
+            delta.force_edges = previous.get("upstream_hash") != upstream_hash
+
+    result = import_fn(delta)
+
+    with driver.session() as session:
+        nodes_deleted = delete_removed_nodes(session, delta)
+        if progress:
+            progress("cleanup", nodes_deleted)
+
+    if after_delete:
+        result = {**result, **after_delete()}
+
+    with driver.session() as session:
+        record_import_run(
+            session,
+            source,
+            content_hash,
+            upstream_hash=upstream_hash,
+            nodes_written=delta.nodes_written,
+            nodes_unchanged=delta.nodes_unchanged,
+            nodes_deleted=nodes_deleted,
+        )
+
+    return {
+        "status": "completed",
+        "content_hash": content_hash,
+        "nodes_unchanged": delta.nodes_unchanged,
+        "nodes_deleted": nodes_deleted,
+        **result,
+    }
@@ -0,0 +1,103 @@
+"""Transitive closure of the CWE ``CHILD_OF`` hierarchy.
+
+CWE is a multi-parent DAG, so "all descendants of CWE-74" as a
+``CHILD_OF*`` traversal enumerates every path and slows down sharply
+towards the pillars. The CWE import instead computes the closure once
+and stores it on every CWE node:
+
+- ``ancestor_ids`` — every CWE reachable over ``CHILD_OF``
+- ``descendant_ids`` — every CWE that reaches this one
+
+so hierarchy lookups are an index seek plus an ``IN`` list.
+"""
+from typing import Iterable
+
+from importers.streaming import batched
+from importers.writer import ParallelBatchWriter
+
+
+CLOSURE_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (w:CWE {cwe_id: row.cwe_id})
+SET w.ancestor_ids = row.ancestors,
+    w.descendant_ids = row.descendants
+"""
+
+
+def ancestor_closure(parents: dict[str, set[str]]) -> dict[str, set[str]]:
+    """Every transitive ancestor of every node in a ``child → parents`` DAG.
+
+    Each node's closure is computed once and shared by its descendants, so
+    multi-parent hierarchies cost one pass over the edges. Cycles, which
+    CWE should not have, terminate but may leave the closure incomplete.
+    """
+    closure: dict[str, set[str]] = {}
+    for root in parents:
+        if root in closure:
+            continue
+        # Iterative post-order DFS: a node is resolved once all its parents
+        # are; ``on_stack`` is the current path, so it only blocks cycles
+        stack = [root]
+        on_stack = {root}
+        while stack:
+            node = stack[-1]
+            pending = next(
+                (p for p in parents.get(node, ()) if p not in closure and p not in on_stack),
+                None,
+            )
+            if pending is not None:
+                stack.append(pending)
+                on_stack.add(pending)
+                continue
+            stack.pop()
+            on_stack.discard(node)
+            ancestors = set()
+            for p in parents.get(node, ()):
+                ancestors.add(p)
+                ancestors |= closure.get(p, set())
+            ancestors.discard(node)
+            closure[node] = ancestors
+    return closure
+
+
+def hierarchy_closure(node_ids: Iterable[str],
+                      child_of: Iterable[tuple[str, str]]) -> dict[str, dict[str, list[str]]]:
+    """Sorted ``ancestors`` and ``descendants`` of every node in ``node_ids``.
+
+    ``child_of`` holds ``(child, parent)`` pairs; pairs naming a node outside
+    ``node_ids`` are ignored, as the importer never writes those edges.
+    """
+    node_ids = list(node_ids)
+    known = set(node_ids)
+    parents: dict[str, set[str]] = {}
+    for child, parent in child_of:
+        if child in known and parent in known and child != parent:
+            parents.setdefault(child, set()).add(parent)
+
+    ancestors = ancestor_closure(parents)
+    descendants: dict[str, set[str]] = {}
+    for node, node_ancestors in ancestors.items():
+        for ancestor in node_ancestors:
+            descendants.setdefault(ancestor, set()).add(node)
+
+    return {
+        node: {
+            "ancestors": sorted(ancestors.get(node, ())),
+            "descendants": sorted(descendants.get(node, ())),
+        }
+        for node in node_ids
+    }
+
+
+def write_cwe_closure(writer: ParallelBatchWriter, cwe_ids: Iterable[str],
+                      child_of: Iterable[tuple[str, str]], batch_size: int = 500) -> int:
+    """Compute the CHILD_OF closure and submit it to ``writer``; returns the rows written.
+
+    Every CWE gets a row, so nodes that lost their parents have stale lists
+    cleared.
+    """
+    closure = hierarchy_closure(cwe_ids, child_of)
+    rows = [{"cwe_id": cwe_id, **lists} for cwe_id, lists in closure.items()]
+    for batch in batched(rows, batch_size):
+        writer.submit(CLOSURE_WRITE_QUERY, {"rows": batch}, "closure", len(batch))
+    return len(rows)
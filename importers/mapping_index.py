@@ -0,0 +1,146 @@
+"""Materialised CWE → CAPEC → ATT&CK mapping index.
+
+Going from a weakness to the techniques that exploit it means walking
+``CAPEC-[:EXPLOITS_WEAKNESS]->CWE``, ``CAPEC-[:MAPS_TO_TECHNIQUE]->Technique``
+and the technique's tactics, and CAPEC usually maps to class-level CWEs, so
+a specific CWE also inherits the patterns of its ``CHILD_OF`` ancestors.
+``build_mapping_index`` resolves all of that once, at the end of the CAPEC
+import, and stores the result on every CWE node:
+
+- ``mapped_capec`` — CAPEC IDs exploiting the CWE or any of its ancestors
+- ``mapped_capec_direct`` — the subset linked to the CWE itself
+- ``mapped_techniques`` — ATT&CK technique IDs those patterns map to
+- ``mapped_tactics`` — ATT&CK tactic IDs of those techniques
+
+CWE and ATT&CK imports leave these properties alone; they are recomputed
+by every CAPEC import, which re-runs whenever either upstream changed.
+"""
+from typing import Iterable, Optional
+
+from importers.hierarchy import ancestor_closure
+from importers.streaming import ProgressCallback, batched
+from importers.writer import ParallelBatchWriter
+
+
+MAPPING_INPUT_QUERIES = {
+    "child_of": """
+        MATCH (c:CWE)-[:CHILD_OF]->(p:CWE)
+        RETURN c.cwe_id AS source, p.cwe_id AS target
+    """,
+    "exploits": """
+        MATCH (a:CAPEC)-[:EXPLOITS_WEAKNESS]->(w:CWE)
+        RETURN w.cwe_id AS source, a.capec_id AS target
+    """,
+    "maps_to": """
+        MATCH (a:CAPEC)-[:MAPS_TO_TECHNIQUE]->(t:Technique)
+        RETURN a.capec_id AS source, t.attack_id AS target
+    """,
+    "tactics": """
+        MATCH (t:Technique) WHERE size(t.tactics) > 0
+        UNWIND t.tactics AS shortname
+        RETURN t.attack_id AS source, shortname AS target
+    """,
+    "tactic_ids": """
+        MATCH (t:Tactic)
+        RETURN t.name AS source, t.attack_id AS target
+    """,
+    "cwes": """
+        MATCH (w:CWE)
+        RETURN w.cwe_id AS source, null AS target
+    """,
+}
+
+MAPPING_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (w:CWE {cwe_id: row.cwe_id})
+SET w.mapped_capec = row.capec,
+    w.mapped_capec_direct = row.capec_direct,
+    w.mapped_techniques = row.techniques,
+    w.mapped_tactics = row.tactics
+"""
+
+
+def tactic_shortname(name: str) -> str:
+    """ATT&CK kill-chain phase name of a tactic, e.g. "Initial Access" → "initial-access"."""
+    return "-".join(name.lower().split())
+
+
+def _group(pairs: Iterable[tuple[str, str]]) -> dict[str, set[str]]:
+    grouped: dict[str, set[str]] = {}
+    for source, target in pairs:
+        grouped.setdefault(source, set()).add(target)
+    return grouped
+
+
+def compute_mapping_index(
+    cwe_ids: Iterable[str],
+    child_of: Iterable[tuple[str, str]],
+    exploits: Iterable[tuple[str, str]],
+    maps_to: Iterable[tuple[str, str]],
+    technique_tactics: Iterable[tuple[str, str]],
+) -> dict[str, dict[str, list[str]]]:
+    """Resolve the mapping of every CWE from the raw edge lists.
+
+    ``child_of`` holds ``(cwe, parent_cwe)``, ``exploits`` ``(cwe, capec)``,
+    ``maps_to`` ``(capec, technique)`` and ``technique_tactics``
+    ``(technique, tactic)`` pairs. Returns sorted ID lists per CWE.
+    """
+    ancestors = ancestor_closure(_group(child_of))
+    direct = _group(exploits)
+    techniques_of = _group(maps_to)
+    tactics_of = _group(technique_tactics)
+
+    index = {}
+    for cwe_id in cwe_ids:
+        capec = set(direct.get(cwe_id, ()))
+        for ancestor in ancestors.get(cwe_id, ()):
+            capec |= direct.get(ancestor, set())
+        techniques = set()
+        for capec_id in capec:
+            techniques |= techniques_of.get(capec_id, set())
+        tactics = set()
+        for technique in techniques:
+            tactics |= tactics_of.get(technique, set())
+        index[cwe_id] = {
+            "capec": sorted(capec),
+            "capec_direct": sorted(direct.get(cwe_id, ())),
+            "techniques": sorted(techniques),
+            "tactics": sorted(tactics),
+        }
+    return index
+
+
+def build_mapping_index(driver, batch_size: int = 500,
+                        progress: Optional[ProgressCallback] = None) -> int:
+    """Compute the mapping index from the graph and store it on the CWE nodes.
+
+    The inputs are read in one transaction and the CWE rows written in
+    parallel batches of ``batch_size``; rows for unmapped CWEs carry empty
+    lists, so stale mappings are cleared. Returns the number of CWEs with at
+    least one CAPEC mapping.
+    """
+    def read_inputs(tx) -> dict[str, list[tuple[str, str]]]:
+        return {
+            name: [(r["source"], r["target"]) for r in tx.run(query)]
+            for name, query in MAPPING_INPUT_QUERIES.items()
+        }
+
+    with driver.session() as session:
+        inputs = session.execute_read(read_inputs)
+
+    tactic_ids = {tactic_shortname(name): attack_id for name, attack_id in inputs["tactic_ids"]}
+    technique_tactics = [
+        (technique, tactic_ids[shortname])
+        for technique, shortname in inputs["tactics"] if shortname in tactic_ids
+    ]
+    index = compute_mapping_index(
+        [cwe_id for cwe_id, _ in inputs["cwes"]],
+        inputs["child_of"], inputs["exploits"], inputs["maps_to"], technique_tactics,
+    )
+
+    rows = [{"cwe_id": cwe_id, **mapping} for cwe_id, mapping in index.items()]
+    with ParallelBatchWriter(driver, progress=progress) as writer:
+        for batch in batched(rows, batch_size):
+            writer.submit(MAPPING_WRITE_QUERY, {"rows": batch}, "mapping", len(batch))
+
+    return sum(1 for mapping in index.values() if mapping["capec"])
@@ -0,0 +1,191 @@
+"""Streaming helpers shared by the knowledge-base importers.
+
+The CWE and CAPEC catalogs are large XML documents and ATT&CK ships as a
+large STIX JSON bundle; these helpers let the importers parse them
+incrementally and hand records to Neo4j in batches as they are produced
+instead of materialising the whole document first.
+"""
+import json
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator, TypeVar
+
+
+T = TypeVar("T")
+
+# Called by importers as ``progress(phase, rows)`` after every written batch
+ProgressCallback = Callable[[str, int], None]
+
+# Catalog entries (Weakness, Attack_Pattern, Category, ...) sit two levels
+# below the document root, inside their container element.
+ENTRY_DEPTH = 3
+
+JSON_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield successive lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def iter_xml_elements(xml_path: str, tag: str) -> Iterator[ET.Element]:
+    """Incrementally parse ``xml_path`` and yield every completed ``tag`` element.
+
+    ``tag`` is a fully qualified ``{namespace}Name`` tag. Each catalog entry is
+    detached from its container and cleared once it has been processed, so
+    peak memory is bounded by the largest single entry rather than the size
+    of the document. Yielded elements are only valid until the generator is
+    resumed.
+    """
+    stack: list[ET.Element] = []
+    for event, elem in ET.iterparse(xml_path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag == tag:
+            yield elem
+
+        if len(stack) == ENTRY_DEPTH - 1:
+            stack[-1].remove(elem)
+            elem.clear()
+
+
+class _JSONTokenStream:
+    """Minimal pull reader over a JSON text file, decoding one value at a time."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise ValueError."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A value ending exactly at the buffer edge may be truncated
+                # (e.g. a number), so only accept it once more text is seen.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_array(json_path: str, key: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of the top-level ``key`` array of a JSON object one by one.
+
+    Only one array element (plus one read chunk) is held in memory at a time.
+    Other top-level members are decoded and discarded.
+    """
+    with open(json_path, encoding="utf-8") as f:
+        stream = _JSONTokenStream(f, chunk_size)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+
+        while True:
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.pos += 1
+                else:
+                    while True:
+                        yield stream.value()
+                        if stream.peek() != ",":
+                            stream.expect("]")
+                            break
+                        stream.pos += 1
+            else:
+                stream.value()
+
+            if stream.peek() != ",":
+                stream.expect("}")
+                return
+            stream.pos += 1
+
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], maxsize: int = 1000) -> Iterator[T]:
+    """Run ``iterable`` in a background thread, buffering up to ``maxsize`` items.
+
+    Lets a consumer write to Neo4j while the producer keeps parsing. Errors
+    raised by the producer are re-raised in the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+            buffer.put(_DONE)
+        except BaseException as exc:  # re-raised on the consumer side
+            buffer.put(exc)
+
+    thread = threading.Thread(target=produce, name="importer-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue so the thread can exit
+        while thread.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                thread.join(timeout=0.01)
@@ -0,0 +1,126 @@
+"""Parallel batch writer shared by the knowledge-base importers.
+
+Import batches are independent UNWIND/MERGE statements, so running several at
+once over separate sessions from the driver's connection pool keeps Neo4j
+busy instead of idling while one round-trip at a time crosses the network.
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from neo4j.exceptions import TransientError
+
+from importers.streaming import ProgressCallback
+
+
+DEFAULT_CONCURRENCY = 4
+_default_concurrency = DEFAULT_CONCURRENCY
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2  # seconds; doubled on every attempt, plus jitter
+
+# (query, params, rows) — rows is what gets reported to the progress callback
+Statement = tuple[str, dict, int]
+
+
+def configure_concurrency(concurrency: int) -> None:
+    """Set the worker count of writers created afterwards without an explicit one."""
+    if concurrency < 1:
+        raise ValueError("Import write concurrency must be at least 1")
+    global _default_concurrency
+    _default_concurrency = concurrency
+
+
+def _run_statement(tx, query: str, params: dict):
+    tx.run(query, **params).consume()
+
+
+class ParallelBatchWriter:
+    """Runs write statements on a thread pool, one session per worker.
+
+    ``submit`` schedules a statement that may run concurrently with any other;
+    use it for node batches, which MERGE disjoint keys. ``submit_group`` runs
+    its statements one after another on a single worker. Groups still run in
+    parallel with each other, so two groups must never write relationships
+    touching the same nodes: each locks the endpoints in its own order, which
+    is how Neo4j deadlocks arise. Put every edge batch that can share an
+    endpoint into one group.
+
+    Statements run in managed write transactions, which the driver retries
+    on transient errors; errors that outlast the driver's retry window are
+    retried ``max_retries`` more times with jittered backoff. Retries are a
+    safety net, not a substitute for keeping concurrent writes disjoint. At most
+    ``2 × concurrency`` statements are queued, so streaming producers are
+    throttled to the write rate. The first error is re-raised from the next
+    ``submit``/``wait`` call.
+    """
+
+    def __init__(self, driver, concurrency: Optional[int] = None, max_retries: int = MAX_RETRIES,
+                 progress: Optional[ProgressCallback] = None):
+        self.driver = driver
+        self.concurrency = max(1, concurrency or _default_concurrency)
+        self.max_retries = max_retries
+        self._progress = progress
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="import-writer")
+        self._slots = threading.BoundedSemaphore(self.concurrency * 2)
+        self._lock = threading.Lock()
+        self._futures: list[Future] = []
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "ParallelBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def report(self, phase: str, rows: int) -> None:
+        """Forward progress to the callback, serialised across worker threads."""
+        if self._progress:
+            with self._lock:
+                self._progress(phase, rows)
+
+    def submit(self, query: str, params: dict, phase: Optional[str] = None, rows: int = 0) -> None:
+        """Schedule one statement to run concurrently with the others."""
+        self.submit_group([(query, params, rows)], phase)
+
+    def submit_group(self, statements: list[Statement], phase: Optional[str] = None) -> None:
+        """Schedule ``statements`` to run sequentially on one worker."""
+        if self._error is not None:
+            raise self._error
+        self._slots.acquire()
+        future = self._executor.submit(self._run_group, statements, phase)
+        future.add_done_callback(self._on_done)
+        self._futures.append(future)
+
+    def wait(self) -> None:
+        """Block until every submitted statement has run; re-raise the first error."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def _on_done(self, future: Future) -> None:
+        self._slots.release()
+        if future.exception() is not None and self._error is None:
+            self._error = future.exception()
+
+    def _run_group(self, statements: list[Statement], phase: Optional[str]) -> None:
+        with self.driver.session() as session:
+            for query, params, rows in statements:
+                self._write(session, query, params)
+                if phase:
+                    self.report(phase, rows)
+
+    def _write(self, session, query: str, params: dict) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                session.execute_write(_run_statement, query, params)
+                return
+            except TransientError:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(RETRY_BACKOFF * 2 ** attempt * (1 + random.random()))
@@ -0,0 +1,136 @@
+"""Attack-path search over a threat model's data flows.
+
+Data flows are stored as ``(:TechnicalAsset)-[:FLOWS_TO]->(:TechnicalAsset)``
+relationships, so a model is a directed graph an attacker can move along,
+from an entry point (an internet-facing asset) towards a target (an asset
+holding sensitive data, or a critical one).
+
+``find_attack_paths`` returns the ``k`` cheapest simple paths over all
+entry/target pairs at once. It runs a best-first search from a virtual
+source joined to every entry point. Paths are popped in order of cost, so
+the first ``k`` that reach a target are the ``k`` shortest, and the search
+is bounded by ``max_hops`` and ``max_expansions``. The cost of a path is:
+
+- 1 per flow followed
+- ``boundary_weight`` per trust boundary crossed, because each crossing is
+  a control the attacker must get past
+- ``criticality_weight × (4 − criticality rank)`` for its target, so paths
+  ending at critical assets rank first
+"""
+import heapq
+from itertools import count
+from typing import Iterable
+
+from src.threat_engine import CRITICALITY_RANK, DEFAULT_CRITICALITY
+
+
+SENSITIVE_CLASSIFICATIONS = ("confidential", "restricted", "secret", "top_secret")
+INTERNET_TAGS = ("internet-facing", "internet_facing", "internet", "public")
+
+MAX_RANK = max(CRITICALITY_RANK.values())
+
+
+def _rank(asset: dict) -> int:
+    level = asset.get("criticality") or DEFAULT_CRITICALITY
+    return CRITICALITY_RANK.get(level, CRITICALITY_RANK[DEFAULT_CRITICALITY])
+
+
+def default_entries(assets: list[dict], flows: list[dict], boundaries: list[dict]) -> list[str]:
+    """Internet-facing assets: flagged or tagged as such, or reached by a flow through a public boundary."""
+    public = {
+        b.get("boundary_id") for b in boundaries if b.get("security_level") == "public"
+    }
+    entries = {
+        a["asset_id"] for a in assets
+        if a.get("internet_facing") or set(a.get("tags") or ()) & set(INTERNET_TAGS)
+    }
+    entries.update(f["target"] for f in flows if f.get("trust_boundary_id") in public)
+    return sorted(entries)
+
+
+def default_targets(assets: list[dict], data_assets: list[dict]) -> list[str]:
+    """Assets storing or processing sensitive data assets, plus every critical asset."""
+    targets = {a["asset_id"] for a in assets if _rank(a) == MAX_RANK}
+    for data_asset in data_assets:
+        if data_asset.get("classification") in SENSITIVE_CLASSIFICATIONS:
+            targets.update(data_asset.get("stored_in") or ())
+            targets.update(data_asset.get("processed_by") or ())
+    known = {a["asset_id"] for a in assets}
+    return sorted(targets & known)
+
+
+def find_attack_paths(
+    assets: list[dict],
+    flows: list[dict],
+    entries: Iterable[str],
+    targets: Iterable[str],
+    k: int = 5,
+    max_hops: int = 6,
+    boundary_weight: float = 2.0,
+    criticality_weight: float = 1.0,
+    max_expansions: int = 100_000,
+) -> dict:
+    """The ``k`` cheapest simple paths from any entry to any target.
+
+    ``flows`` are ``{flow_id, source, target, crosses_trust_boundary}`` dicts
+    between the ``asset_id``s of ``assets``. Returns ``{"paths": [...],
+    "truncated": bool}``; ``truncated`` is set when ``max_expansions`` ran
+    out before ``k`` paths were found.
+    """
+    by_id = {a["asset_id"]: a for a in assets}
+    adjacency: dict[str, list[tuple[str, dict]]] = {}
+    for flow in flows:
+        if flow["source"] in by_id and flow["target"] in by_id:
+            adjacency.setdefault(flow["source"], []).append((flow["target"], flow))
+    targets = {t for t in targets if t in by_id}
+
+    def target_cost(asset_id: str) -> float:
+        return criticality_weight * (MAX_RANK - _rank(by_id[asset_id]))
+
+    tie = count()
+    heap = []
+    for entry in sorted(set(entries)):
+        if entry in by_id:
+            heap.append((0.0, next(tie), (entry,), (), 0))
+    heapq.heapify(heap)
+
+    paths = []
+    expansions = 0
+    while heap and len(paths) < k:
+        cost, _, nodes, via, crossings = heapq.heappop(heap)
+        last = nodes[-1]
+        if last == "":
+            # Reached the virtual sink: a complete path
+            nodes = nodes[:-1]
+            target = by_id[nodes[-1]]
+            paths.append({
+                "assets": list(nodes),
+                "flows": list(via),
+                "cost": round(cost, 6),
+                "hops": len(via),
+                "boundary_crossings": crossings,
+                "target_criticality": target.get("criticality") or DEFAULT_CRITICALITY,
+            })
+            continue
+
+        expansions += 1
+        if expansions > max_expansions:
+            return {"paths": paths, "truncated": True}
+
+        if last in targets and via:
+            heapq.heappush(heap, (cost + target_cost(last), next(tie), nodes + ("",), via, crossings))
+        if len(via) >= max_hops:
+            continue
+        for neighbour, flow in adjacency.get(last, ()):
+            if neighbour in nodes:
+                continue
+            crossed = bool(flow.get("crosses_trust_boundary"))
+            heapq.heappush(heap, (
+                cost + 1 + (boundary_weight if crossed else 0),
+                next(tie),
+                nodes + (neighbour,),
+                via + (flow["flow_id"],),
+                crossings + crossed,
+            ))
+
+    return {"paths": paths, "truncated": False}
@@ -2,15 +2,37 @@
 
 Provides a singleton Neo4j driver with connection pooling, configured
 from environment variables. Used by both the API layer and importers.
+The API's async routes use a separate async driver singleton so in-flight
+queries wait on the event loop instead of pinning a worker thread each.
+
+Pool sizing, timeouts and liveness checks come from the ``NEO4J_*`` pool
+environment variables (or ``configure_pool``); every driver records how long
+callers wait to acquire a connection, reported by ``get_pool_metrics``.
 """
 import os
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Optional
 
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver
 
 
 _driver: Optional[Driver] = None
+_async_driver: Optional[AsyncDriver] = None
+
+# Driver pool option → (environment variable, type). Unset options keep the
+# driver's defaults (pool of 100, 60s acquisition timeout, 1h lifetime, no
+# liveness check, 30s connection timeout).
+POOL_OPTIONS = {
+    "max_connection_pool_size": ("NEO4J_MAX_CONNECTION_POOL_SIZE", int),
+    "connection_acquisition_timeout": ("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", float),
+    "max_connection_lifetime": ("NEO4J_MAX_CONNECTION_LIFETIME", float),
+    "liveness_check_timeout": ("NEO4J_LIVENESS_CHECK_TIMEOUT", float),
+    "connection_timeout": ("NEO4J_CONNECTION_TIMEOUT", float),
+}
+
+_pool_overrides: dict = {}
 
 
 def get_neo4j_config() -> dict:
@@ -18,7 +40,126 @@ def get_neo4j_config() -> dict:
     uri = os.environ.get("NEO4J_URI", "")
     username = os.environ.get("NEO4J_USERNAME", "neo4j")
     password = os.environ.get("NEO4J_PASSWORD", "")
-    return {"uri": uri, "username": username, "password": password}
+    return {"uri": uri, "username": username, "password": password, "pool": get_pool_config()}
+
+
+def get_pool_config() -> dict:
+    """Pool options for new drivers: environment variables, then ``configure_pool`` overrides."""
+    config = {}
+    for option, (env_var, cast) in POOL_OPTIONS.items():
+        value = os.environ.get(env_var)
+        if value:
+            config[option] = cast(value)
+    config.update(_pool_overrides)
+    return config
+
+
+def configure_pool(**options) -> None:
+    """Override pool options for drivers created afterwards; ``None`` values are ignored."""
+    unknown = set(options) - set(POOL_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown pool option(s): {', '.join(sorted(unknown))}")
+    _pool_overrides.update({k: v for k, v in options.items() if v is not None})
+
+
+class PoolMetrics:
+    """Connection acquisition statistics for one driver."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.failed_acquisitions = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, failed: bool = False) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.failed_acquisitions += failed
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "failed_acquisitions": self.failed_acquisitions,
+                "avg_acquisition_wait_ms": round(1000 * self.total_wait / self.acquisitions, 3)
+                if self.acquisitions else 0.0,
+                "max_acquisition_wait_ms": round(1000 * self.max_wait, 3),
+            }
+
+
+_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
+
+def _instrument_pool(driver, metrics: PoolMetrics) -> None:
+    """Time every connection acquisition of ``driver``'s pool.
+
+    Relies on the driver's internal pool object; if a driver version lays it
+    out differently the driver is left uninstrumented.
+    """
+    pool = getattr(driver, "_pool", None)
+    acquire = getattr(pool, "acquire", None)
+    if acquire is None:
+        return
+
+    if isinstance(driver, AsyncDriver):
+        async def timed_acquire(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                connection = await acquire(*args, **kwargs)
+            except Exception:
+                metrics.record(time.perf_counter() - start, failed=True)
+                raise
+            metrics.record(time.perf_counter() - start)
+            return connection
+    else:
+        def timed_acquire(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                connection = acquire(*args, **kwargs)
+            except Exception:
+                metrics.record(time.perf_counter() - start, failed=True)
+                raise
+            metrics.record(time.perf_counter() - start)
+            return connection
+
+    pool.acquire = timed_acquire
+
+
+def _pool_state(driver) -> dict[str, Any]:
+    """Current size of ``driver``'s pool, read defensively from driver internals."""
+    pool = getattr(driver, "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {}
+    open_connections = [c for queue in list(connections.values()) for c in list(queue)]
+    in_use = sum(1 for c in open_connections if getattr(c, "in_use", False))
+    return {
+        "max_size": pool.pool_config.max_connection_pool_size,
+        "open": len(open_connections),
+        "in_use": in_use,
+        "idle": len(open_connections) - in_use,
+    }
+
+
+def get_pool_metrics() -> dict:
+    """Pool state and acquisition statistics for each driver that has been created."""
+    metrics = {}
+    for name, driver in (("sync", _driver), ("async", _async_driver)):
+        if driver is not None:
+            metrics[name] = {**_pool_state(driver), **_metrics[name].to_dict()}
+    return metrics
+
+
+def _require_config() -> dict:
+    config = get_neo4j_config()
+    if not config["uri"] or not config["password"]:
+        raise ValueError(
+            "NEO4J_URI and NEO4J_PASSWORD environment variables are required"
+        )
+    return config
 
 
 def get_driver() -> Driver:
@@ -30,19 +171,38 @@ def get_driver() -> Driver:
     if _driver is not None:
         return _driver
 
-    config = get_neo4j_config()
-    if not config["uri"] or not config["password"]:
-        raise ValueError(
-            "NEO4J_URI and NEO4J_PASSWORD environment variables are required"
-        )
-
+    config = _require_config()
     _driver = GraphDatabase.driver(
         config["uri"],
         auth=(config["username"], config["password"]),
+        **config["pool"],
     )
+    _metrics["sync"] = PoolMetrics()
+    _instrument_pool(_driver, _metrics["sync"])
     return _driver
 
 
+def get_async_driver() -> AsyncDriver:
+    """Get or create the singleton async Neo4j driver.
+
+    Must be first called from the event loop that will use it.
+    Raises ValueError if NEO4J_URI or NEO4J_PASSWORD are not set.
+    """
+    global _async_driver
+    if _async_driver is not None:
+        return _async_driver
+
+    config = _require_config()
+    _async_driver = AsyncGraphDatabase.driver(
+        config["uri"],
+        auth=(config["username"], config["password"]),
+        **config["pool"],
+    )
+    _metrics["async"] = PoolMetrics()
+    _instrument_pool(_async_driver, _metrics["async"])
+    return _async_driver
+
+
 def close_driver() -> None:
     """Close the singleton driver if it exists."""
     global _driver
@@ -51,6 +211,14 @@ def close_driver() -> None:
         _driver = None
 
 
+async def close_async_driver() -> None:
+    """Close the singleton async driver if it exists."""
+    global _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
+
+
 @contextmanager
 def get_session():
     """Context manager that yields a Neo4j session from the singleton driver."""
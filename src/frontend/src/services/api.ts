@@ -28,6 +28,7 @@ interface NodesResponse {
   nodes: GraphNode[];
   skip: number;
   limit: number;
+  next_cursor: string | null;
 }
 
 interface NodeDetailResponse {
@@ -36,6 +37,11 @@ interface NodeDetailResponse {
     outgoing: Array<{ type: string; target: Record<string, unknown>; target_labels: string[] }>;
     incoming: Array<{ type: string; source: Record<string, unknown>; source_labels: string[] }>;
   };
+  relationship_counts: {
+    outgoing: Record<string, number>;
+    incoming: Record<string, number>;
+  };
+  neighbour_limit: number;
 }
 
 interface SearchResponse {
@@ -0,0 +1,150 @@
+"""Neo4j schema bootstrap for Threat Oracle.
+
+Every importer MERGE and every API lookup finds nodes by an ID property;
+without a constraint or index behind it each of those is a label scan.
+``ensure_schema`` creates the uniqueness constraints and range indexes the
+graph relies on, plus the full-text index behind graph search. It is
+idempotent and runs at API startup and before every knowledge-base import.
+"""
+import logging
+
+from neo4j.exceptions import ClientError
+from neo4j.time import Date, DateTime, Duration, Time
+
+
+logger = logging.getLogger(__name__)
+
+ATTACK_LABELS = (
+    "Technique", "Tactic", "Mitigation", "Group", "Software",
+    "Campaign", "DataSource", "DataComponent",
+)
+
+# Knowledge-base labels covered by the search index
+SEARCHABLE_LABELS = ("CWE", "CAPEC", *ATTACK_LABELS)
+SEARCH_INDEX = "knowledge_text"
+
+# Bookkeeping properties the importers store on knowledge-base nodes for
+# their own use; graph reads strip them with ``public_properties``
+INTERNAL_PROPERTIES = frozenset({
+    "fingerprint",  # delta imports: hash of the node's own properties
+    "edges_fingerprint",  # delta imports: hash of the node's outgoing edges
+    # CWE → CAPEC → ATT&CK mapping index (importers.mapping_index)
+    "mapped_capec", "mapped_capec_direct", "mapped_techniques", "mapped_tactics",
+    # CWE CHILD_OF closure (importers.hierarchy)
+    "ancestor_ids", "descendant_ids",
+})
+
+
+def public_properties(props) -> dict:
+    """A node's properties without the importers' internal bookkeeping.
+
+    Neo4j temporal values (e.g. a threat model's ``created``) become ISO
+    strings, the same conversion the model routes apply.
+    """
+    return {
+        k: str(v) if isinstance(v, (Date, DateTime, Duration, Time)) else v
+        for k, v in dict(props).items() if k not in INTERNAL_PROPERTIES
+    }
+
+
+# (label, property) pairs that identify a node; each gets a uniqueness
+# constraint, which is backed by a range index.
+UNIQUE_KEYS = (
+    ("CWE", "cwe_id"),
+    ("CAPEC", "capec_id"),
+    *((label, "attack_id") for label in ATTACK_LABELS),
+    ("ImportRun", "source"),
+    ("ThreatModel", "model_id"),
+    ("TechnicalAsset", "asset_id"),
+    ("TrustBoundary", "boundary_id"),
+    ("DataFlow", "flow_id"),
+    ("DataAsset", "data_asset_id"),
+)
+
+# Non-unique properties used for lookups or ordering (name backs the
+# keyset pagination of /graph/nodes; DeletedThreatModel is the tombstone
+# label of a model whose elements are still being purged)
+RANGE_INDEXES = (
+    ("ThreatModel", "updated"),
+    ("DeletedThreatModel", "model_id"),
+    *((label, "name") for label in SEARCHABLE_LABELS),
+)
+
+
+def constraint_name(label: str, prop: str) -> str:
+    return f"{label.lower()}_{prop}_unique"
+
+
+def index_name(label: str, prop: str) -> str:
+    return f"{label.lower()}_{prop}_range"
+
+
+def schema_statements() -> list[tuple[str, str]]:
+    """Return ``(name, cypher)`` for every constraint and index to create."""
+    statements = []
+    for label, prop in UNIQUE_KEYS:
+        name = constraint_name(label, prop)
+        statements.append((
+            name,
+            f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE",
+        ))
+    for label, prop in RANGE_INDEXES:
+        name = index_name(label, prop)
+        statements.append((
+            name,
+            f"CREATE RANGE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+        ))
+    statements.append((
+        SEARCH_INDEX,
+        f"CREATE FULLTEXT INDEX {SEARCH_INDEX} IF NOT EXISTS "
+        f"FOR (n:{'|'.join(SEARCHABLE_LABELS)}) ON EACH [n.name, n.description]",
+    ))
+    return statements
+
+
+def describe_schema(session) -> dict:
+    """List the constraints and indexes that currently exist in the database."""
+    constraints = [
+        {
+            "name": record["name"],
+            "type": record["type"],
+            "labels": record["labelsOrTypes"],
+            "properties": record["properties"],
+        }
+        for record in session.run(
+            "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties"
+        )
+    ]
+    indexes = [
+        {
+            "name": record["name"],
+            "type": record["type"],
+            "labels": record["labelsOrTypes"],
+            "properties": record["properties"],
+            "state": record["state"],
+        }
+        for record in session.run(
+            "SHOW INDEXES YIELD name, type, labelsOrTypes, properties, state"
+        )
+    ]
+    return {"constraints": constraints, "indexes": indexes}
+
+
+def ensure_schema(driver) -> dict:
+    """Create any missing constraints and indexes and report the resulting schema.
+
+    Statements that fail (e.g. duplicate IDs already in the graph prevent a
+    uniqueness constraint) are logged and listed under ``errors`` rather than
+    aborting the rest of the bootstrap.
+    """
+    errors = []
+    with driver.session() as session:
+        for name, statement in schema_statements():
+            try:
+                session.run(statement).consume()
+            except ClientError as e:
+                logger.warning("Could not create %s: %s", name, e.message)
+                errors.append({"name": name, "error": e.message})
+        report = describe_schema(session)
+    report["errors"] = errors
+    return report
@@ -0,0 +1,255 @@
+"""In-memory snapshot of the imported knowledge graph.
+
+CWE, CAPEC and ATT&CK together are a few tens of thousands of nodes and
+edges and only change when an import runs, so read queries over them can
+be answered in-process instead of over the network. A snapshot maps every
+knowledge-base node to a dense integer id and stores, per relationship
+type, the edges in compressed sparse row (CSR) form in both directions:
+``offsets[i]:offsets[i + 1]`` slices ``targets`` to give node ``i``'s
+neighbours, sorted by name.
+
+Neo4j remains the system of record; the snapshot is rebuilt from it after
+every import. Only edges between knowledge-base nodes are included.
+"""
+import logging
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+from src.graph_schema import SEARCHABLE_LABELS, public_properties
+
+
+logger = logging.getLogger(__name__)
+
+ID_PROPERTIES = ("cwe_id", "capec_id", "attack_id")
+DIRECTIONS = ("out", "in", "both")
+
+NODES_QUERY = f"""
+MATCH (n:{"|".join(SEARCHABLE_LABELS)})
+RETURN elementId(n) AS element_id, labels(n) AS labels, properties(n) AS props
+"""
+
+EDGES_QUERY = f"""
+MATCH (s:{"|".join(SEARCHABLE_LABELS)})-[r]->(t:{"|".join(SEARCHABLE_LABELS)})
+RETURN elementId(s) AS source, type(r) AS type, elementId(t) AS target
+"""
+
+
+class CSR:
+    """Adjacency of one relationship type in one direction."""
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, node_count: int, pairs: list[tuple[int, int]]):
+        """Build from ``(source, target)`` pairs already sorted by source, then target order."""
+        counts = [0] * (node_count + 1)
+        for source, _ in pairs:
+            counts[source + 1] += 1
+        for i in range(node_count):
+            counts[i + 1] += counts[i]
+        self.offsets = array("I", counts)
+        self.targets = array("I", (target for _, target in pairs))
+
+    def neighbours(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+
+def _primary_id(props: dict) -> Optional[str]:
+    for prop in ID_PROPERTIES:
+        if props.get(prop):
+            return props[prop]
+    return None
+
+
+class GraphSnapshot:
+    """Immutable in-memory copy of the knowledge graph."""
+
+    def __init__(self, nodes: Iterable[tuple[str, list[str], dict]],
+                 edges: Iterable[tuple[str, str, str]]):
+        """``nodes`` are ``(key, labels, properties)``; ``edges`` are ``(source_key, type, target_key)``."""
+        self.ids: list[Optional[str]] = []
+        self.labels: list[list[str]] = []
+        self.props: list[dict] = []
+        self.index: dict[str, int] = {}
+        keys: dict[str, int] = {}
+        for key, labels, props in nodes:
+            node = len(self.props)
+            keys[key] = node
+            primary_id = _primary_id(props)
+            self.ids.append(primary_id)
+            self.labels.append(list(labels))
+            self.props.append(public_properties(props))
+            if primary_id is not None:
+                self.index[primary_id] = node
+
+        by_type: dict[str, list[tuple[int, int]]] = {}
+        for source, rel_type, target in edges:
+            if source in keys and target in keys:
+                by_type.setdefault(rel_type, []).append((keys[source], keys[target]))
+
+        names = [(p.get("name") or "") for p in self.props]
+        self.outgoing: dict[str, CSR] = {}
+        self.incoming: dict[str, CSR] = {}
+        self.edge_count = 0
+        for rel_type, pairs in by_type.items():
+            pairs = sorted(set(pairs))
+            self.edge_count += len(pairs)
+            self.outgoing[rel_type] = CSR(len(self.props), sorted(pairs, key=lambda p: (p[0], names[p[1]])))
+            reverse = [(t, s) for s, t in pairs]
+            self.incoming[rel_type] = CSR(len(self.props), sorted(reverse, key=lambda p: (p[0], names[p[1]])))
+
+        self.built_at = time.time()
+
+    @classmethod
+    def load(cls, tx) -> "GraphSnapshot":
+        """Read every knowledge-base node and the edges between them in one transaction."""
+        nodes = [(r["element_id"], r["labels"], r["props"]) for r in tx.run(NODES_QUERY)]
+        edges = [(r["source"], r["type"], r["target"]) for r in tx.run(EDGES_QUERY)]
+        return cls(nodes, edges)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.props)
+
+    @property
+    def rel_types(self) -> list[str]:
+        return sorted(self.outgoing)
+
+    def _adjacency(self, direction: str) -> list[tuple[str, dict[str, CSR]]]:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}")
+        sides = []
+        if direction in ("out", "both"):
+            sides.append(("out", self.outgoing))
+        if direction in ("in", "both"):
+            sides.append(("in", self.incoming))
+        return sides
+
+    def node_dict(self, node: int) -> dict:
+        return {**self.props[node], "_labels": self.labels[node]}
+
+    def iter_neighbours(self, node: int, direction: str = "out",
+                        rel_types: Optional[Iterable[str]] = None) -> Iterator[tuple[str, str, int]]:
+        """Yield ``(side, rel_type, neighbour)`` for ``node``, side being "out" or "in"."""
+        for side, adjacency in self._adjacency(direction):
+            for rel_type in (rel_types if rel_types is not None else sorted(adjacency)):
+                csr = adjacency.get(rel_type)
+                if csr is not None:
+                    for neighbour in csr.neighbours(node):
+                        yield side, rel_type, neighbour
+
+    def get_node(self, node_id: str, limit: int) -> Optional[dict]:
+        """Node detail in the shape of ``GET /graph/nodes/{id}``, neighbours capped per type."""
+        node = self.index.get(node_id)
+        if node is None:
+            return None
+        relationships = {"outgoing": [], "incoming": []}
+        counts = {"outgoing": {}, "incoming": {}}
+        for side, key, end in (("out", "outgoing", "target"), ("in", "incoming", "source")):
+            adjacency = self.outgoing if side == "out" else self.incoming
+            for rel_type in sorted(adjacency):
+                csr = adjacency[rel_type]
+                degree = csr.degree(node)
+                if not degree:
+                    continue
+                counts[key][rel_type] = degree
+                for neighbour in csr.neighbours(node)[:limit]:
+                    relationships[key].append({
+                        "type": rel_type,
+                        end: self.props[neighbour],
+                        f"{end}_labels": self.labels[neighbour],
+                    })
+        return {
+            "node": self.node_dict(node),
+            "relationships": relationships,
+            "relationship_counts": counts,
+            "neighbour_limit": limit,
+        }
+
+    def traverse(self, node_id: str, rel_types: Optional[list[str]] = None, direction: str = "out",
+                 max_depth: int = 3, limit: int = 1000) -> Optional[list[tuple[int, int]]]:
+        """Breadth-first traversal from ``node_id``; returns ``(node, depth)`` pairs, start excluded.
+
+        Each node is visited once, at its shortest depth, so multi-parent
+        hierarchies such as CWE do not blow up. Returns None if the start
+        node is unknown.
+        """
+        start = self.index.get(node_id)
+        if start is None:
+            return None
+        seen = {start}
+        found = []
+        frontier = deque([(start, 0)])
+        while frontier and len(found) < limit:
+            node, depth = frontier.popleft()
+            if depth == max_depth:
+                continue
+            for _, _, neighbour in self.iter_neighbours(node, direction, rel_types):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    found.append((neighbour, depth + 1))
+                    frontier.append((neighbour, depth + 1))
+                    if len(found) >= limit:
+                        break
+        return found
+
+
+_snapshot: Optional[GraphSnapshot] = None
+_build_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[GraphSnapshot]:
+    """The current snapshot, or None if none has been built yet."""
+    return _snapshot
+
+
+def _build_snapshot(driver) -> GraphSnapshot:
+    """Load a snapshot from Neo4j and swap it in; the caller holds ``_build_lock``."""
+    global _snapshot
+    start = time.perf_counter()
+    with driver.session() as session:
+        snapshot = session.execute_read(GraphSnapshot.load)
+    _snapshot = snapshot
+    logger.info(
+        "Graph snapshot: %d nodes, %d edges in %.2fs",
+        snapshot.node_count, snapshot.edge_count, time.perf_counter() - start,
+    )
+    return snapshot
+
+
+def rebuild_snapshot(driver) -> GraphSnapshot:
+    """Load a fresh snapshot from Neo4j and swap it in; readers keep the old one until then."""
+    with _build_lock:
+        return _build_snapshot(driver)
+
+
+def refresh_snapshot(driver) -> Optional[GraphSnapshot]:
+    """Rebuild the snapshot, logging instead of raising if Neo4j cannot be read."""
+    try:
+        return rebuild_snapshot(driver)
+    except Exception as e:
+        logger.warning("Graph snapshot not rebuilt: %s", e)
+        return None
+
+
+def ensure_snapshot(driver) -> GraphSnapshot:
+    """Return the current snapshot, building it first if there is none."""
+    snapshot = _snapshot
+    if snapshot is None:
+        with _build_lock:
+            # Concurrent cold-start callers wait here for the first build
+            snapshot = _snapshot
+            if snapshot is None:
+                snapshot = _build_snapshot(driver)
+    return snapshot
+
+
+def clear_snapshot() -> None:
+    """Drop the current snapshot; reads fall back to Neo4j until the next rebuild."""
+    global _snapshot
+    _snapshot = None
@@ -2,14 +2,16 @@
 Schema validation module for Threat Oracle.
 
 This module provides functions to validate objects against JSON schemas.
+Each schema is checked and compiled into a validator once, on first use,
+and that validator is reused for every object validated afterwards.
 """
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import jsonschema
-from jsonschema import ValidationError
+from jsonschema.protocols import Validator
 
 # Directory containing schema files
 SCHEMA_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,6 +19,9 @@ SCHEMA_DIR = os.path.dirname(os.path.abspath(__file__))
 # Cache for loaded schemas
 _schema_cache: Dict[str, Dict[str, Any]] = {}
 
+# Cache for compiled validators, keyed by (schema name, partial)
+_validator_cache: Dict[Tuple[str, bool], Validator] = {}
+
 
 def load_schema(schema_name: str) -> Dict[str, Any]:
     """
@@ -44,6 +49,44 @@ def load_schema(schema_name: str) -> Dict[str, Any]:
     return schema
 
 
+def get_validator(schema_name: str, partial: bool = False) -> Validator:
+    """
+    Get the compiled validator for a schema, building it on first use.
+
+    Args:
+        schema_name: Name of the schema file without extension
+        partial: Compile the schema without its required properties, for
+            validating patches
+
+    Returns:
+        A jsonschema validator for the schema
+
+    Raises:
+        FileNotFoundError: If the schema file does not exist
+        json.JSONDecodeError: If the schema file contains invalid JSON
+        jsonschema.SchemaError: If the schema itself is invalid
+    """
+    key = (schema_name, partial)
+    if key in _validator_cache:
+        return _validator_cache[key]
+
+    schema = load_schema(schema_name)
+    if partial:
+        schema = {**schema, "required": []}
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+
+    _validator_cache[key] = validator
+    return validator
+
+
+def _error_messages(validator: Validator, obj: Any) -> List[str]:
+    """Messages of every error in ``obj``, ordered by the path of the failing property."""
+    errors = sorted(validator.iter_errors(obj), key=lambda e: [str(p) for p in e.absolute_path])
+    return [e.message for e in errors]
+
+
 def validate(obj: Dict[str, Any], schema_name: str) -> List[str]:
     """
     Validate an object against a schema.
@@ -52,21 +95,71 @@ def validate(obj: Dict[str, Any], schema_name: str) -> List[str]:
         obj: The object to validate
         schema_name: Name of the schema file without extension
 
+    Returns:
+        A list of all validation error messages, empty if validation succeeds
+    """
+    try:
+        return _error_messages(get_validator(schema_name), obj)
+    except FileNotFoundError:
+        return [f"Schema '{schema_name}' not found"]
+    except json.JSONDecodeError:
+        return [f"Schema '{schema_name}' contains invalid JSON"]
+
+
+def validate_many(objs: Iterable[Dict[str, Any]], schema_name: str) -> List[List[str]]:
+    """
+    Validate many objects against the same schema.
+
+    Args:
+        objs: The objects to validate
+        schema_name: Name of the schema file without extension
+
+    Returns:
+        One list of validation error messages per object, in order; a list
+        is empty if its object is valid
+    """
+    objs = list(objs)
+    try:
+        validator = get_validator(schema_name)
+    except FileNotFoundError:
+        return [[f"Schema '{schema_name}' not found"] for _ in objs]
+    except json.JSONDecodeError:
+        return [[f"Schema '{schema_name}' contains invalid JSON"] for _ in objs]
+    return [_error_messages(validator, obj) for obj in objs]
+
+
+def validate_partial(obj: Dict[str, Any], schema_name: str) -> List[str]:
+    """
+    Validate a partial object, such as a patch, against a schema.
+
+    Only the properties present are checked: required properties may be
+    missing, and a property set to None (meaning "remove it") is accepted
+    unless the schema requires it. Properties the schema does not define
+    are rejected.
+
+    Args:
+        obj: The partial object to validate
+        schema_name: Name of the schema file without extension
+
     Returns:
         A list of validation error messages, empty if validation succeeds
     """
     try:
         schema = load_schema(schema_name)
-        jsonschema.validate(instance=obj, schema=schema)
-        return []
-    except ValidationError as e:
-        # Return a list of validation error messages
-        return [e.message]
+        validator = get_validator(schema_name, partial=True)
     except FileNotFoundError:
         return [f"Schema '{schema_name}' not found"]
     except json.JSONDecodeError:
         return [f"Schema '{schema_name}' contains invalid JSON"]
 
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    errors = [f"Unknown property '{key}'" for key in obj if key not in properties]
+    errors += [f"'{key}' is required and cannot be removed" for key, value in obj.items()
+               if value is None and key in required]
+    present = {key: value for key, value in obj.items() if key in properties and value is not None}
+    return errors + _error_messages(validator, present)
+
 
 def is_valid(obj: Dict[str, Any], schema_name: str) -> bool:
     """
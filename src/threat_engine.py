@@ -0,0 +1,280 @@
+"""Rule-based threat enumeration for threat models.
+
+Matches the elements of a ThreatModel to candidate CWE weaknesses. Every
+element is reduced to a set of *features*, such as ``("asset", "type",
+"database")``, ``("asset", "technology", "php")`` or ``("flow",
+"crosses_boundary", True)``, and each feature is looked up in ``RULES``, a
+dict from feature to the weaknesses it implies. Matching is therefore one
+dict lookup per feature, whatever the size of the rule table, and a model
+with hundreds of assets is matched in milliseconds.
+
+The engine is pure Python. The API loads the model and the knowledge-graph
+details of the matched CWEs (see ``api.routes.models.enumerate_threats``)
+and calls ``match_threats`` and ``attach_knowledge`` in between.
+"""
+import re
+from typing import Any, Iterable, Optional
+
+
+# (cwe_id, reason) pairs per feature; reasons are shown to the analyst
+Rule = tuple[str, str]
+
+_SQL = (("CWE-89", "SQL injection"),)
+_NOSQL = (("CWE-943", "Query injection in a NoSQL data store"),)
+_CLEARTEXT = (("CWE-319", "Cleartext transmission of sensitive data"),)
+_CONTAINER = (
+    ("CWE-250", "Execution with unnecessary privileges"),
+    ("CWE-1104", "Unmaintained third-party components in the image"),
+)
+
+RULES: dict[tuple[str, str, Any], tuple[Rule, ...]] = {
+    # Technical asset types (technical_asset.json, plus "process" from the API default)
+    ("asset", "type", "database"): (
+        *_SQL,
+        ("CWE-284", "Improper access control on stored data"),
+        ("CWE-311", "Missing encryption of sensitive data at rest"),
+    ),
+    ("asset", "type", "api"): (
+        ("CWE-20", "Improper input validation of API requests"),
+        ("CWE-285", "Improper authorization of API operations"),
+        ("CWE-770", "Resource allocation without limits (no rate limiting)"),
+    ),
+    ("asset", "type", "application"): (
+        ("CWE-79", "Cross-site scripting"),
+        ("CWE-352", "Cross-site request forgery"),
+        ("CWE-287", "Improper authentication"),
+    ),
+    ("asset", "type", "service"): (
+        ("CWE-306", "Missing authentication for a critical function"),
+        ("CWE-400", "Uncontrolled resource consumption"),
+    ),
+    ("asset", "type", "server"): (
+        ("CWE-250", "Execution with unnecessary privileges"),
+        ("CWE-1188", "Insecure default configuration"),
+    ),
+    ("asset", "type", "container"): (
+        *_CONTAINER,
+        ("CWE-269", "Improper privilege management"),
+    ),
+    ("asset", "type", "network_device"): (
+        ("CWE-798", "Hard-coded credentials"),
+        ("CWE-1188", "Insecure default configuration"),
+    ),
+    ("asset", "type", "process"): (
+        ("CWE-20", "Improper input validation"),
+    ),
+
+    # Technology stack tokens
+    **{("asset", "technology", t): _SQL for t in (
+        "sql", "mysql", "postgres", "postgresql", "mssql", "mariadb", "oracle", "sqlite",
+    )},
+    **{("asset", "technology", t): _NOSQL for t in ("mongodb", "nosql", "couchdb", "redis")},
+    ("asset", "technology", "php"): (
+        ("CWE-98", "PHP remote file inclusion"),
+        ("CWE-434", "Unrestricted upload of dangerous file types"),
+    ),
+    **{("asset", "technology", t): (
+        ("CWE-502", "Deserialization of untrusted data"),
+        ("CWE-611", "XML external entity reference"),
+    ) for t in ("java", "spring", "struts")},
+    **{("asset", "technology", t): (
+        ("CWE-611", "XML external entity reference"),
+    ) for t in ("xml", "soap")},
+    ("asset", "technology", "python"): (
+        ("CWE-502", "Deserialization of untrusted data (pickle)"),
+    ),
+    **{("asset", "technology", t): (
+        ("CWE-1336", "Server-side template injection"),
+    ) for t in ("django", "flask", "jinja", "jinja2")},
+    **{("asset", "technology", t): (
+        ("CWE-79", "Cross-site scripting"),
+    ) for t in ("javascript", "react", "angular", "vue", "jquery")},
+    **{("asset", "technology", t): (
+        ("CWE-1321", "Prototype pollution"),
+    ) for t in ("node", "nodejs", "express")},
+    **{("asset", "technology", t): (
+        ("CWE-90", "LDAP injection"),
+    ) for t in ("ldap", "activedirectory")},
+    ("asset", "technology", "graphql"): (
+        ("CWE-770", "Unbounded query complexity"),
+    ),
+    **{("asset", "technology", t): _CONTAINER for t in ("docker", "kubernetes", "k8s")},
+    **{("asset", "technology", t): (
+        ("CWE-444", "HTTP request smuggling"),
+    ) for t in ("nginx", "apache", "iis", "haproxy")},
+    **{("asset", "technology", t): (
+        ("CWE-787", "Out-of-bounds write"),
+        ("CWE-120", "Classic buffer overflow"),
+    ) for t in ("c", "c++", "cpp")},
+    ("asset", "technology", "c#"): (
+        ("CWE-502", "Deserialization of untrusted data (BinaryFormatter)"),
+    ),
+    **{("asset", "technology", t): (
+        ("CWE-347", "Improper verification of token signatures"),
+    ) for t in ("jwt", "oauth", "oidc")},
+    **{("asset", "technology", t): (
+        ("CWE-732", "Incorrect permissions on storage buckets"),
+    ) for t in ("s3", "blob", "gcs")},
+
+    # Data flows
+    **{("flow", "protocol", p): _CLEARTEXT for p in ("http", "ftp", "smtp", "tcp", "udp")},
+    ("flow", "protocol", "sql"): _SQL,
+    ("flow", "encrypted", False): _CLEARTEXT,
+    ("flow", "authentication", "none"): (
+        ("CWE-306", "Missing authentication across the flow"),
+    ),
+    ("flow", "authentication", "basic"): (
+        ("CWE-522", "Insufficiently protected credentials"),
+    ),
+    ("flow", "crosses_boundary", True): (
+        ("CWE-20", "Improper input validation at a trust boundary"),
+        ("CWE-287", "Improper authentication at a trust boundary"),
+    ),
+    ("flow", "boundary_level", "public"): (
+        ("CWE-400", "Uncontrolled resource consumption from public traffic"),
+        ("CWE-918", "Server-side request forgery via public input"),
+    ),
+
+    # Data assets
+    ("data_asset", "type", "pii"): (
+        ("CWE-359", "Exposure of private personal information"),
+    ),
+    ("data_asset", "type", "phi"): (
+        ("CWE-359", "Exposure of private health information"),
+    ),
+    ("data_asset", "type", "pfi"): (
+        ("CWE-359", "Exposure of private financial information"),
+    ),
+    ("data_asset", "type", "authentication_data"): (
+        ("CWE-256", "Plaintext storage of credentials"),
+        ("CWE-522", "Insufficiently protected credentials"),
+    ),
+    **{("data_asset", "classification", c): (
+        ("CWE-311", "Missing encryption of sensitive data"),
+    ) for c in ("confidential", "restricted", "secret", "top_secret")},
+}
+
+CRITICALITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+DEFAULT_CRITICALITY = "medium"
+# Data assets have no criticality; their classification stands in for it
+CLASSIFICATION_CRITICALITY = {
+    "public": "low",
+    "internal": "medium",
+    "confidential": "high",
+    "restricted": "critical",
+    "secret": "critical",
+    "top_secret": "critical",
+}
+
+# "#" and "+" are kept so "C#" and "C++" do not both collapse to "c"
+_TOKEN = re.compile(r"[a-z0-9#+]+")
+
+
+def _tokens(values: Optional[Iterable[str]]) -> set[str]:
+    """Lower-case word tokens of technology names, e.g. "PostgreSQL 15" → {postgresql, 15}, "C++" → {c++}."""
+    tokens = set()
+    for value in values or ():
+        tokens.update(_TOKEN.findall(str(value).lower()))
+    return tokens
+
+
+def asset_features(asset: dict) -> set[tuple]:
+    features = {("asset", "type", asset.get("type"))}
+    features.update(("asset", "technology", t) for t in _tokens(asset.get("technology_stack")))
+    return features
+
+
+def flow_features(flow: dict, boundaries: dict[str, dict]) -> set[tuple]:
+    features = {
+        ("flow", "protocol", flow.get("protocol")),
+        ("flow", "authentication", flow.get("authentication_method")),
+    }
+    if flow.get("is_encrypted") is False:
+        features.add(("flow", "encrypted", False))
+    boundary = boundaries.get(flow.get("trust_boundary_id"))
+    if flow.get("crosses_trust_boundary") or boundary is not None:
+        features.add(("flow", "crosses_boundary", True))
+    if boundary is not None:
+        features.add(("flow", "boundary_level", boundary.get("security_level")))
+    return features
+
+
+def data_asset_features(data_asset: dict) -> set[tuple]:
+    return {
+        ("data_asset", "type", data_asset.get("type")),
+        ("data_asset", "classification", data_asset.get("classification")),
+    }
+
+
+def _criticality(asset: Optional[dict]) -> int:
+    level = (asset or {}).get("criticality") or DEFAULT_CRITICALITY
+    return CRITICALITY_RANK.get(level, CRITICALITY_RANK[DEFAULT_CRITICALITY])
+
+
+def _data_criticality(data_asset: dict) -> int:
+    return _criticality({"criticality": CLASSIFICATION_CRITICALITY.get(data_asset.get("classification"))})
+
+
+def match_threats(technical_assets: list[dict], data_flows: list[dict],
+                  trust_boundaries: list[dict], data_assets: list[dict]) -> list[dict]:
+    """Candidate weaknesses for every element of a model, highest priority first.
+
+    One threat is returned per (element, CWE) with every reason that
+    matched. ``priority`` is the criticality rank (1–4) of the asset, or of
+    the more critical endpoint of a flow; flows crossing a trust boundary
+    gain one level. Data assets are ranked by their classification.
+    """
+    assets = {a.get("asset_id") or a.get("id"): a for a in technical_assets}
+    boundaries = {b.get("boundary_id") or b.get("id"): b for b in trust_boundaries}
+
+    elements = []
+    for asset_id, asset in assets.items():
+        elements.append(("technical_asset", asset_id, asset, asset_features(asset), _criticality(asset)))
+    for flow in data_flows:
+        source = assets.get(flow.get("source_id") or flow.get("source"))
+        target = assets.get(flow.get("target_id") or flow.get("target"))
+        features = flow_features(flow, boundaries)
+        priority = max(_criticality(source), _criticality(target))
+        if ("flow", "crosses_boundary", True) in features:
+            priority = min(priority + 1, max(CRITICALITY_RANK.values()))
+        elements.append(("data_flow", flow.get("flow_id") or flow.get("id"), flow, features, priority))
+    for data_asset in data_assets:
+        elements.append((
+            "data_asset", data_asset.get("data_asset_id") or data_asset.get("id"),
+            data_asset, data_asset_features(data_asset), _data_criticality(data_asset),
+        ))
+
+    threats = []
+    for element_type, element_id, element, features, priority in elements:
+        by_cwe: dict[str, list[str]] = {}
+        for feature in features:
+            for cwe_id, reason in RULES.get(feature, ()):
+                reasons = by_cwe.setdefault(cwe_id, [])
+                if reason not in reasons:
+                    reasons.append(reason)
+        for cwe_id, reasons in by_cwe.items():
+            threats.append({
+                "element_type": element_type,
+                "element_id": element_id,
+                "element_name": element.get("name"),
+                "cwe_id": cwe_id,
+                "reasons": sorted(reasons),
+                "priority": priority,
+            })
+
+    threats.sort(key=lambda t: (-t["priority"], t["element_type"], str(t["element_id"]), t["cwe_id"]))
+    return threats
+
+
+def attach_knowledge(threats: list[dict], knowledge: dict[str, dict]) -> list[dict]:
+    """Add CWE names, CAPEC patterns and ATT&CK techniques from ``knowledge`` (keyed by CWE ID).
+
+    CWEs missing from the knowledge graph keep empty lists, so enumeration
+    still works before the catalogs are imported.
+    """
+    for threat in threats:
+        details = knowledge.get(threat["cwe_id"], {})
+        threat["cwe_name"] = details.get("name")
+        threat["capec"] = details.get("capec", [])
+        threat["techniques"] = details.get("techniques", [])
+    return threats
@@ -0,0 +1,186 @@
+"""Tests for the graph read caches and their invalidation."""
+from typing import Any, Dict
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from neo4j.time import DateTime
+from pydantic import BaseModel
+
+from api.cache import (
+    LRUCache,
+    TTLCache,
+    cached_response,
+    graph_cache,
+    graph_generation,
+    invalidate_graph_caches,
+    invalidate_model_caches,
+)
+
+
+def test_ttl_cache_expires_entries():
+    now = [0.0]
+    cache = TTLCache(ttl=10, clock=lambda: now[0])
+
+    cache.set("stats", {"total_nodes": 1})
+    assert cache.get("stats") == {"total_nodes": 1}
+
+    now[0] = 10.0
+    assert cache.get("stats") is None
+
+
+def test_ttl_cache_zero_ttl_disables_caching():
+    cache = TTLCache(ttl=0)
+    cache.set("stats", 1)
+    assert cache.get("stats") is None
+
+
+def test_model_mutation_invalidates(client, mock_neo4j_session):
+    """Any non-GET request on the models router clears cached graph reads."""
+    graph_cache.set("stats", {"total_nodes": 1})
+    client.get("/api/v1/models")
+    assert graph_cache.get("stats") is not None
+
+    client.delete("/api/v1/models/model-abc123")
+    assert graph_cache.get("stats") is None
+
+
+def test_model_write_keeps_knowledge_reads_cached(client, mock_neo4j_session):
+    """Model writes only evict reads that can include threat-model nodes."""
+    mock_neo4j_session.run.return_value = []
+    client.get("/api/v1/graph/nodes?label=CWE")
+    client.get("/api/v1/graph/nodes")
+    generation = graph_generation.value
+
+    invalidate_model_caches()
+    calls = mock_neo4j_session.run.call_count
+    client.get("/api/v1/graph/nodes?label=CWE")
+    assert mock_neo4j_session.run.call_count == calls
+    client.get("/api/v1/graph/nodes")
+    assert mock_neo4j_session.run.call_count == calls + 1
+    assert graph_generation.value == generation
+
+
+def test_import_job_invalidates(client, job_manager):
+    """Completing an import job clears cached graph reads."""
+    graph_cache.set("stats", {"total_nodes": 1})
+    with (
+        patch("api.routes.imports.os.path.exists", return_value=True),
+        patch("importers.cwe_importer.run_cwe_import", return_value={"status": "completed"}),
+    ):
+        client.post("/api/v1/import/trigger/cwe")
+        job_manager.shutdown(wait=True)
+
+    assert graph_cache.get("stats") is None
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_graph_reads_are_cached_with_etag(client, mock_neo4j_session):
+    """Repeated knowledge-graph reads are served from the response cache."""
+    mock_neo4j_session.run.return_value = [
+        {"n": {"name": "SQL Injection"}, "labels": ["CWE"], "score": 1.5},
+    ]
+
+    first = client.get("/api/v1/graph/search?q=injection")
+    second = client.get("/api/v1/graph/search?q=injection")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["results"][0]["name"] == "SQL Injection"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.headers["ETag"].startswith('"')
+    assert mock_neo4j_session.run.call_count == 1
+
+    client.get("/api/v1/graph/search?q=injection&limit=5")
+    assert mock_neo4j_session.run.call_count == 2
+
+
+def test_if_none_match_returns_304(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = []
+    etag = client.get("/api/v1/graph/nodes").headers["ETag"]
+
+    response = client.get("/api/v1/graph/nodes", headers={"If-None-Match": f'W/"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert mock_neo4j_session.run.call_count == 1
+
+
+def test_write_bumps_generation(client, mock_neo4j_session):
+    """After an import the next read goes back to Neo4j."""
+    mock_neo4j_session.run.return_value = []
+    etag = client.get("/api/v1/graph/nodes").headers["ETag"]
+    generation = graph_generation.value
+
+    invalidate_graph_caches()
+    assert graph_generation.value == generation + 1
+
+    mock_neo4j_session.run.return_value = [
+        {"n": {"name": "New"}, "labels": ["CWE"], "element_id": "4:x:1"},
+    ]
+    response = client.get("/api/v1/graph/nodes", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert mock_neo4j_session.run.call_count == 2
+
+
+def test_errors_are_not_cached(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+    assert client.get("/api/v1/graph/nodes/CWE-1").status_code == 404
+    assert client.get("/api/v1/graph/nodes/CWE-1").status_code == 404
+    assert mock_neo4j_session.run.call_count == 2
+
+
+class _Body(BaseModel):
+    name: str
+    count: int
+    tags: Dict[str, Any] = {}
+
+
+def _cached_app(compute):
+    app = FastAPI()
+
+    @app.get("/thing", response_model=_Body)
+    async def thing(request: Request):
+        return await cached_response(request, compute)
+
+    return TestClient(app)
+
+
+def test_cached_body_goes_through_response_model():
+    """Cached bodies are validated and filtered like uncached ones."""
+    async def compute():
+        return {"name": "x", "count": "3", "internal": True}
+
+    assert _cached_app(compute).get("/thing").json() == {"name": "x", "count": 3, "tags": {}}
+
+
+def test_cached_body_is_not_stringified():
+    async def compute():
+        return {"name": "x", "count": 1, "tags": {"value": object()}}
+
+    with pytest.raises(ValueError):
+        _cached_app(compute).get("/thing")
+
+
+def test_node_listing_serialises_neo4j_datetimes(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = [{
+        "n": {"name": "Shop", "created": DateTime(2026, 1, 2, 3, 4, 5)},
+        "labels": ["ThreatModel"], "element_id": "4:x:1",
+    }]
+
+    node = client.get("/api/v1/graph/nodes").json()["nodes"][0]
+
+    assert node["created"] == str(DateTime(2026, 1, 2, 3, 4, 5))
@@ -0,0 +1,34 @@
+"""Tests for the Neo4j session dependencies."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from neo4j import READ_ACCESS, WRITE_ACCESS
+
+from api.dependencies import get_async_read_session, get_async_write_session
+
+
+def _open_and_close(dependency):
+    driver = MagicMock()
+    driver.session.return_value.close = AsyncMock()
+
+    async def use():
+        generator = dependency()
+        session = await generator.__anext__()
+        await generator.aclose()
+        return session
+
+    with patch("api.dependencies.get_async_driver", return_value=driver):
+        session = asyncio.run(use())
+    return driver, session
+
+
+def test_read_session_uses_read_access():
+    driver, session = _open_and_close(get_async_read_session)
+    driver.session.assert_called_once_with(default_access_mode=READ_ACCESS)
+    session.close.assert_awaited_once()
+
+
+def test_write_session_uses_write_access():
+    driver, session = _open_and_close(get_async_write_session)
+    driver.session.assert_called_once_with(default_access_mode=WRITE_ACCESS)
+    session.close.assert_awaited_once()
@@ -3,14 +3,11 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
-from api.main import create_app
-from api.dependencies import get_neo4j_session
-
-
-def make_mock_session():
-    """Create a mock Neo4j session with chainable run() results."""
-    session = MagicMock()
-    return session
+from api.cache import invalidate_graph_caches
+from api.pagination import encode_cursor
+from api.routes.graph import route_node_id
+from src import graph_snapshot
+from src.graph_snapshot import GraphSnapshot
 
 
 def make_mock_record(props, labels=None):
@@ -32,37 +29,26 @@ def make_mock_record(props, labels=None):
 
 
 @pytest.fixture
-def client():
+def client(app, mock_neo4j_session):
     """Create a test client with mocked Neo4j session."""
-    app = create_app()
-
-    mock_session = make_mock_session()
-
-    def override_session():
-        yield mock_session
-
-    app.dependency_overrides[get_neo4j_session] = override_session
-    return TestClient(app), mock_session
+    return TestClient(app), mock_neo4j_session
 
 
 def test_graph_stats(client):
     """GET /api/v1/graph/stats returns node and relationship counts."""
     test_client, mock_session = client
 
-    # Call sequence: labels query, then count per label, then total rels, then rel types, then count per type
+    # Call sequence: labels + relationship types, then every count in one UNION query
     mock_session.run.side_effect = [
-        # 1: CALL db.labels() — iterable of records
-        [{"label": "CWE"}, {"label": "Technique"}],
-        # 2: MATCH (n:`CWE`) RETURN count(n)
-        MagicMock(single=MagicMock(return_value={"count": 969})),
-        # 3: MATCH (n:`Technique`) RETURN count(n)
-        MagicMock(single=MagicMock(return_value={"count": 800})),
-        # 4: MATCH ()-[r]->() RETURN count(r) — total relationships
-        MagicMock(single=MagicMock(return_value={"count": 5000})),
-        # 5: CALL db.relationshipTypes()
-        [{"relationshipType": "CHILD_OF"}],
-        # 6: MATCH ()-[r:`CHILD_OF`]->() RETURN count(r)
-        MagicMock(single=MagicMock(return_value={"count": 1443})),
+        MagicMock(single=MagicMock(return_value={
+            "labels": ["CWE", "Technique"], "rel_types": ["CHILD_OF"],
+        })),
+        [
+            {"kind": "total", "name": "", "count": 5000},
+            {"kind": "node", "name": "CWE", "count": 969},
+            {"kind": "node", "name": "Technique", "count": 800},
+            {"kind": "rel", "name": "CHILD_OF", "count": 1443},
+        ],
     ]
 
     response = test_client.get("/api/v1/graph/stats")
@@ -70,8 +56,34 @@ def test_graph_stats(client):
     data = response.json()
     assert "node_counts" in data
     assert data["node_counts"]["CWE"] == 969
+    assert data["total_nodes"] == 1769
+    assert data["relationship_counts"] == {"CHILD_OF": 1443}
     assert data["total_relationships"] == 5000
 
+    count_query = mock_session.run.call_args_list[1].args[0]
+    assert count_query.count("UNION ALL") == 3
+    assert "MATCH (n:`CWE`) RETURN 'node' AS kind, $labels[0] AS name" in count_query
+
+
+def test_graph_stats_is_cached(client):
+    """Repeated /stats calls are served from the cache until it is invalidated."""
+    test_client, mock_session = client
+
+    def run(query, parameters=None, **params):
+        if "db.labels()" in query:
+            return MagicMock(single=MagicMock(return_value={"labels": ["CWE"], "rel_types": []}))
+        return [{"kind": "total", "name": "", "count": 0}, {"kind": "node", "name": "CWE", "count": 1}]
+
+    mock_session.run.side_effect = run
+
+    assert test_client.get("/api/v1/graph/stats").json()["total_nodes"] == 1
+    assert test_client.get("/api/v1/graph/stats").json()["total_nodes"] == 1
+    assert mock_session.run.call_count == 2
+
+    invalidate_graph_caches()
+    test_client.get("/api/v1/graph/stats")
+    assert mock_session.run.call_count == 4
+
 
 def test_list_nodes_no_filter(client):
     """GET /api/v1/graph/nodes returns nodes."""
@@ -89,6 +101,20 @@ def test_list_nodes_no_filter(client):
     assert data["limit"] == 25
 
 
+def test_list_nodes_hides_deleted_models(client):
+    """Tombstoned models and their elements are left out until the purge finishes."""
+    test_client, mock_session = client
+    mock_session.run.return_value = []
+
+    test_client.get("/api/v1/graph/nodes")
+    query = mock_session.run.call_args.args[0]
+    assert "NOT n:DeletedThreatModel" in query
+    assert "(:DeletedThreatModel)-[:HAS_ASSET|HAS_BOUNDARY|HAS_FLOW|HAS_DATA_ASSET]->(n)" in query
+
+    test_client.get("/api/v1/graph/nodes?label=CWE")
+    assert "DeletedThreatModel" not in mock_session.run.call_args.args[0]
+
+
 def test_list_nodes_with_label_filter(client):
     """GET /api/v1/graph/nodes?label=CWE filters by label."""
     test_client, mock_session = client
@@ -105,6 +131,145 @@ def test_list_nodes_with_label_filter(client):
     assert "CWE" in call_args[0][0]
 
 
+def test_list_nodes_cursor_pagination(client):
+    """A full page returns next_cursor, which seeks past the last row."""
+    test_client, mock_session = client
+
+    rows = [
+        {"n": {"name": f"Node {i}"}, "labels": ["CWE"], "element_id": f"4:x:{i}"}
+        for i in range(3)
+    ]
+    mock_session.run.return_value = rows
+
+    data = test_client.get("/api/v1/graph/nodes?label=CWE&limit=2").json()
+    assert [n["name"] for n in data["nodes"]] == ["Node 0", "Node 1"]
+    assert mock_session.run.call_args.args[1]["limit"] == 3
+    # Nameless nodes would end a cursor walk early, so no page lists them
+    assert "n.name IS NOT NULL" in mock_session.run.call_args.args[0]
+    cursor = data["next_cursor"]
+    assert cursor
+
+    mock_session.run.return_value = rows[2:]
+    data = test_client.get(f"/api/v1/graph/nodes?label=CWE&limit=2&cursor={cursor}").json()
+    assert [n["name"] for n in data["nodes"]] == ["Node 2"]
+    assert data["next_cursor"] is None
+
+    query, params = mock_session.run.call_args.args
+    assert "n.name > $after_name" in query
+    assert "n.name IS NOT NULL" in query
+    assert "SKIP" in query and params["skip"] == 0
+    assert (params["after_name"], params["after_id"]) == ("Node 1", "4:x:1")
+
+
+def test_list_nodes_rejects_bad_cursor(client):
+    test_client, mock_session = client
+
+    assert test_client.get("/api/v1/graph/nodes?cursor=not-a-cursor").status_code == 400
+    assert test_client.get(
+        f"/api/v1/graph/nodes?cursor={encode_cursor('models', ['a', 'b'])}"
+    ).status_code == 400
+    assert test_client.get(
+        f"/api/v1/graph/nodes?skip=5&cursor={encode_cursor('nodes', ['a', 'b'])}"
+    ).status_code == 400
+    mock_session.run.assert_not_called()
+
+
+@pytest.mark.parametrize("node_id, expected", [
+    ("CWE-79", ("CWE", "cwe_id", "CWE-79")),
+    ("capec-66", ("CAPEC", "capec_id", "CAPEC-66")),
+    ("T1059", ("Technique", "attack_id", "T1059")),
+    ("T1059.001", ("Technique", "attack_id", "T1059.001")),
+    ("TA0002", ("Tactic", "attack_id", "TA0002")),
+    ("M1036", ("Mitigation", "attack_id", "M1036")),
+    ("G0007", ("Group", "attack_id", "G0007")),
+    ("S0002", ("Software", "attack_id", "S0002")),
+    ("DS0017", ("DataSource", "attack_id", "DS0017")),
+    ("model-abc", None),
+])
+def test_route_node_id(node_id, expected):
+    assert route_node_id(node_id) == expected
+
+
+def test_get_node_uses_label_index_and_caps_neighbours(client):
+    """GET /api/v1/graph/nodes/{id} matches one label by its ID property."""
+    test_client, mock_session = client
+
+    record = {
+        "n": {"attack_id": "T1059", "name": "Command and Scripting Interpreter"},
+        "labels": ["Technique"],
+        "outgoing": [],
+        "incoming": [
+            {"type": "USES", "count": 412, "nodes": [
+                {"properties": {"attack_id": "G0007"}, "labels": ["Group"]},
+                {"properties": {"attack_id": "G0016"}, "labels": ["Group"]},
+            ]},
+            {"type": "MITIGATES", "count": 1, "nodes": [
+                {"properties": {"attack_id": "M1038"}, "labels": ["Mitigation"]},
+            ]},
+        ],
+    }
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value=record))
+
+    response = test_client.get("/api/v1/graph/nodes/t1059?limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["node"]["_labels"] == ["Technique"]
+    assert [r["source"]["attack_id"] for r in data["relationships"]["incoming"]] == ["G0007", "G0016", "M1038"]
+    assert data["relationships"]["incoming"][0]["type"] == "USES"
+    assert data["relationship_counts"] == {"outgoing": {}, "incoming": {"USES": 412, "MITIGATES": 1}}
+    assert data["neighbour_limit"] == 2
+
+    query, params = mock_session.run.call_args.args[0], mock_session.run.call_args.kwargs
+    assert "MATCH (n:Technique {attack_id: $id})" in query
+    assert "OPTIONAL MATCH" not in query
+    assert params == {"id": "T1059", "limit": 2}
+
+
+INTERNAL = {
+    "fingerprint": "f00d", "edges_fingerprint": "beef",
+    "mapped_capec": ["CAPEC-66"], "mapped_capec_direct": ["CAPEC-66"],
+    "mapped_techniques": ["T1190"], "mapped_tactics": ["TA0001"],
+    "ancestor_ids": ["CWE-74", "CWE-707"], "descendant_ids": ["CWE-564"],
+}
+
+
+def test_graph_reads_strip_internal_properties(client):
+    """Importer bookkeeping properties are not returned as node data."""
+    test_client, mock_session = client
+
+    node = {"cwe_id": "CWE-89", "name": "SQL Injection", **INTERNAL}
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value={
+        "n": node, "labels": ["CWE"],
+        "outgoing": [{"type": "CHILD_OF", "count": 1, "nodes": [
+            {"properties": {"cwe_id": "CWE-74", **INTERNAL}, "labels": ["CWE"]},
+        ]}],
+        "incoming": [],
+    }))
+    detail = test_client.get("/api/v1/graph/nodes/CWE-89").json()
+    assert detail["node"] == {"cwe_id": "CWE-89", "name": "SQL Injection", "_labels": ["CWE"]}
+    assert detail["relationships"]["outgoing"][0]["target"] == {"cwe_id": "CWE-74"}
+
+    mock_session.run.return_value = [{"n": node, "labels": ["CWE"], "score": 1.0, "element_id": "e1"}]
+    assert set(test_client.get("/api/v1/graph/search?q=sql").json()["results"][0]) == {
+        "cwe_id", "name", "_labels", "_score",
+    }
+    assert set(test_client.get("/api/v1/graph/nodes").json()["nodes"][0]) == {"cwe_id", "name", "_labels"}
+
+
+def test_get_node_not_found(client):
+    test_client, mock_session = client
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+
+    assert test_client.get("/api/v1/graph/nodes/CWE-99999").status_code == 404
+
+
+def test_get_node_unknown_id_format(client):
+    test_client, mock_session = client
+
+    assert test_client.get("/api/v1/graph/nodes/not-an-id").status_code == 404
+    mock_session.run.assert_not_called()
+
+
 def test_search_graph(client):
     """GET /api/v1/graph/search?q=injection searches nodes."""
     test_client, mock_session = client
@@ -119,6 +284,50 @@ def test_search_graph(client):
     assert data["query"] == "injection"
     assert "results" in data
 
+    query, params = mock_session.run.call_args.args[0], mock_session.run.call_args.kwargs
+    assert "db.index.fulltext.queryNodes" in query
+    assert "CONTAINS" not in query
+    assert params["index"] == "knowledge_text"
+    assert params["query"] == "(injection OR injection*)"
+    assert params["labels"] is None
+
+
+def test_search_returns_scores_and_filters_labels(client):
+    """Results carry relevance scores and the label filter is passed to Neo4j."""
+    test_client, mock_session = client
+
+    record = {"n": {"cwe_id": "CWE-89", "name": "SQL Injection"}, "labels": ["CWE"], "score": 3.2}
+    mock_session.run.return_value = [record]
+
+    response = test_client.get("/api/v1/graph/search?q=SQL inj&label=CWE&label=CAPEC")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["labels"] == ["CWE", "CAPEC"]
+    assert data["results"][0]["_score"] == 3.2
+    assert data["results"][0]["_labels"] == ["CWE"]
+
+    params = mock_session.run.call_args.kwargs
+    assert params["query"] == "sql AND (inj OR inj*)"
+    assert params["labels"] == ["CWE", "CAPEC"]
+
+
+def test_search_escapes_lucene_syntax(client):
+    """User input cannot inject Lucene operators."""
+    test_client, mock_session = client
+    mock_session.run.return_value = []
+
+    test_client.get("/api/v1/graph/search?q=C%2B%2B OR title:x")
+    assert mock_session.run.call_args.kwargs["query"] == "c\\+\\+ AND or AND (title\\:x OR title\\:x*)"
+
+
+def test_search_rejects_unknown_label(client):
+    """Only knowledge-base labels can be searched."""
+    test_client, mock_session = client
+
+    response = test_client.get("/api/v1/graph/search?q=injection&label=ThreatModel")
+    assert response.status_code == 422
+    mock_session.run.assert_not_called()
+
 
 def test_search_requires_query(client):
     """GET /api/v1/graph/search without q parameter returns 422."""
@@ -126,3 +335,139 @@ def test_search_requires_query(client):
 
     response = test_client.get("/api/v1/graph/search")
     assert response.status_code == 422
+
+
+# -- Snapshot-backed reads -----------------------------------------------------
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    snapshot = GraphSnapshot(
+        [
+            ("e1", ["CWE"], {"cwe_id": "CWE-74", "name": "Injection"}),
+            ("e2", ["CWE"], {"cwe_id": "CWE-79", "name": "Cross-site Scripting"}),
+            ("e3", ["CWE"], {"cwe_id": "CWE-89", "name": "SQL Injection"}),
+            ("e4", ["CAPEC"], {"capec_id": "CAPEC-66", "name": "SQL Injection"}),
+        ],
+        [("e2", "CHILD_OF", "e1"), ("e3", "CHILD_OF", "e1"), ("e4", "EXPLOITS", "e3")],
+    )
+    monkeypatch.setattr(graph_snapshot, "_snapshot", snapshot)
+    return snapshot
+
+
+def test_get_node_served_from_snapshot(client, snapshot):
+    test_client, mock_session = client
+
+    data = test_client.get("/api/v1/graph/nodes/cwe-74").json()
+    assert data["node"]["_labels"] == ["CWE"]
+    assert [r["source"]["cwe_id"] for r in data["relationships"]["incoming"]] == ["CWE-79", "CWE-89"]
+    assert data["relationship_counts"]["incoming"] == {"CHILD_OF": 2}
+    assert test_client.get("/api/v1/graph/nodes/CWE-1").status_code == 404
+    mock_session.run.assert_not_called()
+
+
+def test_get_neighbours(client, snapshot):
+    test_client, _ = client
+
+    data = test_client.get("/api/v1/graph/nodes/CWE-89/neighbours").json()
+    assert [(n["direction"], n["type"], n["node"].get("cwe_id") or n["node"]["capec_id"])
+            for n in data["neighbours"]] == [("out", "CHILD_OF", "CWE-74"), ("in", "EXPLOITS", "CAPEC-66")]
+    assert data["total"] == 2
+
+    data = test_client.get("/api/v1/graph/nodes/CWE-74/neighbours?direction=in&rel_type=CHILD_OF&limit=1").json()
+    assert data["count"] == 1
+    assert data["total"] == 2
+    assert test_client.get("/api/v1/graph/nodes/CWE-89/neighbours?direction=up").status_code == 422
+
+
+def test_traverse(client, snapshot):
+    test_client, _ = client
+
+    data = test_client.get("/api/v1/graph/nodes/CAPEC-66/traverse?max_depth=2").json()
+    assert [(n["cwe_id"], n["_depth"]) for n in data["nodes"]] == [("CWE-89", 1), ("CWE-74", 2)]
+    assert data["truncated"] is False
+
+    data = test_client.get("/api/v1/graph/nodes/CWE-74/traverse?direction=in&rel_type=CHILD_OF&limit=1").json()
+    assert data["count"] == 1
+    assert data["truncated"] is True
+    assert test_client.get("/api/v1/graph/nodes/T9999/traverse").status_code == 404
+
+
+def test_traverse_builds_snapshot_on_demand(client, mock_neo4j_driver):
+    test_client, _ = client
+    session = mock_neo4j_driver.session.return_value.__enter__.return_value
+    session.execute_read.side_effect = lambda fn: GraphSnapshot([], [])
+
+    assert test_client.get("/api/v1/graph/nodes/CWE-79/traverse").status_code == 404
+    session.execute_read.assert_called_once()
+    assert graph_snapshot.get_snapshot() is not None
+
+
+def test_map_cwes_batch(client):
+    """GET /api/v1/graph/mappings/cwe resolves a batch of CWEs in one query."""
+    test_client, mock_session = client
+    mock_session.run.return_value = [
+        {
+            "cwe_id": "CWE-89", "name": "SQL Injection", "found": True,
+            "capec": [{"capec_id": "CAPEC-66", "name": "SQL Injection", "inherited": False}],
+            "techniques": [{"attack_id": "T1190", "name": "Exploit Public-Facing Application"}],
+            "tactics": [{"attack_id": "TA0001", "name": "Initial Access"}],
+        },
+        {"cwe_id": "CWE-99999", "name": None, "found": False, "capec": [], "techniques": [], "tactics": []},
+    ]
+
+    response = test_client.get("/api/v1/graph/mappings/cwe?cwe_id=cwe-89&cwe_id=99999&cwe_id=CWE-89")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 2
+    assert data["mappings"][0]["techniques"][0]["attack_id"] == "T1190"
+    assert data["mappings"][1]["found"] is False
+
+    mock_session.run.assert_called_once()
+    query, params = mock_session.run.call_args.args[0], mock_session.run.call_args.kwargs
+    assert "mapped_capec" in query
+    assert "CHILD_OF" not in query
+    assert params == {"ids": ["CWE-89", "CWE-99999"]}
+
+
+def test_map_cwes_rejects_bad_ids(client):
+    test_client, mock_session = client
+
+    assert test_client.get("/api/v1/graph/mappings/cwe?cwe_id=T1059").status_code == 422
+    assert test_client.get("/api/v1/graph/mappings/cwe").status_code == 422
+    mock_session.run.assert_not_called()
+
+
+def test_cwe_ancestors_from_closure(client):
+    """Ancestors come from the stored closure, ordered most general first."""
+    test_client, mock_session = client
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value={
+        "indexed": True,
+        "related": [
+            {"cwe_id": "CWE-943", "name": "Data Query Logic", "abstraction": "Class", "numeric_id": 943},
+            {"cwe_id": "CWE-707", "name": "Improper Neutralization", "abstraction": "Pillar", "numeric_id": 707},
+            {"cwe_id": "CWE-74", "name": "Injection", "abstraction": "Class", "numeric_id": 74},
+        ],
+    }))
+
+    data = test_client.get("/api/v1/graph/cwe/89/ancestors?abstraction=Pillar&abstraction=Class").json()
+    assert [n["cwe_id"] for n in data["nodes"]] == ["CWE-707", "CWE-74", "CWE-943"]
+    assert data["count"] == 3
+
+    query, params = mock_session.run.call_args.args[0], mock_session.run.call_args.kwargs
+    assert "w.ancestor_ids" in query
+    assert "CHILD_OF" not in query
+    assert params == {"id": "CWE-89", "abstraction": ["Pillar", "Class"]}
+
+
+def test_cwe_descendants_errors(client):
+    test_client, mock_session = client
+
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+    assert test_client.get("/api/v1/graph/cwe/CWE-99999/descendants").status_code == 404
+
+    mock_session.run.return_value = MagicMock(single=MagicMock(return_value={"indexed": False, "related": []}))
+    assert test_client.get("/api/v1/graph/cwe/CWE-74/descendants").status_code == 409
+    assert "w.descendant_ids" in mock_session.run.call_args.args[0]
+
+    assert test_client.get("/api/v1/graph/cwe/T1059/descendants").status_code == 422
@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
 
 from api.main import create_app
-from api.dependencies import get_neo4j_driver
+from api.dependencies import get_neo4j_driver, get_neo4j_session
 
 
 @pytest.fixture
@@ -34,6 +34,7 @@ def test_db_health_connected():
     data = response.json()
     assert data["status"] == "ok"
     assert data["database"] == "connected"
+    assert isinstance(data["pool"], dict)
 
     app.dependency_overrides.clear()
 
@@ -53,3 +54,32 @@ def test_db_health_disconnected():
     assert data["database"] == "disconnected"
 
     app.dependency_overrides.clear()
+
+
+def test_db_schema():
+    """GET /health/db/schema lists constraints and indexes."""
+    app = create_app()
+    mock_session = MagicMock()
+    mock_session.run.side_effect = [
+        [{"name": "cwe_cwe_id_unique", "type": "UNIQUENESS",
+          "labelsOrTypes": ["CWE"], "properties": ["cwe_id"]}],
+        [{"name": "cwe_cwe_id_unique", "type": "RANGE",
+          "labelsOrTypes": ["CWE"], "properties": ["cwe_id"], "state": "ONLINE"}],
+    ]
+    app.dependency_overrides[get_neo4j_session] = lambda: mock_session
+
+    client = TestClient(app)
+    response = client.get("/health/db/schema")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["constraints"][0]["name"] == "cwe_cwe_id_unique"
+    assert data["indexes"][0]["state"] == "ONLINE"
+
+    app.dependency_overrides.clear()
+
+
+def test_startup_tolerates_missing_database(monkeypatch):
+    """The schema bootstrap must not stop the API from starting without Neo4j."""
+    monkeypatch.delenv("NEO4J_URI", raising=False)
+    with TestClient(create_app()) as client:
+        assert client.get("/health").status_code == 200
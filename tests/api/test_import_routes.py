@@ -1,34 +1,65 @@
-"""Tests for import trigger endpoints."""
+"""Tests for import trigger and job endpoints."""
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
 
+from api.jobs import JobManager
 
-# -- CWE import ---------------------------------------------------------------
+
+def _finish(job_manager):
+    """Wait for all queued jobs to complete."""
+    job_manager.shutdown(wait=True)
 
 
-def test_trigger_cwe_import(client, mock_neo4j_driver):
-    """POST /api/v1/import/trigger/cwe runs CWE import pipeline."""
-    mock_weaknesses = [{"id": "CWE-79"}, {"id": "CWE-89"}]
+# -- CWE import ---------------------------------------------------------------
+
 
+def test_trigger_cwe_import(client, mock_neo4j_driver, job_manager):
+    """POST /api/v1/import/trigger/cwe queues the CWE import pipeline as a job."""
     with (
         patch("api.routes.imports.os.path.exists", return_value=True),
         patch(
-            "importers.cwe_importer.parse_cwe_xml", return_value=mock_weaknesses
-        ) as mock_parse,
-        patch(
-            "importers.cwe_importer.import_cwe_to_neo4j", return_value=(969, 1443)
+            "importers.cwe_importer.run_cwe_import",
+            return_value={
+                "status": "completed",
+                "nodes_imported": 969,
+                "relationships_imported": 1443,
+                "content_hash": "abc",
+            },
         ) as mock_import,
     ):
         response = client.post("/api/v1/import/trigger/cwe")
+        _finish(job_manager)
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["source"] == "cwe"
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["key"] == "cwe"
+
+    data = client.get(f"/api/v1/import/jobs/{job_id}").json()
     assert data["status"] == "completed"
-    assert data["nodes_imported"] == 969
-    assert data["relationships_imported"] == 1443
-    mock_parse.assert_called_once()
-    mock_import.assert_called_once_with(mock_neo4j_driver, mock_weaknesses)
+    assert data["result"]["source"] == "cwe"
+    assert data["result"]["nodes_imported"] == 969
+    assert data["result"]["relationships_imported"] == 1443
+    mock_import.assert_called_once()
+    assert mock_import.call_args.args[0] is mock_neo4j_driver
+    assert mock_import.call_args.kwargs["force"] is False
+
+
+def test_trigger_cwe_import_force(client, job_manager):
+    """POST /api/v1/import/trigger/cwe?force=true bypasses the hash check."""
+    with (
+        patch("api.routes.imports.os.path.exists", return_value=True),
+        patch(
+            "importers.cwe_importer.run_cwe_import",
+            return_value={"status": "completed"},
+        ) as mock_import,
+    ):
+        response = client.post("/api/v1/import/trigger/cwe?force=true")
+        _finish(job_manager)
+
+    assert response.status_code == 202
+    assert mock_import.call_args.kwargs["force"] is True
 
 
 def test_trigger_cwe_import_file_not_found(client):
@@ -43,34 +74,29 @@ def test_trigger_cwe_import_file_not_found(client):
 # -- ATT&CK import ------------------------------------------------------------
 
 
-def test_trigger_attack_import(client, mock_neo4j_driver):
-    """POST /api/v1/import/trigger/attack runs ATT&CK import pipeline."""
-    mock_objects = [{"type": "attack-pattern", "id": "T1059"}]
-    mock_relationships = [{"type": "relationship"}]
-
+def test_trigger_attack_import(client, mock_neo4j_driver, job_manager):
+    """POST /api/v1/import/trigger/attack queues the ATT&CK import pipeline."""
     with (
         patch("api.routes.imports.os.path.exists", return_value=True),
         patch(
-            "importers.attack_importer.parse_attack_stix",
-            return_value=(mock_objects, mock_relationships),
-        ) as mock_parse,
-        patch(
-            "importers.attack_importer.import_attack_to_neo4j",
-            return_value=(2290, 19000),
+            "importers.attack_importer.run_attack_import",
+            return_value={
+                "status": "completed",
+                "nodes_imported": 2290,
+                "relationships_imported": 19000,
+                "nodes_deleted": 3,
+            },
         ) as mock_import,
     ):
         response = client.post("/api/v1/import/trigger/attack")
+        _finish(job_manager)
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["source"] == "attack"
-    assert data["status"] == "completed"
-    assert data["nodes_imported"] == 2290
-    assert data["relationships_imported"] == 19000
-    mock_parse.assert_called_once()
-    mock_import.assert_called_once_with(
-        mock_neo4j_driver, mock_objects, mock_relationships
-    )
+    assert response.status_code == 202
+    data = client.get(f"/api/v1/import/jobs/{response.json()['job_id']}").json()
+    assert data["result"]["source"] == "attack"
+    assert data["result"]["nodes_imported"] == 2290
+    assert data["result"]["nodes_deleted"] == 3
+    assert mock_import.call_args.args[0] is mock_neo4j_driver
 
 
 def test_trigger_attack_import_file_not_found(client):
@@ -85,31 +111,29 @@ def test_trigger_attack_import_file_not_found(client):
 # -- CAPEC import --------------------------------------------------------------
 
 
-def test_trigger_capec_import(client, mock_neo4j_driver):
-    """POST /api/v1/import/trigger/capec runs CAPEC import pipeline."""
-    mock_patterns = [{"id": "CAPEC-1"}, {"id": "CAPEC-2"}]
-
+def test_trigger_capec_import(client, mock_neo4j_driver, job_manager):
+    """POST /api/v1/import/trigger/capec queues the CAPEC import pipeline."""
     with (
         patch("api.routes.imports.os.path.exists", return_value=True),
         patch(
-            "importers.capec_importer.parse_capec_xml", return_value=mock_patterns
-        ) as mock_parse,
-        patch(
-            "importers.capec_importer.import_capec_to_neo4j",
-            return_value=(559, 1200, 800),
+            "importers.capec_importer.run_capec_import",
+            return_value={
+                "status": "completed",
+                "nodes_imported": 559,
+                "cwe_relationships": 1200,
+                "attack_relationships": 800,
+            },
         ) as mock_import,
     ):
         response = client.post("/api/v1/import/trigger/capec")
+        _finish(job_manager)
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["source"] == "capec"
-    assert data["status"] == "completed"
-    assert data["nodes_imported"] == 559
-    assert data["cwe_relationships"] == 1200
-    assert data["attack_relationships"] == 800
-    mock_parse.assert_called_once()
-    mock_import.assert_called_once_with(mock_neo4j_driver, mock_patterns)
+    assert response.status_code == 202
+    data = client.get(f"/api/v1/import/jobs/{response.json()['job_id']}").json()
+    assert data["result"]["source"] == "capec"
+    assert data["result"]["cwe_relationships"] == 1200
+    assert data["result"]["attack_relationships"] == 800
+    assert mock_import.call_args.args[0] is mock_neo4j_driver
 
 
 def test_trigger_capec_import_file_not_found(client):
@@ -121,6 +145,69 @@ def test_trigger_capec_import_file_not_found(client):
     assert "CAPEC XML file not found" in response.json()["detail"]
 
 
+# -- Jobs ----------------------------------------------------------------------
+
+
+def test_trigger_import_conflict(client, job_manager):
+    """A second import of the same source is rejected while the first is active."""
+    release = threading.Event()
+
+    def slow_import(driver, path, force, progress):
+        progress("nodes", 500)
+        release.wait(timeout=5)
+        return {"status": "completed"}
+
+    with (
+        patch("api.routes.imports.os.path.exists", return_value=True),
+        patch("importers.cwe_importer.run_cwe_import", side_effect=slow_import),
+    ):
+        first = client.post("/api/v1/import/trigger/cwe")
+        second = client.post("/api/v1/import/trigger/cwe")
+        release.set()
+        _finish(job_manager)
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert second.json()["detail"]["job_id"] == first.json()["job_id"]
+
+    data = client.get(f"/api/v1/import/jobs/{first.json()['job_id']}").json()
+    assert data["phase"] == "nodes"
+    assert data["batches_done"] == 1
+    assert data["rows_done"] == 500
+
+
+def test_import_job_failure_reported(client, job_manager):
+    """Errors raised by the importer are reported on the job."""
+    with (
+        patch("api.routes.imports.os.path.exists", return_value=True),
+        patch("importers.capec_importer.run_capec_import", side_effect=RuntimeError("boom")),
+    ):
+        response = client.post("/api/v1/import/trigger/capec")
+        _finish(job_manager)
+
+    data = client.get(f"/api/v1/import/jobs/{response.json()['job_id']}").json()
+    assert data["status"] == "failed"
+    assert data["errors"] == ["boom"]
+
+    listing = client.get("/api/v1/import/jobs").json()
+    assert [j["job_id"] for j in listing["jobs"]] == [response.json()["job_id"]]
+
+
+def test_finished_jobs_are_evicted_beyond_retention():
+    manager = JobManager(max_workers=1, retention=2)
+    jobs = [manager.submit("import", source, lambda progress: {}) for source in ("cwe", "attack", "capec")]
+    manager.shutdown(wait=True)
+
+    assert manager.get(jobs[0].job_id) is None
+    assert {j.job_id for j in manager.list()} == {jobs[1].job_id, jobs[2].job_id}
+
+
+def test_get_import_job_not_found(client):
+    """GET /api/v1/import/jobs/{id} returns 404 for unknown jobs."""
+    response = client.get("/api/v1/import/jobs/job-missing")
+    assert response.status_code == 404
+
+
 # -- Invalid source ------------------------------------------------------------
 
 
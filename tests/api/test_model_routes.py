@@ -1,6 +1,8 @@
 """Tests for threat model CRUD endpoints."""
 from unittest.mock import MagicMock, patch
 
+from api.routes.models import backfill_flows_to
+
 
 def _make_mock_record(data):
     """Create a mock Neo4j record with dict-like access."""
@@ -57,6 +59,24 @@ def test_list_models(client, mock_neo4j_session):
     data = response.json()
     assert len(data["models"]) == 2
     assert data["models"][0]["name"] == "Model 1"
+    assert data["next_cursor"] is None
+
+
+def test_list_models_cursor(client, mock_neo4j_session):
+    """GET /api/v1/models pages by (updated, model_id) keyset cursor."""
+    mock_neo4j_session.run.return_value = _make_mock_result([
+        {"m": {"model_id": "model-2", "name": "Model 2", "updated": "2025-01-02T00:00:00Z"}},
+        {"m": {"model_id": "model-1", "name": "Model 1", "updated": "2025-01-01T00:00:00Z"}},
+    ])
+
+    data = client.get("/api/v1/models?limit=1").json()
+    assert [m["model_id"] for m in data["models"]] == ["model-2"]
+    assert data["next_cursor"]
+
+    client.get(f"/api/v1/models?limit=1&cursor={data['next_cursor']}")
+    query, params = mock_neo4j_session.run.call_args.args
+    assert "m.updated < datetime($after_updated)" in query
+    assert (params["after_updated"], params["after_id"]) == ("2025-01-02T00:00:00Z", "model-2")
 
 
 # --- Get model ---
@@ -82,6 +102,21 @@ def test_get_model(client, mock_neo4j_session):
     assert len(data["technical_assets"]) == 1
 
 
+def test_get_model_collects_element_types_independently(client, mock_neo4j_session):
+    """The model load has one subquery per element type instead of a chain of OPTIONAL MATCHes."""
+    mock_neo4j_session.run.return_value = _make_mock_result([
+        {"m": {"model_id": "model-1"}, "technical_assets": [], "trust_boundaries": [],
+         "data_flows": [], "data_assets": []}
+    ])
+
+    data = client.get("/api/v1/models/model-1").json()
+
+    query = mock_neo4j_session.run.call_args.args[0]
+    assert "OPTIONAL MATCH" not in query
+    assert query.count("CALL {") == 4
+    assert data["data_flows"] == []
+
+
 def test_get_model_not_found(client, mock_neo4j_session):
     """GET /api/v1/models/{id} returns 404 for missing model."""
     mock_result = MagicMock()
@@ -118,14 +153,47 @@ def test_update_model_no_valid_fields(client, mock_neo4j_session):
 # --- Delete model ---
 
 
-def test_delete_model(client, mock_neo4j_session):
-    """DELETE /api/v1/models/{id} deletes model and children."""
+def test_delete_model(client, mock_neo4j_session, mock_neo4j_driver, job_manager):
+    """DELETE /api/v1/models/{id} tombstones the model and purges its children in batches."""
     mock_neo4j_session.run.return_value = _make_mock_result([{"deleted": 1}])
+    purge = mock_neo4j_driver.session.return_value.__enter__.return_value
+    batches = iter([1000, 1000, 250])
+    purge.execute_write.side_effect = lambda fn: fn(purge)
+    purge.run.side_effect = lambda query, **params: MagicMock(single=MagicMock(
+        return_value={"deleted": next(batches)} if "LIMIT" in query else None))
 
-    response = client.delete("/api/v1/models/model-1")
+    with patch("api.routes.models.settings.purge_batch_size", 1000):
+        response = client.delete("/api/v1/models/model-1")
+        job_manager.shutdown(wait=True)
 
-    assert response.status_code == 200
-    assert response.json()["status"] == "deleted"
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "deleted"
+    assert "REMOVE m:ThreatModel" in mock_neo4j_session.run.call_args.args[0]
+
+    job = client.get(f"/api/v1/models/jobs/{data['job_id']}").json()
+    assert job["kind"] == "delete-model"
+    assert job["status"] == "completed", job["errors"]
+    assert job["result"] == {"model_id": "model-1", "elements_deleted": 2250}
+    assert (job["batches_done"], job["rows_done"]) == (3, 2250)
+    # Three element batches (the last one short), then the tombstone
+    assert purge.run.call_count == 4
+    assert "DETACH DELETE m" in purge.run.call_args.args[0]
+
+
+def test_backfill_flows_to(mock_neo4j_driver):
+    """The startup backfill MERGEs missing FLOWS_TO and bumps the models' revisions."""
+    session = mock_neo4j_driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda fn: fn(session)
+    session.run.return_value = MagicMock(single=MagicMock(return_value={"linked": 3}))
+
+    assert backfill_flows_to(mock_neo4j_driver) == 3
+    query = session.run.call_args.args[0]
+    assert "MERGE (s)-[f:FLOWS_TO {flow_id: df.flow_id}]->(t)" in query
+    assert "m.revision = coalesce(m.revision, 0) + 1" in query
+
+    session.run.return_value = MagicMock(single=MagicMock(return_value={"linked": 0}))
+    assert backfill_flows_to(mock_neo4j_driver) == 0
 
 
 def test_delete_model_not_found(client, mock_neo4j_session):
@@ -247,3 +315,346 @@ def test_delete_data_asset(client, mock_neo4j_session):
 
     assert response.status_code == 200
     assert response.json()["status"] == "deleted"
+
+
+# --- Transaction routing ---
+
+
+def test_reads_use_read_transactions(client, mock_neo4j_session, mock_async_session):
+    """GET routes run in managed read transactions, mutations in write transactions."""
+    mock_neo4j_session.run.return_value = _make_mock_result([
+        {"m": {"model_id": "model-1", "name": "Model 1"}, "technical_assets": [],
+         "trust_boundaries": [], "data_flows": [], "data_assets": []},
+    ])
+
+    client.get("/api/v1/models/model-1")
+    client.put("/api/v1/models/model-1", json={"name": "Renamed"})
+
+    assert mock_async_session.access_modes == ["READ", "WRITE"]
+
+
+def test_transient_errors_return_503(client, mock_neo4j_session):
+    """Errors that outlast the driver's retries are reported as retryable."""
+    from neo4j.exceptions import TransientError
+
+    mock_neo4j_session.run.side_effect = TransientError("leader switch")
+
+    response = client.get("/api/v1/models/model-1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+# --- Threat enumeration ---
+
+
+def test_enumerate_threats_batches_queries(client, mock_neo4j_session, mock_async_session):
+    """GET /api/v1/models/{id}/threats loads the model and its CWEs in two queries."""
+    model = {
+        "technical_assets": [{"asset_id": "ta-1", "name": "DB", "type": "database", "criticality": "high"}],
+        "trust_boundaries": [],
+        "data_flows": [{"flow_id": "df-1", "source": "ta-1", "target": "ta-1", "protocol": "sql"}],
+        "data_assets": [],
+    }
+    cwe = {"cwe_id": "CWE-89", "name": "SQL Injection", "capec": ["CAPEC-66"],
+           "techniques": [{"attack_id": "T1190", "name": "Exploit Public-Facing Application"}]}
+
+    def run(query, parameters=None, **params):
+        if "HAS_ASSET" in query:
+            return MagicMock(single=MagicMock(return_value=model))
+        return [cwe]
+
+    mock_neo4j_session.run.side_effect = run
+
+    response = client.get("/api/v1/models/model-1/threats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["elements_analysed"] == 2
+    sqli = [t for t in data["threats"] if t["cwe_id"] == "CWE-89"]
+    assert {t["element_id"] for t in sqli} == {"ta-1", "df-1"}
+    assert sqli[0]["techniques"][0]["attack_id"] == "T1190"
+    assert data["by_cwe"]["CWE-89"] == 2
+
+    assert mock_neo4j_session.run.call_count == 2
+    assert mock_async_session.access_modes == ["READ"]
+    assert mock_neo4j_session.run.call_args.kwargs["ids"] == ["CWE-284", "CWE-311", "CWE-89"]
+
+    high_only = client.get("/api/v1/models/model-1/threats?min_priority=4").json()
+    assert high_only["count"] == 0
+
+
+def test_enumerate_threats_model_not_found(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+
+    assert client.get("/api/v1/models/model-missing/threats").status_code == 404
+
+
+# --- Attack paths ---
+
+
+def test_attack_paths_cached_per_revision(client, mock_neo4j_session, mock_async_session):
+    """GET /api/v1/models/{id}/attack-paths loads the model once per revision."""
+    revision = {"revision": 3}
+    graph = {
+        "revision": 3,
+        "assets": [{"asset_id": "ta-web", "tags": ["internet-facing"]},
+                   {"asset_id": "ta-db", "criticality": "critical"}],
+        "flows": [{"flow_id": "df-1", "source": "ta-web", "target": "ta-db", "crosses_trust_boundary": True}],
+        "boundaries": [],
+        "data_assets": [],
+    }
+
+    def run(query, parameters=None, **params):
+        record = graph if "FLOWS_TO" in query else revision
+        return MagicMock(single=MagicMock(return_value=dict(record)))
+
+    mock_neo4j_session.run.side_effect = run
+
+    data = client.get("/api/v1/models/model-1/attack-paths").json()
+    assert (data["entries"], data["targets"]) == (["ta-web"], ["ta-db"])
+    assert data["paths"][0]["flows"] == ["df-1"]
+    assert data["paths"][0]["boundary_crossings"] == 1
+    assert mock_neo4j_session.run.call_count == 2
+
+    assert client.get("/api/v1/models/model-1/attack-paths").json() == data
+    assert mock_neo4j_session.run.call_count == 3
+
+    # An edit bumps the revision and misses the cache
+    revision["revision"] = graph["revision"] = 4
+    assert client.get("/api/v1/models/model-1/attack-paths").json()["revision"] == 4
+    assert mock_neo4j_session.run.call_count == 5
+    assert set(mock_async_session.access_modes) == {"READ"}
+
+
+def test_attack_paths_model_not_found(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+
+    assert client.get("/api/v1/models/model-missing/attack-paths").status_code == 404
+
+
+def test_add_data_flow_materialises_flows_to(client, mock_neo4j_session):
+    """Flows between model assets become FLOWS_TO relationships and bump the revision."""
+    mock_neo4j_session.run.return_value = _make_mock_result([{"df": {"flow_id": "df-abc"}}])
+
+    client.post("/api/v1/models/model-1/flows",
+                json={"source": "ta-1", "target": "ta-2", "trust_boundary_id": "tb-1"})
+
+    query = mock_neo4j_session.run.call_args.args[0]
+    params = mock_neo4j_session.run.call_args.kwargs
+    assert "CREATE (s)-[:FLOWS_TO" in query
+    assert "m.revision = coalesce(m.revision, 0) + 1" in query
+    assert params["crosses_trust_boundary"] is True
+
+
+# --- Bulk ingest ---
+
+
+BULK_DOCUMENT = {
+    "technical_assets": [
+        {"id": "web", "name": "Web", "type": "application", "metadata": {"team": "shop"}, "extra": {"x": 1}},
+        {"id": "db", "name": "DB", "type": "database", "criticality": "critical"},
+    ],
+    "trust_boundaries": [{"id": "dmz", "name": "DMZ", "type": "network_segment"}],
+    "data_flows": [
+        {"id": "q", "source_id": "web", "target_id": "db", "protocol": "sql", "trust_boundary_id": "dmz"},
+        {"id": "ext", "source_id": "ta-existing", "target_id": "web", "protocol": "https"},
+    ],
+    "data_assets": [
+        {"id": "orders", "name": "Orders", "type": "business_data", "medium": "digital",
+         "classification": "confidential", "stored_in": ["db"], "transmitted_in": ["q"]},
+    ],
+}
+
+
+def test_bulk_ingest_single_transaction(client, mock_neo4j_session, mock_async_session):
+    """POST /api/v1/models/{id}/bulk writes every element type with one UNWIND each."""
+    calls = []
+
+    def run(query, parameters=None, **params):
+        calls.append((query, params))
+        if "collect(n.asset_id)" in query:
+            return MagicMock(single=MagicMock(return_value={
+                "technical_assets": ["ta-existing"], "trust_boundaries": [],
+                "data_flows": [], "data_assets": [],
+            }))
+        return MagicMock(single=MagicMock(return_value={"revision": 7}))
+
+    mock_neo4j_session.run.side_effect = run
+
+    response = client.post("/api/v1/models/model-1/bulk", json=BULK_DOCUMENT)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["revision"] == 7
+    assert data["created"] == {"technical_assets": 2, "trust_boundaries": 1, "data_flows": 2, "data_assets": 1}
+    ids = data["ids"]
+    assert ids["technical_assets"]["web"].startswith("ta-")
+    assert mock_async_session.access_modes == ["WRITE"]
+    # Reference check, four element UNWINDs, FLOWS_TO, revision bump
+    assert len(calls) == 7
+    assert calls[0][1]["assets"] == ["ta-existing"]
+
+    rows = {query.split("CREATE (n:")[1].split(")")[0]: params["rows"]
+            for query, params in calls if "SET n = row" in query}
+    flow = rows["DataFlow"][0]
+    assert (flow["source"], flow["target"]) == (ids["technical_assets"]["web"], ids["technical_assets"]["db"])
+    assert flow["trust_boundary_id"] == ids["trust_boundaries"]["dmz"]
+    assert flow["crosses_trust_boundary"] is True
+    assert rows["DataFlow"][1]["source"] == "ta-existing"
+    assert rows["DataAsset"][0]["stored_in"] == [ids["technical_assets"]["db"]]
+    assert rows["DataAsset"][0]["transmitted_in"] == [ids["data_flows"]["q"]]
+    assert rows["TechnicalAsset"][0]["metadata"] == '{"team": "shop"}'
+    assert "extra" not in rows["TechnicalAsset"][0]
+    assert "FLOWS_TO" in calls[5][0]
+
+
+def test_bulk_ingest_reports_every_invalid_element(client, mock_neo4j_session):
+    document = {
+        "technical_assets": [{"id": "a", "name": "A", "type": "mainframe"}, {"id": "a", "name": "B", "type": "api"}],
+        "data_flows": [{"id": "f", "source_id": "a"}],
+    }
+
+    response = client.post("/api/v1/models/model-1/bulk", json=document)
+
+    assert response.status_code == 422
+    assert [e["element"] for e in response.json()["detail"]] == [
+        "technical_assets[0]", "technical_assets[1]", "data_flows[0]",
+    ]
+    mock_neo4j_session.run.assert_not_called()
+
+
+def test_bulk_ingest_rejects_bad_sections(client, mock_neo4j_session):
+    assert client.post("/api/v1/models/model-1/bulk", json={"technical_assets": 5}).status_code == 422
+    assert client.post("/api/v1/models/model-1/bulk", json={"widgets": []}).status_code == 422
+    mock_neo4j_session.run.assert_not_called()
+
+
+def test_bulk_ingest_unknown_reference(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value={
+        "technical_assets": [], "trust_boundaries": [], "data_flows": [], "data_assets": [],
+    }))
+
+    response = client.post("/api/v1/models/model-1/bulk", json=BULK_DOCUMENT)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == [{"element": "technical_assets", "errors": ["Unknown id 'ta-existing'"]}]
+    assert mock_neo4j_session.run.call_count == 1
+
+
+def test_bulk_ingest_model_not_found(client, mock_neo4j_session):
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value=None))
+
+    assert client.post("/api/v1/models/model-missing/bulk", json=BULK_DOCUMENT).status_code == 404
+
+
+# --- Batch delete and patch ---
+
+
+def _existing(**sections):
+    found = {"technical_assets": [], "trust_boundaries": [], "data_flows": [], "data_assets": []}
+    found.update(sections)
+    return found
+
+
+def test_bulk_delete(client, mock_neo4j_session, mock_async_session):
+    """POST /api/v1/models/{id}/bulk/delete deletes what exists and reports the rest."""
+    calls = []
+
+    def run(query, parameters=None, **params):
+        calls.append((query, params))
+        if "collect(n.asset_id)" in query:
+            return MagicMock(single=MagicMock(return_value=_existing(
+                technical_assets=["ta-1"], data_flows=["df-1", "df-2"])))
+        return MagicMock(single=MagicMock(return_value={"revision": 2}))
+
+    mock_neo4j_session.run.side_effect = run
+
+    response = client.post("/api/v1/models/model-1/bulk/delete", json={
+        "technical_assets": ["ta-1", "ta-gone"], "data_flows": ["df-2", "df-1"],
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted"] == {"technical_assets": ["ta-1"], "data_flows": ["df-1", "df-2"]}
+    assert data["not_found"] == {"technical_assets": ["ta-gone"], "data_flows": []}
+    assert data["revision"] == 2
+    assert mock_async_session.access_modes == ["WRITE"]
+    # Existence check, FLOWS_TO, assets, flows, revision bump
+    assert len(calls) == 5
+    assert "FLOWS_TO" in calls[1][0] and calls[1][1]["ids"] == ["df-1", "df-2"]
+
+
+def test_bulk_delete_rejects_bad_body(client, mock_neo4j_session):
+    assert client.post("/api/v1/models/model-1/bulk/delete", json={"widgets": ["w"]}).status_code == 422
+    assert client.post("/api/v1/models/model-1/bulk/delete", json={"data_flows": "df-1"}).status_code == 422
+    mock_neo4j_session.run.assert_not_called()
+
+
+def test_bulk_patch(client, mock_neo4j_session):
+    """PATCH /api/v1/models/{id}/bulk updates elements in place and rebuilds changed flows."""
+    calls = []
+
+    def run(query, parameters=None, **params):
+        calls.append((query, params))
+        if "collect(n.asset_id)" in query:
+            return MagicMock(single=MagicMock(return_value=_existing(
+                technical_assets=["ta-1", "ta-2"], data_flows=["df-1"])))
+        return MagicMock(single=MagicMock(return_value={"revision": 5}))
+
+    mock_neo4j_session.run.side_effect = run
+
+    response = client.patch("/api/v1/models/model-1/bulk", json={
+        "technical_assets": [{"id": "ta-1", "criticality": "critical", "owner": None}],
+        "data_flows": [{"id": "df-1", "target_id": "ta-2", "metadata": {"port": "8443"}}],
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "model_id": "model-1", "revision": 5,
+        "updated": {"technical_assets": ["ta-1"], "data_flows": ["df-1"]},
+    }
+    assert sorted(calls[0][1]["assets"]) == ["ta-1", "ta-2"]
+    patches = [params["rows"] for query, params in calls if "SET n += row.changes" in query]
+    assert patches[0] == [{"id": "ta-1", "changes": {"criticality": "critical", "owner": None}}]
+    assert patches[1] == [{"id": "df-1", "changes": {"target": "ta-2", "metadata": '{"port": "8443"}'}}]
+    assert "CREATE (s)-[:FLOWS_TO" in calls[3][0]
+
+
+def test_bulk_patch_clearing_boundary_clears_crossing(client, mock_neo4j_session):
+    calls = []
+
+    def run(query, parameters=None, **params):
+        calls.append((query, params))
+        if "collect(n.asset_id)" in query:
+            return MagicMock(single=MagicMock(return_value=_existing(data_flows=["df-1"])))
+        return MagicMock(single=MagicMock(return_value={"revision": 6}))
+
+    mock_neo4j_session.run.side_effect = run
+
+    response = client.patch("/api/v1/models/model-1/bulk", json={
+        "data_flows": [{"id": "df-1", "trust_boundary_id": None}],
+    })
+
+    assert response.status_code == 200
+    patches = [params["rows"] for query, params in calls if "SET n += row.changes" in query]
+    assert patches == [[{"id": "df-1", "changes": {"trust_boundary_id": None, "crosses_trust_boundary": False}}]]
+    rebuild = next(query for query, _ in calls if "CREATE (s)-[:FLOWS_TO" in query)
+    assert "crosses_trust_boundary: df.crosses_trust_boundary" in rebuild
+
+
+def test_bulk_patch_rejects_invalid_and_unknown(client, mock_neo4j_session):
+    response = client.patch("/api/v1/models/model-1/bulk", json={
+        "technical_assets": [{"id": "ta-1", "type": "mainframe"}, {"id": "ta-2", "name": None}],
+    })
+    assert response.status_code == 422
+    assert [e["id"] for e in response.json()["detail"]] == ["ta-1", "ta-2"]
+    mock_neo4j_session.run.assert_not_called()
+
+    mock_neo4j_session.run.return_value = MagicMock(single=MagicMock(return_value=_existing(
+        technical_assets=["ta-1"])))
+    response = client.patch("/api/v1/models/model-1/bulk", json={
+        "technical_assets": [{"id": "ta-1", "name": "Renamed"}, {"id": "ta-9", "name": "Gone"}],
+    })
+    assert response.status_code == 422
+    assert response.json()["detail"] == [{"element": "technical_assets", "errors": ["Unknown id 'ta-9'"]}]
+    assert mock_neo4j_session.run.call_count == 1
@@ -2,8 +2,70 @@
 import pytest
 from unittest.mock import MagicMock
 
+from api.cache import attack_path_cache, invalidate_graph_caches
 from api.main import create_app
-from api.dependencies import get_neo4j_session, get_neo4j_driver
+from api.dependencies import (
+    get_async_read_session,
+    get_async_write_session,
+    get_neo4j_driver,
+    get_neo4j_session,
+)
+from api.jobs import JobManager, get_job_manager
+from src.graph_snapshot import clear_snapshot
+
+
+class AsyncResultAdapter:
+    """Async view of a (mocked) synchronous Neo4j result."""
+
+    def __init__(self, result):
+        self._result = result
+
+    async def single(self):
+        return self._result.single()
+
+    async def consume(self):
+        return self._result.consume()
+
+    async def __aiter__(self):
+        for record in self._result:
+            yield record
+
+
+class AsyncSessionAdapter:
+    """Async session that forwards to a synchronous mock session.
+
+    Lets async routes be tested with the same ``MagicMock`` session (and its
+    ``run`` return values / call assertions) as the sync ones. Managed
+    transactions run their function once against the adapter itself; the
+    access mode of each call is recorded in ``access_modes``.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.access_modes = []
+
+    async def run(self, *args, **kwargs):
+        return AsyncResultAdapter(self.session.run(*args, **kwargs))
+
+    async def execute_read(self, fn, *args, **kwargs):
+        self.access_modes.append("READ")
+        return await fn(self, *args, **kwargs)
+
+    async def execute_write(self, fn, *args, **kwargs):
+        self.access_modes.append("WRITE")
+        return await fn(self, *args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def clear_graph_caches():
+    """Start every test with empty graph read caches and no graph snapshot."""
+    invalidate_graph_caches()
+    attack_path_cache.clear()
+    clear_snapshot()
+    yield
+    invalidate_graph_caches()
+    attack_path_cache.clear()
+    clear_snapshot()
 
 
 @pytest.fixture
@@ -12,6 +74,12 @@ def mock_neo4j_session():
     return MagicMock()
 
 
+@pytest.fixture
+def mock_async_session(mock_neo4j_session):
+    """Async session used by async routes, forwarding to ``mock_neo4j_session``."""
+    return AsyncSessionAdapter(mock_neo4j_session)
+
+
 @pytest.fixture
 def mock_neo4j_driver():
     """Create a mock Neo4j driver."""
@@ -19,15 +87,29 @@ def mock_neo4j_driver():
 
 
 @pytest.fixture
-def app(mock_neo4j_session, mock_neo4j_driver):
+def job_manager():
+    """Create an isolated background job manager."""
+    manager = JobManager(max_workers=2)
+    yield manager
+    manager.shutdown(wait=True)
+
+
+@pytest.fixture
+def app(mock_neo4j_session, mock_async_session, mock_neo4j_driver, job_manager):
     """Create a FastAPI app with mocked Neo4j dependencies."""
     application = create_app()
 
     def override_session():
         yield mock_neo4j_session
 
+    async def override_async_session():
+        yield mock_async_session
+
     application.dependency_overrides[get_neo4j_session] = override_session
+    application.dependency_overrides[get_async_read_session] = override_async_session
+    application.dependency_overrides[get_async_write_session] = override_async_session
     application.dependency_overrides[get_neo4j_driver] = lambda: mock_neo4j_driver
+    application.dependency_overrides[get_job_manager] = lambda: job_manager
 
     yield application
 
@@ -120,3 +120,48 @@ def test_nonexistent_schema():
     errors = validator.validate({}, "nonexistent_schema")
     assert len(errors) > 0
     assert "not found" in errors[0]
+
+
+def test_validate_partial():
+    """Test validating a patch: only present properties are checked."""
+    assert validator.validate_partial({"criticality": "high"}, "technical_asset") == []
+    assert validator.validate_partial({"owner": None}, "technical_asset") == []
+
+    errors = validator.validate_partial({"criticality": "extreme", "colour": "red"}, "technical_asset")
+    assert "Unknown property 'colour'" in errors
+    assert any("extreme" in e for e in errors)
+
+    errors = validator.validate_partial({"name": None}, "technical_asset")
+    assert errors == ["'name' is required and cannot be removed"]
+
+
+def test_validators_are_compiled_once():
+    """Test that each schema's validator is built on first use and then reused."""
+    validator._validator_cache.clear()
+    first = validator.get_validator("technical_asset")
+    assert validator.get_validator("technical_asset") is first
+    assert validator.get_validator("technical_asset", partial=True) is not first
+
+
+def test_validate_reports_every_error():
+    """Test that all errors of an object are reported, not just the first."""
+    errors = validator.validate({"id": "ta-1", "type": "mainframe", "criticality": "extreme"}, "technical_asset")
+    assert len(errors) == 3
+    assert any("'name' is a required property" in e for e in errors)
+
+
+def test_validate_many():
+    """Test validating a batch of objects against one schema."""
+    assets = [
+        {"id": "ta-1", "name": "Web", "type": "server"},
+        {"id": "ta-2", "type": "mainframe"},
+        "not an object",
+    ]
+
+    results = validator.validate_many(assets, "technical_asset")
+
+    assert len(results) == 3
+    assert results[0] == []
+    assert len(results[1]) == 2
+    assert len(results[2]) == 1
+    assert validator.validate_many([{}], "nonexistent_schema") == [["Schema 'nonexistent_schema' not found"]]
@@ -1,9 +1,20 @@
 """Phase 2: ATT&CK STIX importer tests — TDD."""
+import json
 import os
 import pytest
+from unittest.mock import MagicMock
 from neo4j import GraphDatabase
 
-from importers.attack_importer import parse_attack_stix, import_attack_to_neo4j
+from importers.attack_importer import (
+    ATTACKObject,
+    ATTACKRelationship,
+    _label_groups,
+    import_attack_stream,
+    import_attack_to_neo4j,
+    iter_attack_stix,
+    parse_attack_stix,
+)
+from importers.streaming import iter_json_array
 
 
 ATTACK_JSON_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "enterprise-attack.json")
@@ -21,6 +32,96 @@ def get_driver():
 HAVE_DB = os.environ.get("NEO4J_URI") is not None
 
 
+SAMPLE_BUNDLE = {
+    "type": "bundle",
+    "id": "bundle--1",
+    "objects": [
+        {
+            "type": "attack-pattern",
+            "id": "attack-pattern--1",
+            "name": "Command and Scripting Interpreter",
+            "description": "Adversaries may abuse interpreters.",
+            "external_references": [{"source_name": "mitre-attack", "external_id": "T1059"}],
+            "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": "execution"}],
+        },
+        {"type": "identity", "id": "identity--1", "name": "The MITRE Corporation"},
+        {
+            "type": "intrusion-set",
+            "id": "intrusion-set--1",
+            "name": "APT28",
+            "external_references": [{"source_name": "mitre-attack", "external_id": "G0007"}],
+        },
+        {
+            "type": "relationship",
+            "id": "relationship--1",
+            "relationship_type": "uses",
+            "source_ref": "intrusion-set--1",
+            "target_ref": "attack-pattern--1",
+        },
+    ],
+    "spec_version": "2.1",
+}
+
+
+class TestATTACKStreamingParser:
+    """Test incremental STIX parsing against a small inline bundle."""
+
+    @pytest.fixture
+    def json_path(self, tmp_path):
+        path = tmp_path / "attack.json"
+        path.write_text(json.dumps(SAMPLE_BUNDLE, indent=2))
+        return str(path)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_iter_json_array_any_chunk_size(self, json_path, chunk_size):
+        """Objects decode identically regardless of where chunk boundaries fall."""
+        objects = list(iter_json_array(json_path, "objects", chunk_size=chunk_size))
+        assert objects == SAMPLE_BUNDLE["objects"]
+
+    def test_iter_json_array_empty(self, tmp_path):
+        path = tmp_path / "empty.json"
+        path.write_text('{"type": "bundle", "objects": []}')
+        assert list(iter_json_array(str(path), "objects")) == []
+
+    def test_iter_json_array_truncated(self, tmp_path):
+        path = tmp_path / "truncated.json"
+        path.write_text('{"objects": [{"type": "tool"}, {"type"')
+        with pytest.raises(ValueError):
+            list(iter_json_array(str(path), "objects"))
+
+    def test_iter_attack_stix(self, json_path):
+        items = list(iter_attack_stix(json_path))
+        assert [type(i) for i in items] == [ATTACKObject, ATTACKObject, ATTACKRelationship]
+        assert items[0].attack_id == "T1059"
+        assert items[0].tactics == ["execution"]
+
+    def test_parse_matches_stream(self, json_path):
+        objects, relationships = parse_attack_stix(json_path)
+        assert [o.attack_id for o in objects] == ["T1059", "G0007"]
+        assert relationships[0].rel_type == "uses"
+
+    def test_import_stream(self, json_path):
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+
+        assert import_attack_stream(driver, iter_attack_stix(json_path), batch_size=1) == (2, 1)
+        edge_calls = [c for c in session.run.call_args_list if "edges" in c.kwargs]
+        assert len(edge_calls) == 1
+        assert "MATCH (s:Group" in edge_calls[0].args[0]
+        assert edge_calls[0].kwargs["edges"][0]["tgt_id"] == "T1059"
+
+
+def test_label_groups_share_no_label():
+    """Relationship combos that can lock the same nodes are written in one group."""
+    combos = [("Group", "Technique"), ("Campaign", "Group"), ("Mitigation", "Technique"),
+              ("DataComponent", "DataSource")]
+    assert _label_groups(combos) == [
+        [("Group", "Technique"), ("Campaign", "Group"), ("Mitigation", "Technique")],
+        [("DataComponent", "DataSource")],
+    ]
+
+
 @pytest.mark.skipif(not HAVE_DATA, reason="ATT&CK JSON not downloaded")
 class TestATTACKParser:
     """Test ATT&CK STIX parsing without database."""
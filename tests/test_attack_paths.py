@@ -0,0 +1,93 @@
+"""Tests for attack-path search over threat model data flows."""
+from src.attack_paths import default_entries, default_targets, find_attack_paths
+
+
+def _assets(*specs):
+    return [{"asset_id": asset_id, "criticality": criticality} for asset_id, criticality in specs]
+
+
+def _flow(flow_id, source, target, crosses=False):
+    return {"flow_id": flow_id, "source": source, "target": target, "crosses_trust_boundary": crosses}
+
+
+ASSETS = _assets(("web", "medium"), ("api", "high"), ("cache", "low"), ("db", "critical"))
+FLOWS = [
+    _flow("f1", "web", "api", crosses=True),
+    _flow("f2", "api", "db"),
+    _flow("f3", "web", "cache"),
+    _flow("f4", "cache", "db"),
+    _flow("f5", "db", "web"),
+]
+
+
+def test_paths_ranked_by_cost():
+    result = find_attack_paths(ASSETS, FLOWS, ["web"], ["db"], k=5)
+
+    paths = result["paths"]
+    assert [p["assets"] for p in paths] == [["web", "cache", "db"], ["web", "api", "db"]]
+    assert paths[0] == {
+        "assets": ["web", "cache", "db"], "flows": ["f3", "f4"], "cost": 2.0,
+        "hops": 2, "boundary_crossings": 0, "target_criticality": "critical",
+    }
+    assert paths[1]["cost"] == 4.0 and paths[1]["boundary_crossings"] == 1
+    assert result["truncated"] is False
+
+
+def test_boundary_weight_changes_ranking():
+    flows = [_flow("f1", "web", "db", crosses=True), _flow("f2", "web", "api"),
+             _flow("f3", "api", "cache"), _flow("f4", "cache", "db")]
+
+    cheap = find_attack_paths(ASSETS, flows, ["web"], ["db"], k=1, boundary_weight=0)
+    dear = find_attack_paths(ASSETS, flows, ["web"], ["db"], k=1, boundary_weight=5)
+
+    assert cheap["paths"][0]["flows"] == ["f1"]
+    assert dear["paths"][0]["flows"] == ["f2", "f3", "f4"]
+
+
+def test_critical_targets_rank_first():
+    result = find_attack_paths(ASSETS, FLOWS, ["web"], ["api", "db"], k=2, boundary_weight=0)
+
+    assert [p["cost"] for p in result["paths"]] == [2.0, 2.0]
+    # web→cache is one hop but low (cost 1 + 3), behind both two-hop paths to the critical db
+    result = find_attack_paths(ASSETS, FLOWS, ["web"], ["cache", "db"], k=3, boundary_weight=0)
+    assert [p["assets"][-1] for p in result["paths"]] == ["db", "db", "cache"]
+
+
+def test_hops_bound_and_cycles():
+    result = find_attack_paths(ASSETS, FLOWS, ["web"], ["db"], k=10, max_hops=1)
+    assert result["paths"] == []
+
+    # db→web closes a cycle; paths stay simple
+    result = find_attack_paths(ASSETS, FLOWS, ["api"], ["web"], k=10)
+    assert [p["assets"] for p in result["paths"]] == [["api", "db", "web"]]
+
+
+def test_expansion_budget_truncates():
+    result = find_attack_paths(ASSETS, FLOWS, ["web"], ["db"], k=5, max_expansions=2)
+    assert result["truncated"] is True
+
+
+def test_unknown_entries_and_dangling_flows_ignored():
+    flows = FLOWS + [_flow("f9", "web", "ghost")]
+    result = find_attack_paths(ASSETS, flows, ["nowhere", "web"], ["ghost", "db"], k=5)
+    assert all("ghost" not in p["assets"] for p in result["paths"])
+    assert len(result["paths"]) == 2
+
+
+def test_default_entries_and_targets():
+    assets = [
+        {"asset_id": "lb", "tags": ["internet-facing"]},
+        {"asset_id": "web", "internet_facing": True},
+        {"asset_id": "api"},
+        {"asset_id": "vault", "criticality": "critical"},
+        {"asset_id": "db"},
+    ]
+    flows = [{"flow_id": "f1", "source": "lb", "target": "api", "trust_boundary_id": "tb-public"}]
+    boundaries = [{"boundary_id": "tb-public", "security_level": "public"}]
+    data_assets = [
+        {"classification": "confidential", "stored_in": ["db"], "processed_by": ["api", "gone"]},
+        {"classification": "public", "stored_in": ["web"]},
+    ]
+
+    assert default_entries(assets, flows, boundaries) == ["api", "lb", "web"]
+    assert default_targets(assets, data_assets) == ["api", "db", "vault"]
@@ -3,7 +3,9 @@ import os
 import pytest
 from neo4j import GraphDatabase
 
-from importers.capec_importer import parse_capec_xml, import_capec_to_neo4j
+from unittest.mock import MagicMock
+
+from importers.capec_importer import parse_capec_xml, iter_capec_xml, import_capec_to_neo4j
 
 
 CAPEC_XML_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "capec_latest.xml")
@@ -42,6 +44,56 @@ class TestCAPECParser:
                 assert aid.startswith("T"), f"Bad attack ID: {aid}"
 
 
+SAMPLE_CAPEC_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Attack_Pattern_Catalog xmlns="http://capec.mitre.org/capec-3" Name="CAPEC" Version="3.9">
+  <Attack_Patterns>
+    <Attack_Pattern ID="66" Name="SQL Injection" Abstraction="Standard" Status="Draft">
+      <Description>An attacker <xhtml:b xmlns:xhtml="http://www.w3.org/1999/xhtml">crafts</xhtml:b> input.</Description>
+      <Related_Weaknesses>
+        <Related_Weakness CWE_ID="89"/>
+        <Related_Weakness CWE_ID="1286"/>
+      </Related_Weaknesses>
+      <Taxonomy_Mappings>
+        <Taxonomy_Mapping Taxonomy_Name="ATTACK">
+          <Entry_ID>1190</Entry_ID>
+        </Taxonomy_Mapping>
+        <Taxonomy_Mapping Taxonomy_Name="WASC">
+          <Entry_ID>19</Entry_ID>
+        </Taxonomy_Mapping>
+      </Taxonomy_Mappings>
+    </Attack_Pattern>
+    <Attack_Pattern ID="7" Name="Blind SQL Injection" Abstraction="Detailed" Status="Draft">
+      <Description>Blind variant.</Description>
+    </Attack_Pattern>
+  </Attack_Patterns>
+</Attack_Pattern_Catalog>
+"""
+
+
+class TestCAPECStreamingParser:
+    @pytest.fixture
+    def xml_path(self, tmp_path):
+        path = tmp_path / "capec.xml"
+        path.write_text(SAMPLE_CAPEC_XML)
+        return str(path)
+
+    def test_iter_yields_patterns_lazily(self, xml_path):
+        stream = iter_capec_xml(xml_path)
+        first = next(stream)
+        assert first.capec_id == "66"
+        assert first.description == "An attacker crafts input."
+        assert first.related_cwes == ["89", "1286"]
+        assert first.related_attacks == ["T1190"]
+        assert [p.capec_id for p in stream] == ["7"]
+
+    def test_parse_matches_stream(self, xml_path):
+        assert parse_capec_xml(xml_path) == list(iter_capec_xml(xml_path))
+
+    def test_import_consumes_stream(self, xml_path):
+        driver = MagicMock()
+        assert import_capec_to_neo4j(driver, iter_capec_xml(xml_path), batch_size=1) == (2, 2, 1)
+
+
 @pytest.mark.neo4j
 @pytest.mark.skipif(not HAVE_DB, reason="NEO4J env vars required")
 @pytest.mark.skipif(not HAVE_DATA, reason="CAPEC XML not downloaded")
@@ -3,7 +3,16 @@ import os
 import pytest
 from neo4j import GraphDatabase
 
-from importers.cwe_importer import parse_cwe_xml, import_cwe_to_neo4j, CWEWeakness
+from unittest.mock import MagicMock
+
+from importers.cwe_importer import (
+    CWEWeakness,
+    import_cwe_to_neo4j,
+    iter_cwe_xml,
+    parse_cwe_xml,
+    write_cwe_relationships,
+)
+from importers.writer import ParallelBatchWriter
 
 
 # --- Parsing tests (no DB needed) ---
@@ -56,6 +65,87 @@ class TestCWEParser:
         assert len(child_of) > 0, "CWE-89 should have ChildOf relationships"
 
 
+SAMPLE_CWE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Weakness_Catalog xmlns="http://cwe.mitre.org/cwe-7" Name="CWE" Version="4.19.1">
+  <Weaknesses>
+    <Weakness ID="89" Name="SQL Injection" Abstraction="Base" Status="Stable">
+      <Description>Improper neutralization of SQL.</Description>
+      <Likelihood_Of_Exploit>High</Likelihood_Of_Exploit>
+      <Related_Weaknesses>
+        <Related_Weakness Nature="ChildOf" CWE_ID="943" View_ID="1000"/>
+        <Related_Weakness Nature="CanFollow" CWE_ID="456" View_ID="1000"/>
+      </Related_Weaknesses>
+    </Weakness>
+    <Weakness ID="943" Name="Data Query Logic" Abstraction="Class" Status="Incomplete">
+      <Description>Improper neutralization in data query logic.</Description>
+    </Weakness>
+  </Weaknesses>
+  <Categories>
+    <Category ID="1" Name="Not a weakness" Status="Draft"/>
+  </Categories>
+</Weakness_Catalog>
+"""
+
+
+class TestCWEStreamingParser:
+    """Test incremental CWE parsing against a small inline catalog."""
+
+    @pytest.fixture
+    def xml_path(self, tmp_path):
+        path = tmp_path / "cwe.xml"
+        path.write_text(SAMPLE_CWE_XML)
+        return str(path)
+
+    def test_iter_yields_weaknesses_lazily(self, xml_path):
+        """iter_cwe_xml should be a generator producing one record at a time."""
+        stream = iter_cwe_xml(xml_path)
+        first = next(stream)
+        assert first.cwe_id == "89"
+        assert first.likelihood == "High"
+        assert first.related == [("ChildOf", "943"), ("CanFollow", "456")]
+        assert [w.cwe_id for w in stream] == ["943"]
+
+    def test_parse_matches_stream(self, xml_path):
+        """parse_cwe_xml should return the same records as the stream."""
+        assert parse_cwe_xml(xml_path) == list(iter_cwe_xml(xml_path))
+
+    def test_import_consumes_stream_in_batches(self, xml_path):
+        """import_cwe_to_neo4j should accept a generator and batch node writes."""
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+
+        nodes, edges = import_cwe_to_neo4j(driver, iter_cwe_xml(xml_path), batch_size=1)
+
+        assert (nodes, edges) == (2, 2)
+        node_batches = [c.kwargs["nodes"] for c in session.run.call_args_list if "nodes" in c.kwargs]
+        assert sorted([n["cwe_id"] for n in b] for b in node_batches) == [["CWE-89"], ["CWE-943"]]
+
+
+def test_write_cwe_relationships_groups_by_type():
+    """Edges are written one statement per relationship type and chunk, in one session."""
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+    edges = [
+        {"source": f"CWE-{i}", "target": "CWE-1", "nature": "ChildOf"} for i in range(5)
+    ] + [
+        {"source": "CWE-2", "target": "CWE-3", "nature": "PeerOf"},
+        {"source": "CWE-2", "target": "CWE-4", "nature": "Unknown"},
+    ]
+
+    with ParallelBatchWriter(driver, concurrency=4) as writer:
+        write_cwe_relationships(writer, edges, rel_batch_size=3)
+
+    assert driver.session.call_count == 1
+
+    queries = [(c.args[0], len(c.kwargs["edges"])) for c in session.run.call_args_list]
+    assert [n for _, n in queries] == [3, 2, 1]
+    assert all(":CHILD_OF]" in q for q, _ in queries[:2])
+    assert ":PEER_OF]" in queries[2][0]
+    assert not any("IN TRANSACTIONS" in q for q, _ in queries)
+
+
 # --- Import tests (need DB) ---
 
 def get_driver():
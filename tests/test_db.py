@@ -0,0 +1,81 @@
+"""Driver singleton tests (no DB needed)."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src import db
+
+
+@pytest.fixture
+def neo4j_env(monkeypatch):
+    monkeypatch.setenv("NEO4J_URI", "neo4j://localhost:7687")
+    monkeypatch.setenv("NEO4J_PASSWORD", "secret")
+    monkeypatch.setattr(db, "_async_driver", None)
+    monkeypatch.setattr(db, "_pool_overrides", {})
+
+
+def test_async_driver_is_a_singleton(neo4j_env):
+    with patch("src.db.AsyncGraphDatabase.driver") as factory:
+        factory.return_value.close = AsyncMock()
+        assert db.get_async_driver() is db.get_async_driver()
+        factory.assert_called_once_with("neo4j://localhost:7687", auth=("neo4j", "secret"))
+
+        asyncio.run(db.close_async_driver())
+        factory.return_value.close.assert_awaited_once()
+        assert db._async_driver is None
+
+
+def test_async_driver_requires_config(monkeypatch):
+    monkeypatch.setenv("NEO4J_URI", "")
+    monkeypatch.setattr(db, "_async_driver", None)
+    with pytest.raises(ValueError):
+        db.get_async_driver()
+
+
+def test_pool_config_from_env_and_overrides(neo4j_env, monkeypatch):
+    monkeypatch.setenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "20")
+    monkeypatch.setenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "30")
+    assert db.get_pool_config() == {"max_connection_pool_size": 20, "liveness_check_timeout": 30.0}
+
+    db.configure_pool(max_connection_pool_size=50, connection_timeout=None)
+    assert db.get_pool_config()["max_connection_pool_size"] == 50
+    assert "connection_timeout" not in db.get_pool_config()
+
+    with pytest.raises(ValueError):
+        db.configure_pool(pool_size=1)
+
+
+def test_driver_receives_pool_options(neo4j_env):
+    db.configure_pool(connection_acquisition_timeout=5.0)
+    with patch("src.db.AsyncGraphDatabase.driver") as factory:
+        db.get_async_driver()
+    assert factory.call_args.kwargs["connection_acquisition_timeout"] == 5.0
+
+
+def test_pool_acquisitions_are_timed():
+    def acquire(*args, **kwargs):
+        if kwargs.get("fail"):
+            raise RuntimeError("failed to obtain a connection from the pool")
+        return "connection"
+
+    driver = SimpleNamespace(_pool=SimpleNamespace(acquire=acquire))
+    metrics = db.PoolMetrics()
+    db._instrument_pool(driver, metrics)
+
+    assert driver._pool.acquire() == "connection"
+    with pytest.raises(RuntimeError):
+        driver._pool.acquire(fail=True)
+
+    report = metrics.to_dict()
+    assert report["acquisitions"] == 2
+    assert report["failed_acquisitions"] == 1
+    assert report["max_acquisition_wait_ms"] >= report["avg_acquisition_wait_ms"] >= 0
+
+
+def test_pool_state_counts_in_use_connections():
+    connections = {"localhost:7687": [SimpleNamespace(in_use=True), SimpleNamespace(in_use=False)]}
+    pool = SimpleNamespace(connections=connections,
+                           pool_config=SimpleNamespace(max_connection_pool_size=10))
+    assert db._pool_state(SimpleNamespace(_pool=pool)) == {"max_size": 10, "open": 2, "in_use": 1, "idle": 1}
@@ -0,0 +1,61 @@
+"""Schema bootstrap tests (no DB needed)."""
+from unittest.mock import MagicMock
+
+from neo4j.exceptions import ClientError
+
+from src.graph_schema import UNIQUE_KEYS, ensure_schema, schema_statements
+
+
+def _mock_driver(fail=()):
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+
+    def run(query, **params):
+        if any(name in query for name in fail):
+            raise ClientError("equivalent index already exists")
+        result = MagicMock()
+        if query.startswith("SHOW CONSTRAINTS"):
+            result.__iter__ = lambda self: iter([{
+                "name": "cwe_cwe_id_unique", "type": "UNIQUENESS",
+                "labelsOrTypes": ["CWE"], "properties": ["cwe_id"],
+            }])
+        elif query.startswith("SHOW INDEXES"):
+            result.__iter__ = lambda self: iter([{
+                "name": "cwe_cwe_id_unique", "type": "RANGE",
+                "labelsOrTypes": ["CWE"], "properties": ["cwe_id"], "state": "ONLINE",
+            }])
+        return result
+
+    session.run.side_effect = run
+    return driver, session
+
+
+def test_statements_are_idempotent():
+    statements = schema_statements()
+    assert len(statements) == len({name for name, _ in statements})
+    assert all("IF NOT EXISTS" in cypher for _, cypher in statements)
+    assert ("CWE", "cwe_id") in UNIQUE_KEYS
+    assert any("FOR (n:ThreatModel) REQUIRE n.model_id IS UNIQUE" in c for _, c in statements)
+
+
+def test_ensure_schema_reports_existing_schema():
+    driver, session = _mock_driver()
+
+    report = ensure_schema(driver)
+
+    assert session.run.call_count == len(schema_statements()) + 2
+    assert report["constraints"] == [{
+        "name": "cwe_cwe_id_unique", "type": "UNIQUENESS",
+        "labels": ["CWE"], "properties": ["cwe_id"],
+    }]
+    assert report["indexes"][0]["state"] == "ONLINE"
+    assert report["errors"] == []
+
+
+def test_ensure_schema_continues_past_failures():
+    driver, session = _mock_driver(fail=("capec_capec_id_unique",))
+
+    report = ensure_schema(driver)
+
+    assert [e["name"] for e in report["errors"]] == ["capec_capec_id_unique"]
+    assert session.run.call_count == len(schema_statements()) + 2
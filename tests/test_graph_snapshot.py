@@ -0,0 +1,157 @@
+"""In-memory graph snapshot tests (no DB needed)."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import graph_snapshot
+from src.graph_snapshot import GraphSnapshot, ensure_snapshot, get_snapshot, refresh_snapshot
+
+
+NODES = [
+    ("e1", ["CWE"], {"cwe_id": "CWE-707", "name": "Improper Neutralization"}),
+    ("e2", ["CWE"], {"cwe_id": "CWE-74", "name": "Injection"}),
+    ("e3", ["CWE"], {"cwe_id": "CWE-79", "name": "Cross-site Scripting"}),
+    ("e4", ["CWE"], {"cwe_id": "CWE-89", "name": "SQL Injection"}),
+    ("e5", ["CAPEC"], {"capec_id": "CAPEC-66", "name": "SQL Injection"}),
+    ("e6", ["Technique"], {"attack_id": "T1190", "name": "Exploit Public-Facing Application"}),
+]
+
+EDGES = [
+    ("e2", "CHILD_OF", "e1"),
+    ("e3", "CHILD_OF", "e2"),
+    ("e4", "CHILD_OF", "e2"),
+    ("e5", "EXPLOITS", "e4"),
+    ("e5", "MAPS_TO_TECHNIQUE", "e6"),
+    ("e5", "EXPLOITS", "e4"),  # duplicate edges collapse
+    ("e5", "EXPLOITS", "missing"),  # edges to nodes outside the snapshot are dropped
+]
+
+
+@pytest.fixture
+def snapshot():
+    return GraphSnapshot(NODES, EDGES)
+
+
+def test_builds_csr_per_type(snapshot):
+    assert snapshot.node_count == 6
+    assert snapshot.edge_count == 5
+    assert snapshot.rel_types == ["CHILD_OF", "EXPLOITS", "MAPS_TO_TECHNIQUE"]
+
+    child_of = snapshot.incoming["CHILD_OF"]
+    assert len(child_of.offsets) == snapshot.node_count + 1
+    parent = snapshot.index["CWE-74"]
+    # Neighbours are ordered by name, like the Cypher node detail query
+    assert [snapshot.ids[n] for n in child_of.neighbours(parent)] == ["CWE-79", "CWE-89"]
+    assert child_of.degree(snapshot.index["CWE-707"]) == 1
+
+
+def test_get_node_matches_api_shape(snapshot):
+    detail = snapshot.get_node("CAPEC-66", limit=10)
+
+    assert detail["node"] == {"capec_id": "CAPEC-66", "name": "SQL Injection", "_labels": ["CAPEC"]}
+    assert detail["relationships"]["outgoing"] == [
+        {"type": "EXPLOITS", "target": NODES[3][2], "target_labels": ["CWE"]},
+        {"type": "MAPS_TO_TECHNIQUE", "target": NODES[5][2], "target_labels": ["Technique"]},
+    ]
+    assert detail["relationships"]["incoming"] == []
+    assert detail["relationship_counts"] == {
+        "outgoing": {"EXPLOITS": 1, "MAPS_TO_TECHNIQUE": 1}, "incoming": {},
+    }
+    assert snapshot.get_node("CWE-1", limit=10) is None
+
+
+def test_strips_internal_properties():
+    snapshot = GraphSnapshot(
+        [("e1", ["CWE"], {"cwe_id": "CWE-89", "name": "SQL Injection", "fingerprint": "f00d",
+                          "mapped_capec": ["CAPEC-66"], "mapped_techniques": ["T1190"],
+                          "ancestor_ids": ["CWE-74"], "descendant_ids": []})], [],
+    )
+    assert snapshot.node_dict(0) == {"cwe_id": "CWE-89", "name": "SQL Injection", "_labels": ["CWE"]}
+
+
+def test_get_node_caps_neighbours_per_type(snapshot):
+    detail = snapshot.get_node("CWE-74", limit=1)
+
+    assert [r["source"]["cwe_id"] for r in detail["relationships"]["incoming"]] == ["CWE-79"]
+    assert detail["relationship_counts"]["incoming"] == {"CHILD_OF": 2}
+
+
+def test_traverse_ancestors_and_descendants(snapshot):
+    ancestors = snapshot.traverse("CWE-79", ["CHILD_OF"], "out", max_depth=5)
+    assert [(snapshot.ids[n], d) for n, d in ancestors] == [("CWE-74", 1), ("CWE-707", 2)]
+
+    descendants = snapshot.traverse("CWE-707", ["CHILD_OF"], "in", max_depth=1)
+    assert [snapshot.ids[n] for n, _ in descendants] == ["CWE-74"]
+
+    everything = snapshot.traverse("CWE-79", None, "both", max_depth=10)
+    assert len(everything) == snapshot.node_count - 1
+    assert snapshot.traverse("CWE-1") is None
+
+
+def test_traverse_respects_limit(snapshot):
+    assert len(snapshot.traverse("CWE-707", None, "both", max_depth=10, limit=2)) == 2
+
+
+def test_rejects_unknown_direction(snapshot):
+    with pytest.raises(ValueError):
+        list(snapshot.iter_neighbours(0, "sideways"))
+
+
+def _mock_driver():
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+
+    def run(query, **params):
+        if "elementId(n)" in query:
+            return [{"element_id": k, "labels": l, "props": p} for k, l, p in NODES]
+        return [{"source": s, "type": t, "target": e} for s, t, e in EDGES]
+
+    tx = MagicMock()
+    tx.run.side_effect = run
+    session.execute_read.side_effect = lambda fn: fn(tx)
+    return driver, session
+
+
+def test_rebuild_reads_in_one_transaction():
+    driver, session = _mock_driver()
+
+    snapshot = refresh_snapshot(driver)
+
+    session.execute_read.assert_called_once()
+    assert get_snapshot() is snapshot
+    assert snapshot.index["CWE-89"] == 3
+    assert ensure_snapshot(driver) is snapshot
+    session.execute_read.assert_called_once()
+
+
+def test_refresh_keeps_old_snapshot_on_failure(snapshot, monkeypatch):
+    monkeypatch.setattr(graph_snapshot, "_snapshot", snapshot)
+    driver = MagicMock()
+    driver.session.side_effect = OSError("connection refused")
+
+    assert refresh_snapshot(driver) is None
+    assert get_snapshot() is snapshot
+
+
+def test_concurrent_cold_start_builds_once():
+    driver, session = _mock_driver()
+    loading = threading.Event()
+    release = threading.Event()
+    load = session.execute_read.side_effect
+
+    def slow_load(fn):
+        loading.set()
+        release.wait(5)
+        return load(fn)
+
+    session.execute_read.side_effect = slow_load
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = [pool.submit(ensure_snapshot, driver) for _ in range(4)]
+        assert loading.wait(5)
+        release.set()
+        snapshots = {id(r.result(5)) for r in results}
+
+    assert len(snapshots) == 1
+    session.execute_read.assert_called_once()
@@ -0,0 +1,66 @@
+"""CWE CHILD_OF closure tests (no DB needed)."""
+from unittest.mock import MagicMock
+
+from importers.cwe_importer import import_cwe_to_neo4j, CWEWeakness
+from importers.hierarchy import CLOSURE_WRITE_QUERY, ancestor_closure, hierarchy_closure
+
+
+def test_ancestor_closure_multi_parent():
+    parents = {
+        "CWE-89": {"CWE-943", "CWE-74"},
+        "CWE-943": {"CWE-74"},
+        "CWE-74": {"CWE-707"},
+    }
+
+    closure = ancestor_closure(parents)
+
+    assert closure["CWE-89"] == {"CWE-943", "CWE-74", "CWE-707"}
+    assert closure["CWE-943"] == {"CWE-74", "CWE-707"}
+    assert closure["CWE-74"] == {"CWE-707"}
+
+
+def test_ancestor_closure_terminates_on_cycles():
+    closure = ancestor_closure({"a": {"b"}, "b": {"a"}})
+    assert "b" in closure["a"]
+
+
+def test_ancestor_closure_deep_chain():
+    """Long chains must not hit the recursion limit."""
+    parents = {f"CWE-{i}": {f"CWE-{i + 1}"} for i in range(5000)}
+    assert len(ancestor_closure(parents)["CWE-0"]) == 5000
+
+
+def test_hierarchy_closure_ancestors_and_descendants():
+    closure = hierarchy_closure(
+        ["CWE-707", "CWE-74", "CWE-943", "CWE-89", "CWE-20"],
+        [
+            ("CWE-89", "CWE-943"), ("CWE-89", "CWE-74"), ("CWE-943", "CWE-74"),
+            ("CWE-74", "CWE-707"), ("CWE-89", "CWE-1000"),  # unknown parent is ignored
+        ],
+    )
+
+    assert closure["CWE-89"] == {"ancestors": ["CWE-707", "CWE-74", "CWE-943"], "descendants": []}
+    assert closure["CWE-74"] == {"ancestors": ["CWE-707"], "descendants": ["CWE-89", "CWE-943"]}
+    assert closure["CWE-707"]["descendants"] == ["CWE-74", "CWE-89", "CWE-943"]
+    assert closure["CWE-20"] == {"ancestors": [], "descendants": []}
+    assert "CWE-1000" not in closure
+
+
+def test_import_writes_closure_after_edges():
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+    weaknesses = [
+        CWEWeakness("89", "SQL Injection", "Base", "Stable", "", related=[("ChildOf", "943")]),
+        CWEWeakness("943", "Data Query Logic", "Class", "Incomplete", "", related=[("ChildOf", "74")]),
+        CWEWeakness("74", "Injection", "Class", "Incomplete", ""),
+    ]
+
+    import_cwe_to_neo4j(driver, weaknesses, concurrency=1)
+
+    queries = [c.args[0] for c in session.run.call_args_list]
+    closure_calls = [c for c in session.run.call_args_list if c.args[0] == CLOSURE_WRITE_QUERY]
+    assert queries.index(CLOSURE_WRITE_QUERY) > max(i for i, q in enumerate(queries) if ":CHILD_OF]" in q)
+    rows = {row["cwe_id"]: row for c in closure_calls for row in c.kwargs["rows"]}
+    assert rows["CWE-89"]["ancestors"] == ["CWE-74", "CWE-943"]
+    assert rows["CWE-74"]["descendants"] == ["CWE-89", "CWE-943"]
@@ -0,0 +1,181 @@
+"""Content-hash skip and delta import tests (no DB needed)."""
+import hashlib
+from unittest.mock import MagicMock, patch
+
+from importers.capec_importer import run_capec_import
+from importers.cwe_importer import CWEWeakness, import_cwe_to_neo4j
+from importers.delta import DeltaSet, file_sha256, fingerprint, run_delta_import
+
+
+def _mock_driver(runs=None):
+    """Driver whose session returns ``runs`` (source → ImportRun props) from get_import_run."""
+    runs = runs or {}
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+
+    def run(query, **params):
+        result = MagicMock()
+        if "ImportRun {source: $source}) RETURN" in query:
+            run_props = runs.get(params["source"])
+            result.single.return_value = {"run": run_props} if run_props else None
+        else:
+            result.__iter__ = lambda self: iter([])
+        return result
+
+    session.run.side_effect = run
+    session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+    return driver, session
+
+
+def test_file_sha256(tmp_path):
+    path = tmp_path / "data.xml"
+    path.write_bytes(b"<x/>")
+    assert file_sha256(str(path)) == hashlib.sha256(b"<x/>").hexdigest()
+
+
+def test_fingerprint_is_order_independent_for_dicts():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_delta_set_tracks_changes():
+    delta = DeltaSet(("CWE",), "cwe_id", nodes={"CWE-1": "x", "CWE-2": "y"}, edges={"CWE-1": "e"})
+
+    assert delta.node_changed("CWE-1", "x") is False
+    assert delta.node_changed("CWE-3", "z") is True
+    assert delta.edges_changed("CWE-1", "e") is False
+    assert delta.edges_changed("CWE-3", "e") is True
+    assert delta.is_new("CWE-3") and not delta.is_new("CWE-1")
+    assert delta.removed() == ["CWE-2"]
+    assert (delta.nodes_written, delta.nodes_unchanged) == (1, 1)
+
+
+def test_run_delta_import_skips_identical_file():
+    driver, _ = _mock_driver({"cwe": {"content_hash": "same"}})
+    import_fn = MagicMock()
+
+    result = run_delta_import(driver, "cwe", "same", ("CWE",), "cwe_id", import_fn)
+
+    assert result == {"status": "unchanged", "content_hash": "same"}
+    import_fn.assert_not_called()
+
+
+def test_run_delta_import_force_ignores_hash():
+    driver, _ = _mock_driver({"cwe": {"content_hash": "same"}})
+    import_fn = MagicMock(return_value={"nodes_imported": 5})
+
+    result = run_delta_import(driver, "cwe", "same", ("CWE",), "cwe_id", import_fn, force=True)
+
+    assert result["status"] == "completed"
+    assert result["nodes_imported"] == 5
+    delta = import_fn.call_args.args[0]
+    assert delta.nodes == {}
+
+
+def test_run_delta_import_force_deletes_removed_nodes():
+    """A forced re-import rewrites every record but still deletes those gone from the file."""
+    driver, session = _mock_driver({"cwe": {"content_hash": "same"}})
+    run = session.run.side_effect
+
+    def run_with_nodes(query, **params):
+        if "AS id," in query:
+            return iter([{"id": cwe_id, "fingerprint": "fp", "edges_fingerprint": "efp"}
+                         for cwe_id in ("CWE-1", "CWE-2")])
+        return run(query, **params)
+
+    session.run.side_effect = run_with_nodes
+
+    def import_fn(delta):
+        assert delta.node_changed("CWE-1", "fp") is True
+        assert delta.edges_changed("CWE-1", "efp") is True
+        return {}
+
+    result = run_delta_import(driver, "cwe", "same", ("CWE",), "cwe_id", import_fn, force=True)
+
+    assert result["nodes_deleted"] == 1
+    deletes = [c.kwargs["ids"] for c in session.run.call_args_list if "DETACH DELETE" in c.args[0]]
+    assert deletes == [["CWE-2"]]
+
+
+def test_run_delta_import_upstream_change_forces_edges():
+    driver, _ = _mock_driver({
+        "capec": {"content_hash": "old", "upstream_hash": "stale"},
+        "cwe": {"content_hash": "cwe-v2"},
+    })
+    import_fn = MagicMock(return_value={})
+
+    run_delta_import(driver, "capec", "file", ("CAPEC",), "capec_id", import_fn,
+                     upstream_sources=("cwe", "attack"))
+
+    assert import_fn.call_args.args[0].force_edges is True
+
+
+def test_cwe_delta_writes_only_changed_records():
+    weaknesses = [
+        CWEWeakness("1", "Same", "Base", "Stable", "d", related=[("ChildOf", "2")]),
+        CWEWeakness("2", "Renamed", "Class", "Stable", "d"),
+    ]
+    driver, session = _mock_driver()
+    import_cwe_to_neo4j(driver, weaknesses[:1])
+    node_fp = session.run.call_args_list[0].kwargs["nodes"][0]["fingerprint"]
+
+    delta = DeltaSet(
+        ("CWE",), "cwe_id",
+        nodes={"CWE-1": node_fp, "CWE-2": "old", "CWE-3": "gone"},
+        edges={"CWE-1": fingerprint(sorted(weaknesses[0].related)), "CWE-2": fingerprint([])},
+    )
+    driver, session = _mock_driver()
+    node_count, edge_count = import_cwe_to_neo4j(driver, weaknesses, delta=delta)
+
+    assert (node_count, edge_count) == (1, 0)
+    written = [c.kwargs["nodes"] for c in session.run.call_args_list if "nodes" in c.kwargs]
+    assert [n["cwe_id"] for n in written[0]] == ["CWE-2"]
+    assert delta.removed() == ["CWE-3"]
+
+
+def test_capec_mapping_index_drops_removed_patterns(tmp_path):
+    """The mapping index is rebuilt after patterns gone from the catalog are deleted."""
+    capec = {"CAPEC-1", "CAPEC-2"}
+    exploits = [("CWE-79", "CAPEC-1"), ("CWE-79", "CAPEC-2")]
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+
+    def run(query, **params):
+        result = MagicMock()
+        if "ImportRun {source: $source}) RETURN" in query:
+            result.single.return_value = {"run": {"content_hash": "old"}} if params["source"] == "capec" else None
+        elif "AS id," in query:
+            result.__iter__ = lambda self: iter([
+                {"id": capec_id, "fingerprint": "fp", "edges_fingerprint": "efp"} for capec_id in sorted(capec)
+            ])
+        elif "DETACH DELETE" in query:
+            capec.difference_update(params["ids"])
+        return result
+
+    def read(query, **params):
+        if "EXPLOITS_WEAKNESS" in query:
+            return [{"source": cwe, "target": capec_id} for cwe, capec_id in exploits if capec_id in capec]
+        if "MATCH (w:CWE)\n" in query:
+            return [{"source": "CWE-79", "target": None}]
+        return []
+
+    tx = MagicMock()
+    tx.run.side_effect = read
+    session.run.side_effect = run
+    session.execute_read.side_effect = lambda fn: fn(tx)
+    written = []
+    session.execute_write.side_effect = lambda fn, query, params: written.extend(params["rows"])
+
+    def import_capec(driver, patterns, delta, progress=None):
+        delta.node_changed("CAPEC-1", "fp")
+        return 1, 1, 0
+
+    path = tmp_path / "capec.xml"
+    path.write_bytes(b"<x/>")
+    with patch("importers.capec_importer.import_capec_to_neo4j", import_capec):
+        result = run_capec_import(driver, str(path))
+
+    assert result["nodes_deleted"] == 1
+    assert result["mapped_cwes"] == 1
+    assert written == [{"cwe_id": "CWE-79", "capec": ["CAPEC-1"], "capec_direct": ["CAPEC-1"],
+                        "techniques": [], "tactics": []}]
@@ -0,0 +1,104 @@
+"""ParallelBatchWriter tests (no DB needed)."""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from neo4j.exceptions import TransientError
+from pydantic import ValidationError
+
+from api.config import Settings
+from importers import writer as writer_module
+from importers.writer import ParallelBatchWriter, configure_concurrency
+
+
+def _mock_driver(run=None):
+    """Driver whose sessions run managed transactions against a shared mock session."""
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda fn, *args: fn(session, *args)
+    if run is not None:
+        def side_effect(query, **params):
+            run(query, **params)
+            return MagicMock()
+        session.run.side_effect = side_effect
+    return driver, session
+
+
+def test_statements_run_in_managed_transactions():
+    driver, session = _mock_driver()
+    progress = MagicMock()
+
+    with ParallelBatchWriter(driver, concurrency=2, progress=progress) as writer:
+        for i in range(5):
+            writer.submit("UNWIND $nodes AS n MERGE (:X {id: n})", {"nodes": [i]}, "nodes", 1)
+
+    assert session.execute_write.call_count == 5
+    assert sorted(c.kwargs["nodes"][0] for c in session.run.call_args_list) == [0, 1, 2, 3, 4]
+    assert progress.call_count == 5
+    progress.assert_called_with("nodes", 1)
+
+
+def test_submissions_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    driver, _ = _mock_driver(lambda query, **params: barrier.wait())
+
+    with ParallelBatchWriter(driver, concurrency=3) as writer:
+        for _ in range(3):
+            writer.submit("RETURN 1", {})
+
+    assert not barrier.broken
+
+
+def test_group_runs_sequentially_in_order():
+    seen = []
+    driver, _ = _mock_driver(lambda query, **params: seen.append(params["i"]))
+
+    with ParallelBatchWriter(driver, concurrency=4) as writer:
+        writer.submit_group([("RETURN $i", {"i": i}, 1) for i in range(10)], phase="relationships")
+
+    assert seen == list(range(10))
+    assert driver.session.call_count == 1
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(writer_module, "RETRY_BACKOFF", 0)
+    attempts = []
+
+    def run(query, **params):
+        attempts.append(query)
+        if len(attempts) < 3:
+            raise TransientError("deadlock detected")
+
+    driver, _ = _mock_driver(run)
+    with ParallelBatchWriter(driver, concurrency=1) as writer:
+        writer.submit("RETURN 1", {})
+
+    assert len(attempts) == 3
+
+
+def test_errors_propagate(monkeypatch):
+    monkeypatch.setattr(writer_module, "RETRY_BACKOFF", 0)
+
+    def run(query, **params):
+        raise TransientError("deadlock detected")
+
+    driver, _ = _mock_driver(run)
+    with pytest.raises(TransientError):
+        with ParallelBatchWriter(driver, concurrency=1, max_retries=1) as writer:
+            writer.submit("RETURN 1", {})
+
+
+def test_configured_concurrency_is_the_default(monkeypatch):
+    monkeypatch.setattr(writer_module, "_default_concurrency", writer_module.DEFAULT_CONCURRENCY)
+    configure_concurrency(7)
+    with ParallelBatchWriter(MagicMock()) as writer:
+        assert writer.concurrency == 7
+
+    with pytest.raises(ValueError):
+        configure_concurrency(0)
+
+
+def test_concurrency_setting_is_validated(monkeypatch):
+    monkeypatch.setenv("IMPORT_WRITE_CONCURRENCY", "0")
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,69 @@
+"""CWE → CAPEC → ATT&CK mapping index tests (no DB needed)."""
+from unittest.mock import MagicMock
+
+from importers.mapping_index import (
+    MAPPING_WRITE_QUERY,
+    build_mapping_index,
+    compute_mapping_index,
+    tactic_shortname,
+)
+
+
+def test_mapping_inherits_through_child_of():
+    index = compute_mapping_index(
+        ["CWE-707", "CWE-74", "CWE-89", "CWE-1"],
+        child_of=[("CWE-89", "CWE-74"), ("CWE-74", "CWE-707")],
+        exploits=[("CWE-89", "CAPEC-66"), ("CWE-74", "CAPEC-152")],
+        maps_to=[("CAPEC-66", "T1190"), ("CAPEC-152", "T1059")],
+        technique_tactics=[("T1190", "TA0001"), ("T1059", "TA0002")],
+    )
+
+    assert index["CWE-89"] == {
+        "capec": ["CAPEC-152", "CAPEC-66"],
+        "capec_direct": ["CAPEC-66"],
+        "techniques": ["T1059", "T1190"],
+        "tactics": ["TA0001", "TA0002"],
+    }
+    # Mappings flow down the hierarchy, not up
+    assert index["CWE-74"]["capec"] == ["CAPEC-152"]
+    assert index["CWE-707"]["capec"] == []
+    assert index["CWE-1"] == {"capec": [], "capec_direct": [], "techniques": [], "tactics": []}
+
+
+def test_tactic_shortname():
+    assert tactic_shortname("Command and Control") == "command-and-control"
+
+
+def test_build_mapping_index_reads_once_and_writes_every_cwe():
+    inputs = {
+        "CHILD_OF": [{"source": "CWE-89", "target": "CWE-74"}],
+        "EXPLOITS_WEAKNESS": [{"source": "CWE-74", "target": "CAPEC-66"}],
+        "MAPS_TO_TECHNIQUE": [{"source": "CAPEC-66", "target": "T1190"}],
+        "UNWIND t.tactics": [{"source": "T1190", "target": "initial-access"}],
+        "MATCH (t:Tactic)": [{"source": "Initial Access", "target": "TA0001"}],
+        "MATCH (w:CWE)\n": [
+            {"source": cwe_id, "target": None} for cwe_id in ("CWE-74", "CWE-89", "CWE-20")
+        ],
+    }
+
+    def read(query, **params):
+        return next(rows for key, rows in inputs.items() if key in query)
+
+    tx = MagicMock()
+    tx.run.side_effect = read
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+    session.execute_read.side_effect = lambda fn: fn(tx)
+    written = []
+    session.execute_write.side_effect = lambda fn, query, params: written.extend(params["rows"])
+
+    assert build_mapping_index(driver, batch_size=2) == 2
+
+    session.execute_read.assert_called_once()
+    assert session.execute_write.call_count == 2
+    assert session.execute_write.call_args.args[1] == MAPPING_WRITE_QUERY
+    rows = {row["cwe_id"]: row for row in written}
+    assert rows["CWE-89"]["capec"] == ["CAPEC-66"]
+    assert rows["CWE-89"]["capec_direct"] == []
+    assert rows["CWE-89"]["tactics"] == ["TA0001"]
+    assert rows["CWE-20"]["techniques"] == []
@@ -0,0 +1,114 @@
+"""Rule-based threat enumeration tests (no DB needed)."""
+from src.threat_engine import RULES, attach_knowledge, match_threats
+
+
+ASSETS = [
+    {"asset_id": "ta-db", "name": "Orders DB", "type": "database",
+     "technology_stack": ["PostgreSQL 15"], "criticality": "critical"},
+    {"asset_id": "ta-web", "name": "Storefront", "type": "application",
+     "technology_stack": ["React", "Node.js"], "criticality": "low"},
+]
+BOUNDARIES = [{"boundary_id": "tb-inet", "name": "Internet", "type": "network_segment", "security_level": "public"}]
+
+
+def _by_element(threats):
+    grouped = {}
+    for t in threats:
+        grouped.setdefault(t["element_id"], {})[t["cwe_id"]] = t
+    return grouped
+
+
+def test_assets_match_type_and_technology():
+    threats = _by_element(match_threats(ASSETS, [], [], []))
+
+    assert set(threats["ta-db"]) == {"CWE-89", "CWE-284", "CWE-311"}
+    # Type and technology both imply SQL injection; reasons are merged
+    assert threats["ta-db"]["CWE-89"]["reasons"] == ["SQL injection"]
+    assert {"CWE-79", "CWE-352", "CWE-287", "CWE-1321"} <= set(threats["ta-web"])
+    assert threats["ta-db"]["CWE-89"]["priority"] == 4
+    assert threats["ta-web"]["CWE-79"]["priority"] == 1
+
+
+def test_flows_crossing_boundaries():
+    flows = [
+        {"flow_id": "df-1", "name": "checkout", "source": "ta-web", "target": "ta-db",
+         "protocol": "http", "trust_boundary_id": "tb-inet", "authentication_method": "none"},
+        {"flow_id": "df-2", "source_id": "ta-web", "target_id": "ta-db",
+         "protocol": "https", "is_encrypted": True},
+    ]
+
+    threats = _by_element(match_threats(ASSETS, flows, BOUNDARIES, []))
+
+    assert set(threats["df-1"]) == {"CWE-319", "CWE-306", "CWE-20", "CWE-287", "CWE-400", "CWE-918"}
+    # Highest endpoint criticality is already critical, so crossing cannot raise it further
+    assert threats["df-1"]["CWE-319"]["priority"] == 4
+    assert "df-2" not in threats
+
+
+def test_c_family_technologies_are_distinct():
+    assets = [
+        {"asset_id": "cs", "type": "service", "technology_stack": ["C# / .NET 8"]},
+        {"asset_id": "cpp", "type": "service", "technology_stack": ["C++17", "C++"]},
+        {"asset_id": "c", "type": "service", "technology_stack": ["C"]},
+    ]
+
+    threats = _by_element(match_threats(assets, [], [], []))
+
+    assert "CWE-120" not in threats["cs"] and "CWE-502" in threats["cs"]
+    assert {"CWE-120", "CWE-787"} <= set(threats["cpp"])
+    assert {"CWE-120", "CWE-787"} <= set(threats["c"])
+
+
+def test_data_asset_priority_follows_classification():
+    data_assets = [
+        {"data_asset_id": "da-secret", "type": "authentication_data", "classification": "secret"},
+        {"data_asset_id": "da-public", "type": "pii", "classification": "public"},
+        {"data_asset_id": "da-none", "type": "pii"},
+    ]
+
+    threats = _by_element(match_threats([], [], [], data_assets))
+
+    assert threats["da-secret"]["CWE-256"]["priority"] == 4
+    assert threats["da-public"]["CWE-359"]["priority"] == 1
+    assert threats["da-none"]["CWE-359"]["priority"] == 2
+
+
+def test_data_assets_and_ordering():
+    data_assets = [{"data_asset_id": "da-1", "name": "Customers", "type": "pii", "classification": "confidential"}]
+
+    threats = match_threats(ASSETS, [], [], data_assets)
+
+    assert {t["cwe_id"] for t in threats if t["element_id"] == "da-1"} == {"CWE-359", "CWE-311"}
+    assert [t["priority"] for t in threats] == sorted((t["priority"] for t in threats), reverse=True)
+
+
+def test_rule_table_is_keyed_by_feature():
+    assert all(len(key) == 3 for key in RULES)
+    assert all(cwe.startswith("CWE-") for rules in RULES.values() for cwe, _ in rules)
+
+
+def test_attach_knowledge_tolerates_missing_cwes():
+    threats = match_threats([{"asset_id": "a", "type": "database"}], [], [], [])
+    knowledge = {"CWE-89": {"name": "SQL Injection", "capec": ["CAPEC-66"],
+                            "techniques": [{"attack_id": "T1190", "name": "Exploit"}]}}
+
+    enriched = {t["cwe_id"]: t for t in attach_knowledge(threats, knowledge)}
+
+    assert enriched["CWE-89"]["capec"] == ["CAPEC-66"]
+    assert enriched["CWE-311"]["cwe_name"] is None
+    assert enriched["CWE-311"]["techniques"] == []
+
+
+def test_hundreds_of_assets_scale_linearly():
+    assets = [
+        {"asset_id": f"ta-{i}", "type": "api", "technology_stack": ["Java Spring", "nginx"]}
+        for i in range(500)
+    ]
+    flows = [
+        {"flow_id": f"df-{i}", "source": f"ta-{i}", "target": f"ta-{i + 1}", "protocol": "http"}
+        for i in range(499)
+    ]
+
+    threats = match_threats(assets, flows, [], [])
+
+    assert len(threats) == 500 * 6 + 499